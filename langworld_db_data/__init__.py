@@ -1,4 +1,6 @@
+from collections.abc import Sequence
 from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
 from langworld_db_data.constants.paths import (
     FEATURE_PROFILES_DIR,
@@ -7,6 +9,12 @@ from langworld_db_data.constants.paths import (
     FILE_WITH_NAMES_OF_FEATURES,
 )
 
+if TYPE_CHECKING:
+    from langworld_db_data.tools.featureprofiles.feature_profile_index import (
+        FeatureProfileIndex,
+    )
+    from langworld_db_data.tools.featureprofiles.parsed_profile_cache import ParsedProfileCache
+
 
 class ObjectWithPaths:
     """Class for initializing objects that store paths
@@ -26,6 +34,12 @@ class ObjectWithPaths:
         output_file_with_features: Path = FILE_WITH_NAMES_OF_FEATURES,
         output_file_with_listed_values: Path = FILE_WITH_LISTED_VALUES,
         output_dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
+        # Index of profiles in input dir can be shared between tools making several edits.
+        # If it is not given, it is built when it is first needed.
+        feature_profile_index: Optional["FeatureProfileIndex"] = None,
+        # Cache of parsed profiles for building the index. If it is not given,
+        # the default cache is used for the main dir with feature profiles.
+        parsed_profile_cache: Optional["ParsedProfileCache"] = None,
     ):
         self.file_with_categories = file_with_categories
         self.input_file_with_features = input_file_with_features
@@ -39,3 +53,31 @@ class ObjectWithPaths:
 
         if not self.output_dir_with_feature_profiles.exists():
             self.output_dir_with_feature_profiles.mkdir()
+
+        self._feature_profile_index = feature_profile_index
+        self._parsed_profile_cache = parsed_profile_cache
+
+    @property
+    def feature_profile_index(self) -> "FeatureProfileIndex":
+        """Index of feature profiles in the input dir (see `FeatureProfileIndex`)."""
+        if self._feature_profile_index is None:
+            from langworld_db_data.tools.featureprofiles.feature_profile_index import (
+                FeatureProfileIndex,
+            )
+            from langworld_db_data.tools.featureprofiles.parsed_profile_cache import (
+                ParsedProfileCache,
+            )
+
+            cache = self._parsed_profile_cache
+            if cache is None and self.input_dir_with_feature_profiles == FEATURE_PROFILES_DIR:
+                cache = ParsedProfileCache()
+
+            self._feature_profile_index = FeatureProfileIndex(
+                self.input_dir_with_feature_profiles, cache=cache
+            )
+        return self._feature_profile_index
+
+    def _update_feature_profile_index(self, file: Path, rows: Sequence[dict[str, str]]) -> None:
+        """Updates the index after profile was written (unless the index is not built yet)."""
+        if self._feature_profile_index is not None:
+            self._feature_profile_index.update(doculect_id=file.stem, rows=list(rows))
@@ -1,12 +1,22 @@
 from pathlib import Path
 
 MAIN_DIR = Path(__file__).parent.parent.parent
-CONFIG_DIR = Path(__file__).parent.parent / "config"
+PACKAGE_DIR = Path(__file__).parent.parent
+CONFIG_DIR = PACKAGE_DIR / "config"
 DATA_DIR = MAIN_DIR / "data"
+CACHE_DIR = MAIN_DIR / ".cache"
+"""Local directory for data that can be recomputed at any moment (not under version control)."""
+
+JOURNAL_DIR = DATA_DIR / ".journal"
+"""Local journal of edits of data files made by tools (not under version control)."""
 
 CLDF_DIR = DATA_DIR / "cldf"
 FILE_WITH_CLDF_DATASET_METADATA = CLDF_DIR / "StructureDataset-metadata.json"
 
+SQLITE_DIR = MAIN_DIR / "sqlite"
+"""Local directory for SQLite export of all data (not under version control)."""
+FILE_WITH_SQLITE_DATABASE = SQLITE_DIR / "langworld_db_data.sqlite"
+
 DISCUSSION_DIR = DATA_DIR / "discussion"
 DISCUSSION_FILE_WITH_CUSTOM_VALUES_BY_DOCULECT = (
     DISCUSSION_DIR / "custom_values_by_volume_and_doculect.md"
@@ -1,4 +1,9 @@
+import csv
+import inspect
+from collections.abc import Iterable, Iterator, Sequence
 from pathlib import Path
+from types import SimpleNamespace
+from typing import Optional
 
 from pycldf import StructureDataset
 from tinybear.csv_xls import (
@@ -8,6 +13,7 @@ from tinybear.csv_xls import (
 
 from langworld_db_data.constants.literals import (
     ATOMIC_VALUE_SEPARATOR,
+    ID_SEPARATOR,
     KEY_FOR_ENGLISH,
     KEY_FOR_ENGLISH_COMMENT,
     KEY_FOR_FEATURE_ID,
@@ -27,10 +33,32 @@ from langworld_db_data.constants.paths import (
     FILE_WITH_LISTED_VALUES,
     FILE_WITH_NAMES_OF_FEATURES,
 )
+from langworld_db_data.export.cldf_table_checker import CLDFTableChecker
+from langworld_db_data.export.value_table_segment_cache import ValueTableSegmentCache
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
 
 KEY_FOR_ID_IN_CLDF = "ID"
 KEY_FOR_RUSSIAN_NAME_IN_CLDF = "Name_RU"
 
+# Columns of ValueTable in the order in which `pycldf` writes them
+COLUMNS_OF_VALUE_TABLE = (
+    KEY_FOR_ID_IN_CLDF,
+    "Language_ID",
+    "Parameter_ID",
+    "Value",
+    "Code_ID",
+    "Comment",
+    "Source",
+    "Value_RU",
+    "Comment_RU",
+)
+
+ValueTableRow = tuple[str, str, str, str, str, str, str, str, str]
+
+
+class CLDFDatasetWriterError(Exception):
+    pass
+
 
 class CLDFDatasetWriter:
     def __init__(
@@ -39,7 +67,20 @@ class CLDFDatasetWriter:
         file_with_listed_values: Path = FILE_WITH_LISTED_VALUES,
         file_with_doculects: Path = FILE_WITH_DOCULECTS,
         file_with_features: Path = FILE_WITH_NAMES_OF_FEATURES,
+        corpus: Optional[FeatureProfileCorpus] = None,
+        output_dir: Path = CLDF_DIR,
+        cache: Optional[ValueTableSegmentCache] = None,
     ):
+        """If `corpus` is given, feature profiles are taken from it
+        (and `dir_with_feature_profiles` is ignored).
+
+        If `cache` is given, the export is incremental: rows of ValueTable are only
+        made anew for feature profiles that have changed since the previous export
+        (or for all profiles if inventories have changed). The output is the same.
+        """
+        self.corpus = corpus
+        self.output_dir = output_dir
+        self.cache = cache
         self.listed_values = read_dicts_from_csv(file_with_listed_values)
         self.value_en_for_value_id = read_dict_from_2_csv_columns(
             file_with_listed_values, key_col=KEY_FOR_ID, val_col=KEY_FOR_ENGLISH
@@ -50,10 +91,36 @@ class CLDFDatasetWriter:
         self.is_multiselect_for_feature_id = read_dict_from_2_csv_columns(
             file_with_features, key_col=KEY_FOR_ID, val_col=KEY_FOR_MULTISELECT_OPTION
         )
-        self.feature_profiles = sorted(list(dir_with_feature_profiles.glob("*.csv")))
+        self.feature_profiles = (
+            self.corpus.files
+            if self.corpus is not None
+            else sorted(list(dir_with_feature_profiles.glob("*.csv")))
+        )
+
+        # rows of ValueTable depend on the profile, the inventories and the code below
+        # (and they are only cached once they have passed the checks)
+        self._key_of_other_inputs_of_segments = (
+            self.cache.make_key(
+                file_with_listed_values.read_bytes(),
+                file_with_features.read_bytes(),
+                Path(__file__).read_bytes(),
+                Path(inspect.getfile(CLDFTableChecker)).read_bytes(),
+            )
+            if self.cache is not None
+            else ""
+        )
 
     def write(self) -> None:
-        dataset = StructureDataset.in_dir(CLDF_DIR)
+        """Writes CLDF dataset.
+
+        ValueTable (the largest one by far) is written straight to its CSV file
+        row by row while feature profiles are read one at a time, so it is never
+        held in memory as a whole. Other tables and metadata are written by `pycldf`.
+
+        All tables are checked (see `CLDFTableChecker`) before they are written,
+        so the dataset does not have to be read back and validated by `pycldf`.
+        """
+        dataset = StructureDataset.in_dir(self.output_dir)
 
         for component_name in ("CodeTable", "LanguageTable", "ParameterTable"):
             dataset.add_component(component_name)
@@ -105,70 +172,152 @@ class CLDFDatasetWriter:
             for row in self.doculects
         ]
 
-        value_table_rows = []
-        value_table_row_id = 1
+        value_table = dataset["ValueTable"]
+        columns = tuple(column.header for column in value_table.tableSchema.columns)
+        if columns != COLUMNS_OF_VALUE_TABLE:
+            raise CLDFDatasetWriterError(
+                f"Unexpected columns of ValueTable: {columns} (expected {COLUMNS_OF_VALUE_TABLE})"
+            )
 
-        for file in self.feature_profiles:
-            language_id = file.stem
-            # not sure how best to handle explicit_gap yet.
-            relevant_rows = [
-                row
-                for row in read_dicts_from_csv(file)
-                if row[KEY_FOR_VALUE_TYPE] in ("listed", "custom")
-            ]
-
-            for relevant_row in relevant_rows:
-                # handling multiselect listed values
-                if (
-                    relevant_row[KEY_FOR_VALUE_TYPE] == "listed"
-                    and self.is_multiselect_for_feature_id[relevant_row[KEY_FOR_FEATURE_ID]] == "1"
-                ):
-                    for value_id, value_ru in zip(
-                        relevant_row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR),
-                        relevant_row[KEY_FOR_RUSSIAN_NAME_OF_VALUE].split(ATOMIC_VALUE_SEPARATOR),
-                    ):
-                        value_table_rows.append(
-                            {
-                                KEY_FOR_ID_IN_CLDF: value_table_row_id,
-                                "Language_ID": language_id,
-                                "Parameter_ID": relevant_row[KEY_FOR_FEATURE_ID],
-                                "Value": self.value_en_for_value_id[value_id],
-                                "Value_RU": value_ru,
-                                "Code_ID": value_id,
-                                "Comment": relevant_row[KEY_FOR_ENGLISH_COMMENT],
-                                "Comment_RU": relevant_row[KEY_FOR_RUSSIAN_COMMENT],
-                                "Source": "",
-                            }
-                        )
-                        value_table_row_id += 1
-                # handling other values
-                else:
-                    value_table_rows.append(
-                        {
-                            KEY_FOR_ID_IN_CLDF: value_table_row_id,
-                            "Language_ID": language_id,
-                            "Parameter_ID": relevant_row[KEY_FOR_FEATURE_ID],
-                            # English value will be empty for values that are not yet
-                            # in the inventory
-                            "Value": self.value_en_for_value_id.get(
-                                relevant_row[KEY_FOR_VALUE_ID], ""
-                            ),
-                            "Value_RU": relevant_row[KEY_FOR_RUSSIAN_NAME_OF_VALUE],
-                            "Code_ID": relevant_row[KEY_FOR_VALUE_ID],
-                            "Comment": relevant_row[KEY_FOR_ENGLISH_COMMENT],
-                            "Comment_RU": relevant_row[KEY_FOR_RUSSIAN_COMMENT],
-                            "Source": "",
-                        }
-                    )
-                    value_table_row_id += 1
+        # tables that are referred to must be checked first
+        checker = CLDFTableChecker(dataset)
+        checker.check_rows("LanguageTable", languages)
+        checker.check_rows("ParameterTable", features)
+        checker.check_rows("CodeTable", listed_values)
+
+        # number of rows is stored in metadata, which is written together with other tables
+        value_table.common_props["dc:extent"] = self._write_value_table(
+            self.output_dir / str(value_table.url), checker=checker
+        )
 
         dataset.write(
-            ValueTable=value_table_rows,
             LanguageTable=languages,
             CodeTable=listed_values,
             ParameterTable=features,
         )
 
+    def iter_value_table_rows(self) -> Iterator[ValueTableRow]:
+        """Yields rows of ValueTable (with columns `COLUMNS_OF_VALUE_TABLE`),
+        reading one feature profile at a time.
+        """
+        for file in self.feature_profiles:
+            yield from self._iter_value_table_rows_of_profile(file)
+
+    def _iter_value_table_rows_of_profile(self, file: Path) -> Iterator[ValueTableRow]:
+        """Yields rows of ValueTable made from one feature profile.
+
+        ID of each row is made from ID of the doculect and ID of the (atomic) listed value
+        or, for custom values, ID of the feature (e.g. `abaza-A-1-2`, `abaza-A-12`).
+        This way IDs do not depend on other rows, so a small change in data
+        only leads to a small change in the exported dataset.
+        """
+        language_id = file.stem
+        # not sure how best to handle explicit_gap yet.
+        rows = (
+            self.corpus.rows(language_id) if self.corpus is not None else read_dicts_from_csv(file)
+        )
+
+        for row in rows:
+            value_type = row[KEY_FOR_VALUE_TYPE]
+            if value_type not in ("listed", "custom"):
+                continue
+
+            feature_id = row[KEY_FOR_FEATURE_ID]
+            comment_en, comment_ru = row[KEY_FOR_ENGLISH_COMMENT], row[KEY_FOR_RUSSIAN_COMMENT]
+
+            # handling multiselect listed values
+            if value_type == "listed" and self.is_multiselect_for_feature_id[feature_id] == "1":
+                for value_id, value_ru in zip(
+                    row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR),
+                    row[KEY_FOR_RUSSIAN_NAME_OF_VALUE].split(ATOMIC_VALUE_SEPARATOR),
+                ):
+                    yield (
+                        f"{language_id}{ID_SEPARATOR}{value_id}",
+                        language_id,
+                        feature_id,
+                        self.value_en_for_value_id[value_id],
+                        value_id,
+                        comment_en,
+                        "",
+                        value_ru,
+                        comment_ru,
+                    )
+            # handling other values
+            else:
+                yield (
+                    f"{language_id}{ID_SEPARATOR}{row[KEY_FOR_VALUE_ID] or feature_id}",
+                    language_id,
+                    feature_id,
+                    # English value will be empty for values that are not yet
+                    # in the inventory
+                    self.value_en_for_value_id.get(row[KEY_FOR_VALUE_ID], ""),
+                    row[KEY_FOR_VALUE_ID],
+                    comment_en,
+                    "",
+                    row[KEY_FOR_RUSSIAN_NAME_OF_VALUE],
+                    comment_ru,
+                )
+
+    def _write_value_table(self, path_to_file: Path, checker: CLDFTableChecker) -> int:
+        """Writes ValueTable to CSV file in the same format as `pycldf` does.
+        Returns number of rows written.
+
+        The file is assembled from segments (lines made from each feature profile),
+        which are taken from the cache if it is given and valid.
+        Segments are written to a temporary file, so an existing file is only replaced
+        when all rows have passed the checks.
+        """
+        path_to_temp_file = path_to_file.with_name(f"{path_to_file.name}.tmp")
+        number_of_rows = 0
+        try:
+            with path_to_temp_file.open("wb") as fh:
+                fh.write(self._serialize_rows([COLUMNS_OF_VALUE_TABLE])[0])
+                for file in self.feature_profiles:
+                    segment = self._get_segment(file, checker=checker)
+                    fh.writelines(segment)
+                    number_of_rows += len(segment)
+        except BaseException:
+            path_to_temp_file.unlink(missing_ok=True)
+            raise
+
+        path_to_temp_file.replace(path_to_file)
+
+        if self.cache is not None:
+            self.cache.remove_entries_except(file.stem for file in self.feature_profiles)
+
+        return number_of_rows
+
+    def _get_segment(self, file: Path, checker: CLDFTableChecker) -> list[bytes]:
+        if self.cache is None:
+            return self._make_segment(file, checker=checker)
+
+        key = self.cache.make_key(
+            file.read_bytes(), self._key_of_other_inputs_of_segments.encode("utf-8")
+        )
+        lines = self.cache.get(file.stem, key)
+        if lines is None:
+            lines = self._make_segment(file, checker=checker)
+            self.cache.put(file.stem, key, lines)
+        else:
+            # Rows of a cached segment have been checked when the segment was made,
+            # with the same inventories. Only the doculect may have been removed since.
+            # (IDs of rows start with ID of the doculect, so they are unique across segments.)
+            checker.check_foreign_key("ValueTable", "Language_ID", file.stem)
+        return lines
+
+    def _make_segment(self, file: Path, checker: CLDFTableChecker) -> list[bytes]:
+        rows = list(self._iter_value_table_rows_of_profile(file))
+        checker.check_rows("ValueTable", (dict(zip(COLUMNS_OF_VALUE_TABLE, row)) for row in rows))
+        return self._serialize_rows(rows)
+
+    @staticmethod
+    def _serialize_rows(rows: Iterable[Sequence[str]]) -> list[bytes]:
+        """Returns each row as a line of CSV (as `csv.writer` writes one row at a time)."""
+        lines: list[str] = []
+        writer = csv.writer(SimpleNamespace(write=lines.append))
+        writer.writerows(rows)
+        return [line.encode("utf-8") for line in lines]
+
 
 if __name__ == "__main__":
     CLDFDatasetWriter().write()
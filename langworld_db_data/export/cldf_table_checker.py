@@ -0,0 +1,124 @@
+import re
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from pycldf import Dataset
+
+
+class CLDFTableCheckerError(Exception):
+    pass
+
+
+class CLDFTableChecker:
+    """Checks rows of CLDF tables in memory, before (or while) they are written.
+
+    This is a fast replacement for `pycldf`'s `Dataset.validate()`, which reads
+    all tables back from disk. The checks are made according to the schema
+    of the dataset:
+
+    - columns marked as required must have a value;
+    - values must match the format of the column (e.g. of IDs or Glottocodes);
+    - items of list-valued columns must not contain the separator of the column;
+    - IDs must be unique within a table;
+    - foreign keys (e.g. `Language_ID`, `Parameter_ID`, `Code_ID`) must refer to
+      existing rows.
+
+    Tables that are referred to must be checked before the tables that refer to them.
+    """
+
+    def __init__(self, dataset: Dataset):
+        self.dataset = dataset
+        self.ids_for_table_url: dict[str, set[str]] = {}
+
+    def check_rows(self, component_name: str, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Checks rows of table and remembers their IDs, so that they can be referred to."""
+        table = self.dataset[component_name]
+        url = str(table.url)
+        ids = self.ids_for_table_url.setdefault(url, set())
+
+        columns = table.tableSchema.columns
+        required_columns = [column.header for column in columns if column.required]
+        separator_for_column = {
+            column.header: column.separator for column in columns if column.separator
+        }
+        pattern_for_column = {
+            column.header: re.compile(column.datatype.format)
+            for column in columns
+            if column.datatype is not None
+            and column.datatype.base == "string"
+            and column.datatype.format
+        }
+        url_of_table_for_column = {
+            foreign_key.columnReference[0]: str(foreign_key.reference.resource)
+            for foreign_key in table.tableSchema.foreignKeys
+        }
+        for row in rows:
+            row_id = row.get("ID")
+
+            for column_name in required_columns:
+                if row.get(column_name) in (None, "", []):
+                    raise CLDFTableCheckerError(
+                        f"Row {row_id} of {url} has no value in required column {column_name}"
+                    )
+
+            for column_name, value in row.items():
+                if value is None or value == "":
+                    continue
+                items = value if isinstance(value, list) else [value]
+
+                separator = separator_for_column.get(column_name)
+                if separator is not None and isinstance(value, list):
+                    for item in items:
+                        if separator in item:
+                            raise CLDFTableCheckerError(
+                                f"Value {item!r} in column {column_name} of row {row_id} in"
+                                f" {url} contains separator {separator!r}"
+                            )
+
+                pattern = pattern_for_column.get(column_name)
+                if pattern is not None:
+                    for item in items:
+                        if item and not pattern.fullmatch(item):
+                            raise CLDFTableCheckerError(
+                                f"Value {item!r} in column {column_name} of row {row_id} in"
+                                f" {url} does not match format {pattern.pattern}"
+                            )
+
+                if column_name in url_of_table_for_column:
+                    self._check_reference(
+                        value=value,
+                        url_of_referred_table=url_of_table_for_column[column_name],
+                        description=f"column {column_name} of row {row_id} in {url}",
+                    )
+
+            if row_id in ids:
+                raise CLDFTableCheckerError(f"Row ID {row_id} is not unique in {url}")
+            ids.add(row_id)
+
+    def check_foreign_key(self, component_name: str, column_name: str, value: str) -> None:
+        """Checks that value of given column refers to an existing row.
+        This is useful for values shared by many rows, whose other columns
+        have already been checked.
+        """
+        table = self.dataset[component_name]
+        for foreign_key in table.tableSchema.foreignKeys:
+            if foreign_key.columnReference[0] == column_name:
+                self._check_reference(
+                    value=value,
+                    url_of_referred_table=str(foreign_key.reference.resource),
+                    description=f"column {column_name} of {table.url}",
+                )
+                return
+        raise CLDFTableCheckerError(f"Column {column_name} of {table.url} is not a foreign key")
+
+    def _check_reference(self, value: str, url_of_referred_table: str, description: str) -> None:
+        ids = self.ids_for_table_url.get(url_of_referred_table)
+        if ids is None:
+            raise CLDFTableCheckerError(
+                f"{url_of_referred_table} must be checked before {description} refers to it"
+            )
+        if value not in ids:
+            raise CLDFTableCheckerError(
+                f"Value {value!r} in {description} refers to a row"
+                f" that does not exist in {url_of_referred_table}"
+            )
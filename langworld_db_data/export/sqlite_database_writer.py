@@ -0,0 +1,283 @@
+import sqlite3
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from tinybear.csv_xls import read_plain_rows_from_csv
+from tinybear.json_toml_yaml import read_json_toml_yaml
+
+from langworld_db_data.constants.literals import (
+    ATOMIC_VALUE_SEPARATOR,
+    KEY_FOR_ENGLISH_COMMENT,
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_ID,
+    KEY_FOR_MULTISELECT_OPTION,
+    KEY_FOR_RUSSIAN_COMMENT,
+    KEY_FOR_RUSSIAN_NAME_OF_FEATURE,
+    KEY_FOR_RUSSIAN_NAME_OF_VALUE,
+    KEY_FOR_VALUE_ID,
+    KEY_FOR_VALUE_TYPE,
+)
+from langworld_db_data.constants.paths import (
+    FEATURE_PROFILES_DIR,
+    FILE_WITH_CATEGORIES,
+    FILE_WITH_COUNTRIES,
+    FILE_WITH_DOCULECTS,
+    FILE_WITH_ENCYCLOPEDIA_VOLUMES,
+    FILE_WITH_GENEALOGY_HIERARCHY,
+    FILE_WITH_GENEALOGY_NAMES,
+    FILE_WITH_LISTED_VALUES,
+    FILE_WITH_MAP_TO_DOCULECT,
+    FILE_WITH_MAPS,
+    FILE_WITH_NAMES_OF_FEATURES,
+    FILE_WITH_SQLITE_DATABASE,
+    FILE_WITH_VALUE_TYPES,
+)
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
+
+TABLE_WITH_FEATURE_VALUES = "feature_values"
+TABLE_WITH_FAMILIES = "families"
+TABLE_WITH_FAMILY_ANCESTORS = "family_ancestors"
+
+COLUMNS_OF_TABLE_WITH_FEATURE_VALUES = (
+    "doculect_id",
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_RUSSIAN_NAME_OF_FEATURE,
+    KEY_FOR_VALUE_TYPE,
+    KEY_FOR_VALUE_ID,
+    KEY_FOR_RUSSIAN_NAME_OF_VALUE,
+    KEY_FOR_RUSSIAN_COMMENT,
+    KEY_FOR_ENGLISH_COMMENT,
+    "page_numbers",
+)
+
+INDEXES = {
+    "feature_values_by_feature_and_value": (TABLE_WITH_FEATURE_VALUES, ("feature_id", "value_id")),
+    "feature_values_by_doculect": (TABLE_WITH_FEATURE_VALUES, ("doculect_id",)),
+    "feature_values_by_value_type": (TABLE_WITH_FEATURE_VALUES, ("value_type",)),
+    "doculects_by_family": ("doculects", ("family_id",)),
+    "family_ancestors_by_ancestor": (TABLE_WITH_FAMILY_ANCESTORS, ("ancestor_id",)),
+}
+
+# Genealogy hierarchy is a list of families, each of them is either an ID
+# or a mapping of ID to the list of child families
+GenealogyNode = Union[str, dict[str, list[Any]]]
+
+
+class SQLiteDatabaseWriterError(Exception):
+    pass
+
+
+class SQLiteDatabaseWriter:
+    """Writes all data into one SQLite database for ad-hoc querying.
+
+    Every CSV file of inventories and assets becomes a table with the same name
+    and columns (all values are stored as text, exactly as in the CSV file).
+    Additionally, the database has these tables:
+
+    - `feature_values`: rows of all feature profiles with column `doculect_id`.
+      Values of multiselect features are split into atomic values, one row each.
+    - `families`: families from the genealogy names file with `parent_id`
+      taken from the hierarchy.
+    - `family_ancestors`: each family paired with itself and with all families
+      it belongs to, so that doculects of a family and all its subfamilies
+      can be found with a simple join.
+
+    For example, doculects having value A-2-3 in Turkic family:
+
+        SELECT d.id FROM feature_values AS v
+        JOIN doculects AS d ON d.id = v.doculect_id
+        JOIN family_ancestors AS a ON a.family_id = d.family_id
+        WHERE v.feature_id = 'A-2' AND v.value_id = 'A-2-3' AND a.ancestor_id = 'turk'
+    """
+
+    def __init__(
+        self,
+        dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
+        files_with_tables: Sequence[Path] = (
+            FILE_WITH_CATEGORIES,
+            FILE_WITH_COUNTRIES,
+            FILE_WITH_DOCULECTS,
+            FILE_WITH_ENCYCLOPEDIA_VOLUMES,
+            FILE_WITH_LISTED_VALUES,
+            FILE_WITH_MAP_TO_DOCULECT,
+            FILE_WITH_MAPS,
+            FILE_WITH_NAMES_OF_FEATURES,
+            FILE_WITH_VALUE_TYPES,
+        ),
+        file_with_features: Path = FILE_WITH_NAMES_OF_FEATURES,
+        file_with_genealogy_hierarchy: Path = FILE_WITH_GENEALOGY_HIERARCHY,
+        file_with_genealogy_names: Path = FILE_WITH_GENEALOGY_NAMES,
+        corpus: Optional[FeatureProfileCorpus] = None,
+        output_file: Path = FILE_WITH_SQLITE_DATABASE,
+    ):
+        """If `corpus` is given, feature profiles are taken from it
+        (and `dir_with_feature_profiles` is ignored).
+        """
+        self.corpus = corpus
+        self.files_with_tables = files_with_tables
+        self.file_with_genealogy_hierarchy = file_with_genealogy_hierarchy
+        self.file_with_genealogy_names = file_with_genealogy_names
+        self.output_file = output_file
+
+        self.feature_profiles = (
+            self.corpus.files
+            if self.corpus is not None
+            else sorted(list(dir_with_feature_profiles.glob("*.csv")))
+        )
+
+        rows_of_features = read_plain_rows_from_csv(file_with_features, remove_1st_row=False)
+        index_of_id = rows_of_features[0].index(KEY_FOR_ID)
+        index_of_multiselect_option = rows_of_features[0].index(KEY_FOR_MULTISELECT_OPTION)
+        self.multiselect_feature_ids = {
+            row[index_of_id]
+            for row in rows_of_features[1:]
+            if row[index_of_multiselect_option] == "1"
+        }
+
+    def write(self) -> None:
+        """Writes the database. The database is first written to a temporary file,
+        so an existing database is only replaced when the new one is complete.
+        """
+        self.output_file.parent.mkdir(parents=True, exist_ok=True)
+        path_to_temp_file = self.output_file.with_suffix(".tmp")
+        path_to_temp_file.unlink(missing_ok=True)
+
+        connection = sqlite3.connect(path_to_temp_file)
+        try:
+            with connection:
+                for file in self.files_with_tables:
+                    header, *rows = read_plain_rows_from_csv(file, remove_1st_row=False)
+                    self._create_and_fill_table(connection, file.stem, header, rows)
+
+                self._create_and_fill_table(
+                    connection,
+                    TABLE_WITH_FEATURE_VALUES,
+                    COLUMNS_OF_TABLE_WITH_FEATURE_VALUES,
+                    self.iter_rows_of_feature_values(),
+                )
+
+                self._write_genealogy(connection)
+
+                for index_name, (table_name, column_names) in INDEXES.items():
+                    connection.execute(
+                        f"CREATE INDEX {index_name} ON {self._quote(table_name)}"
+                        f" ({', '.join(self._quote(name) for name in column_names)})"
+                    )
+            connection.execute("ANALYZE")
+        except BaseException:
+            connection.close()
+            path_to_temp_file.unlink()
+            raise
+        connection.close()
+
+        path_to_temp_file.replace(self.output_file)
+        print(f"SQLite database written to {self.output_file}")
+
+    def iter_rows_of_feature_values(self) -> Iterator[tuple[str, ...]]:
+        """Yields rows of table `feature_values`, reading one feature profile at a time."""
+        for file in self.feature_profiles:
+            doculect_id = file.stem
+            if self.corpus is not None:
+                rows: Iterable[Sequence[str]] = (
+                    [row[key] for key in COLUMNS_OF_TABLE_WITH_FEATURE_VALUES[1:]]
+                    for row in self.corpus.rows(doculect_id)
+                )
+            else:
+                header, *rows = read_plain_rows_from_csv(file, remove_1st_row=False)
+                if tuple(header) != COLUMNS_OF_TABLE_WITH_FEATURE_VALUES[1:]:
+                    raise SQLiteDatabaseWriterError(f"Unexpected columns in {file.name}: {header}")
+
+            for feature_id, feature_name_ru, value_type, value_id, value_ru, *other in rows:
+                # handling multiselect listed values
+                if value_type == "listed" and feature_id in self.multiselect_feature_ids:
+                    atomic_values = list(
+                        zip(
+                            value_id.split(ATOMIC_VALUE_SEPARATOR),
+                            value_ru.split(ATOMIC_VALUE_SEPARATOR),
+                        )
+                    )
+                else:
+                    atomic_values = [(value_id, value_ru)]
+
+                for atomic_value_id, atomic_value_ru in atomic_values:
+                    yield (
+                        doculect_id,
+                        feature_id,
+                        feature_name_ru,
+                        value_type,
+                        atomic_value_id,
+                        atomic_value_ru,
+                        *other,
+                    )
+
+    def _write_genealogy(self, connection: sqlite3.Connection) -> None:
+        parent_id_for_family_id: dict[str, Optional[str]] = {}
+
+        def walk(nodes: list[GenealogyNode], parent_id: Optional[str]) -> None:
+            for node in nodes:
+                children: list[GenealogyNode] = []
+                if isinstance(node, dict):
+                    ((family_id, children),) = node.items()
+                else:
+                    family_id = node
+                if family_id in parent_id_for_family_id:
+                    raise SQLiteDatabaseWriterError(
+                        f"Family {family_id} occurs more than once in genealogy hierarchy"
+                    )
+                parent_id_for_family_id[family_id] = parent_id
+                walk(children or [], parent_id=family_id)
+
+        walk(read_json_toml_yaml(self.file_with_genealogy_hierarchy), parent_id=None)
+
+        header, *rows = read_plain_rows_from_csv(
+            self.file_with_genealogy_names, remove_1st_row=False
+        )
+        index_of_id = header.index(KEY_FOR_ID)
+        self._create_and_fill_table(
+            connection,
+            TABLE_WITH_FAMILIES,
+            (*header, "parent_id"),
+            ([*row, parent_id_for_family_id.get(row[index_of_id])] for row in rows),
+        )
+
+        def iter_ancestors(family_id: str) -> Iterator[tuple[str, str, int]]:
+            ancestor_id: Optional[str] = family_id
+            distance = 0
+            while ancestor_id is not None:
+                yield family_id, ancestor_id, distance
+                ancestor_id = parent_id_for_family_id[ancestor_id]
+                distance += 1
+
+        self._create_and_fill_table(
+            connection,
+            TABLE_WITH_FAMILY_ANCESTORS,
+            ("family_id", "ancestor_id", "distance"),
+            (row for family_id in parent_id_for_family_id for row in iter_ancestors(family_id)),
+        )
+
+    def _create_and_fill_table(
+        self,
+        connection: sqlite3.Connection,
+        table_name: str,
+        column_names: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+    ) -> None:
+        connection.execute(
+            f"CREATE TABLE {self._quote(table_name)}"
+            f" ({', '.join(self._quote(name) for name in column_names)})"
+        )
+        connection.executemany(
+            f"INSERT INTO {self._quote(table_name)}"
+            f" VALUES ({', '.join('?' for _ in column_names)})",
+            rows,
+        )
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        """Quotes name of table or column (some column names contain spaces or hyphens)."""
+        return '"' + name.replace('"', '""') + '"'
+
+
+if __name__ == "__main__":
+    SQLiteDatabaseWriter().write()
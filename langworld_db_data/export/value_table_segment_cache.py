@@ -0,0 +1,71 @@
+import hashlib
+import pickle
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Optional
+
+from langworld_db_data.constants.paths import CACHE_DIR
+
+FORMAT_VERSION = 2
+"""Must be incremented whenever format of cache entries changes."""
+
+
+class ValueTableSegmentCache:
+    """On-disk cache of segments of CLDF ValueTable, one segment per doculect.
+
+    A segment is the list of lines of `values.csv` made from one feature profile.
+    It is keyed by a hash of the content of the profile and of everything else
+    the lines depend on (inventories, code of the writer), so a segment is only
+    valid as long as none of these change.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR / "cldf_value_table"):
+        self.cache_dir = cache_dir
+
+    def get(self, doculect_id: str, key: str) -> Optional[list[bytes]]:
+        """Returns lines of the segment or `None` if there is no valid segment for given key."""
+        try:
+            version, saved_key, lines = pickle.loads(
+                self._get_path_to_entry(doculect_id).read_bytes()
+            )
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            return None
+
+        if version != FORMAT_VERSION or saved_key != key:
+            return None
+        return lines
+
+    def put(self, doculect_id: str, key: str, lines: list[bytes]) -> None:
+        if not self.cache_dir.exists():
+            self.cache_dir.mkdir(parents=True)
+
+        path_to_entry = self._get_path_to_entry(doculect_id)
+        # write to a temporary file first, so that an interrupted run
+        # never leaves a truncated entry behind
+        path_to_temp_file = path_to_entry.with_suffix(".tmp")
+        path_to_temp_file.write_bytes(
+            pickle.dumps((FORMAT_VERSION, key, lines), protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        path_to_temp_file.replace(path_to_entry)
+
+    def remove_entries_except(self, doculect_ids: Iterable[str]) -> None:
+        """Removes segments of doculects that no longer exist."""
+        paths_to_keep = {self._get_path_to_entry(doculect_id) for doculect_id in doculect_ids}
+        for path_to_entry in self.cache_dir.glob("*.pickle"):
+            if path_to_entry not in paths_to_keep:
+                path_to_entry.unlink()
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        self.remove_entries_except(())
+
+    @staticmethod
+    def make_key(*contents: bytes) -> str:
+        """Makes key from the content of the profile and of other inputs of the segment."""
+        hash_ = hashlib.blake2b(digest_size=32)
+        for content in contents:
+            hash_.update(hashlib.blake2b(content, digest_size=32).digest())
+        return hash_.hexdigest()
+
+    def _get_path_to_entry(self, doculect_id: str) -> Path:
+        return self.cache_dir / f"{doculect_id}.pickle"
@@ -1,11 +1,35 @@
+import argparse
+from collections.abc import Iterable
+from functools import partial
+from pathlib import Path
+from typing import Optional
+
 from pycldf import Dataset
 from tinybear.csv_xls import check_csv_for_malformed_rows
 from tinybear.json_toml_yaml import check_yaml_file
 
-from langworld_db_data.constants.paths import DATA_DIR, FILE_WITH_CLDF_DATASET_METADATA
+from langworld_db_data.constants.paths import (
+    ASSETS_DIR,
+    CLDF_DIR,
+    DATA_DIR,
+    DISCUSSION_FILE_WITH_CUSTOM_VALUES_BY_DOCULECT,
+    DISCUSSION_FILE_WITH_CUSTOM_VALUES_BY_FEATURE,
+    DISCUSSION_FILE_WITH_LISTED_VALUES,
+    FEATURE_PROFILES_DIR,
+    FILE_WITH_CLDF_DATASET_METADATA,
+    INVENTORIES_DIR,
+    SQLITE_DIR,
+)
 from langworld_db_data.export.cldf_dataset_writer import CLDFDatasetWriter
+from langworld_db_data.export.sqlite_database_writer import SQLiteDatabaseWriter
+from langworld_db_data.export.value_table_segment_cache import ValueTableSegmentCache
 from langworld_db_data.mdlisters.custom_value_lister import CustomValueLister
 from langworld_db_data.mdlisters.listed_value_lister import ListedValueLister
+from langworld_db_data.tools.common.change_manifest import EVERYTHING, ChangeManifest
+from langworld_db_data.tools.common.instrumentation import Instrumentation
+from langworld_db_data.tools.common.stage_scheduler import Stage, StageScheduler
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
+from langworld_db_data.tools.featureprofiles.parsed_profile_cache import ParsedProfileCache
 from langworld_db_data.tools.featureprofiles.sort_compound_listed_values import (
     sort_compound_listed_values_in_feature_profiles,
 )
@@ -17,50 +41,409 @@ from langworld_db_data.validators.feature_value_inventory_validator import (
 )
 from langworld_db_data.validators.genealogy_validator import GenealogyValidator
 from langworld_db_data.validators.html_validator import HTMLValidator
+from langworld_db_data.validators.validator import (
+    ERRORS_IN_DATA,
+    ValidationReport,
+    Validator,
+    ValidatorError,
+)
+
+CORPUS = "feature profile corpus"
+VALIDATION_RESULT = "validation result"
+
+
+def main(
+    incremental: bool = True,
+    path_to_report: Optional[Path] = None,
+    path_to_timings: Optional[Path] = None,
+    stages_to_profile: Iterable[str] = (),
+    stages_to_trace_memory: Iterable[str] = (),
+    workers: Optional[int] = None,
+    must_validate_cldf: bool = False,
+    must_write_sqlite: bool = False,
+) -> None:
+    """Runs all checks and writes all generated files.
+
+    The run is split into stages with declared inputs and outputs.
+    Stages that do not depend on each other run concurrently in up to `workers`
+    threads (`workers=1` runs stages one by one), but a stage that writes
+    some data always runs before the stages that read it.
+
+    In incremental mode, only the checks affected by files that have changed
+    since the last successful run are performed. If there is no record of
+    a successful run or the code of the package has changed, all checks are run.
+
+    If `path_to_report` is given, validators do not stop at the first problem.
+    All problems they find are written to this file as JSON,
+    and the run stops after validation if any problems were found.
+
+    If `path_to_timings` is given, time taken by each stage and numbers of files
+    it read and wrote are written to this file as JSON (even if the run fails).
+    Stages named in `stages_to_profile` and `stages_to_trace_memory`
+    are additionally run under `cProfile` and `tracemalloc` respectively.
+    If memory of any stage is traced, stages are run one by one.
+
+    The CLDF dataset is checked while it is written. If `must_validate_cldf` is True,
+    it is additionally read back and validated by `pycldf` (which takes much longer).
+
+    If `must_write_sqlite` is True, all data is also exported to an SQLite database.
+    """
+    stages_to_trace_memory = tuple(stages_to_trace_memory)
+    if stages_to_trace_memory and workers != 1:
+        # `tracemalloc` counts memory allocated by all threads,
+        # so stages running at the same time would distort measurements
+        print("Memory of stages is traced: stages will be run one by one")
+        workers = 1
+
+    instrumentation = Instrumentation(
+        stages_to_profile=stages_to_profile, stages_to_trace_memory=stages_to_trace_memory
+    )
+    try:
+        _run_stages(
+            instrumentation=instrumentation,
+            incremental=incremental,
+            path_to_report=path_to_report,
+            workers=workers,
+            must_validate_cldf=must_validate_cldf,
+            must_write_sqlite=must_write_sqlite,
+        )
+    finally:
+        if path_to_timings is not None:
+            instrumentation.write_json(path_to_timings)
+            print(f"\nTimings of stages written to {path_to_timings}")
+
+
+def _run_stages(
+    instrumentation: Instrumentation,
+    incremental: bool,
+    path_to_report: Optional[Path],
+    workers: Optional[int],
+    must_validate_cldf: bool,
+    must_write_sqlite: bool,
+) -> None:
+    with instrumentation.stage("detect_changes"):
+        manifest = ChangeManifest()
+        changes = manifest.get_changes() if incremental else EVERYTHING
+    if not changes.everything:
+        print(
+            f"\nIncremental run: {len(changes.modified)} file(s) modified, "
+            f"{len(changes.added)} added, {len(changes.removed)} removed since last run"
+        )
+
+    scheduler = StageScheduler(instrumentation=instrumentation, workers=workers)
+
+    # General checks of CSV and YAML files
+    yaml_files = tuple(file for file in DATA_DIR.rglob("*.yaml") if changes.include(file))
+    # feature profiles are checked when they are loaded into the corpus (see below)
+    csv_files = tuple(
+        file
+        for file in DATA_DIR.rglob("*.csv")
+        if file.parent != FEATURE_PROFILES_DIR and changes.include(file)
+    )
+
+    report_for_validator_name: dict[str, ValidationReport] = {}
+    names_of_validation_stages: list[str] = []
+
+    def fail(name_of_stage: str, error: Exception, file: Optional[Path] = None) -> None:
+        """Raises the error or, in report mode, records it as a finding of given stage."""
+        if path_to_report is None:
+            raise error
+        report_for_validator_name.setdefault(name_of_stage, ValidationReport()).add_error(
+            error, validator=name_of_stage, file=file
+        )
+
+    def check_yaml_files() -> None:
+        print("\nChecking YAML files")
+        for file in yaml_files:
+            try:
+                check_yaml_file(file, verbose=False)
+            except ERRORS_IN_DATA as e:
+                fail("check_yaml_files", e, file=file)
 
+    def check_csv_files() -> None:
+        print("\nChecking CSV files for malformed rows")
+        for file in csv_files:
+            try:
+                check_csv_for_malformed_rows(file)
+            except ERRORS_IN_DATA as e:
+                fail("check_csv_files", e, file=file)
+        # Check for uniqueness in columns cannot be done universally, it depends on a
+        # specific file
 
-def main() -> None:
-    print("\nRunning general checks of CSV and YAML files")
+    for name, function, inputs in (
+        ("check_yaml_files", check_yaml_files, yaml_files),
+        ("check_csv_files", check_csv_files, csv_files),
+    ):
+        scheduler.add(Stage(name, function, inputs=inputs, outputs=(f"findings of {name}",)))
+        names_of_validation_stages.append(name)
 
-    print("Checking YAML files")
-    for file in DATA_DIR.rglob("*.yaml"):
-        check_yaml_file(file, verbose=False)
+    # All feature profiles are read once and then shared by all the stages below.
+    # Profiles that have not changed since the previous run are not parsed at all.
+    corpus: Optional[FeatureProfileCorpus] = None
 
-    print("Checking CSV files for malformed rows")
-    for file in DATA_DIR.rglob("*.csv"):
-        check_csv_for_malformed_rows(file)
-    # Check for uniqueness in columns cannot be done universally, it depends on a
-    # specific file
+    def load_feature_profiles() -> None:
+        nonlocal corpus
+        print("\nLoading feature profiles")
+        try:
+            corpus = FeatureProfileCorpus(FEATURE_PROFILES_DIR, cache=ParsedProfileCache())
+        except ERRORS_IN_DATA as e:
+            # in report mode, the stages that need the corpus are skipped
+            fail("load_feature_profiles", e)
 
-    print("OK: General checks passed")
+    scheduler.add(
+        Stage(
+            "load_feature_profiles",
+            load_feature_profiles,
+            inputs=(FEATURE_PROFILES_DIR,),
+            outputs=(CORPUS, "findings of load_feature_profiles"),
+        )
+    )
+    names_of_validation_stages.append("load_feature_profiles")
+
+    def run_validator(validator_class: type[Validator]) -> None:
+        if path_to_report is None:
+            validator_class().validate()
+            return
+
+        report = report_for_validator_name[validator_class.__name__] = ValidationReport()
+        try:
+            validator = validator_class()
+        except ERRORS_IN_DATA as e:
+            report.add_error(e, validator=validator_class.__name__)
+        else:
+            validator.validate_collecting_findings(report)
 
     # These will also run during testing, but it doesn't hurt to check again
-    AssetValidator().validate()
-    DoculectInventoryValidator().validate()
-    GenealogyValidator().validate()
-    FeatureValueInventoryValidator().validate()
-    HTMLValidator().validate()
-    sort_compound_listed_values_in_feature_profiles()
-    FeatureProfileValidator().validate()
-    # In this last validator, exception will be thrown if value name does not match
+    validator_classes: tuple[type[Validator], ...] = (
+        AssetValidator,
+        DoculectInventoryValidator,
+        GenealogyValidator,
+        FeatureValueInventoryValidator,
+        HTMLValidator,
+    )
+    for validator_class in validator_classes:
+        if not validator_class.is_affected_by(changes):
+            print(f"\n{validator_class.__name__}: no relevant changes, skipping")
+            continue
+
+        input_files = validator_class.get_default_input_files()
+        if validator_class is DoculectInventoryValidator:
+            # names of feature profiles are checked as well
+            input_files = (*(input_files or ()), FEATURE_PROFILES_DIR)
+
+        scheduler.add(
+            Stage(
+                validator_class.__name__,
+                partial(run_validator, validator_class),
+                inputs=input_files if input_files is not None else (DATA_DIR,),
+                outputs=(f"findings of {validator_class.__name__}",),
+            )
+        )
+        names_of_validation_stages.append(validator_class.__name__)
+
+    def sort_compound_listed_values() -> None:
+        if corpus is None:
+            return  # loading failed in report mode
+        sort_compound_listed_values_in_feature_profiles(corpus=corpus)
+
+    scheduler.add(
+        Stage(
+            "sort_compound_listed_values",
+            sort_compound_listed_values,
+            inputs=(CORPUS,),
+            outputs=(CORPUS, FEATURE_PROFILES_DIR),
+        )
+    )
+
+    def validate_feature_profiles() -> None:
+        if path_to_report is None:
+            FeatureProfileValidator(corpus=corpus).validate(changes=changes)
+            return
+        if corpus is None:
+            return  # loading failed, the problem is already recorded
+
+        report = report_for_validator_name[FeatureProfileValidator.__name__] = ValidationReport()
+        try:
+            validator = FeatureProfileValidator(corpus=corpus)
+        except ERRORS_IN_DATA as e:
+            report.add_error(e, validator=FeatureProfileValidator.__name__)
+        else:
+            validator.validate_collecting_findings(report, changes=changes)
+
+    # In this validator, exception will be thrown if value name does not match
     # value name in an inventory for given value ID.
     # Value name in feature profile is only there for readability, so this behavior
     # is not required, but for now it seems OK for the exception to be thrown.
     # In an opposite way, rules for `not_applicable` are not strictly enforced yet.
     # Argument `must_throw_error_at_not_applicable_rule_breach`
     # can be set to True at a later stage.
+    if FeatureProfileValidator.is_affected_by(changes):
+        scheduler.add(
+            Stage(
+                FeatureProfileValidator.__name__,
+                validate_feature_profiles,
+                inputs=(CORPUS, INVENTORIES_DIR),
+                outputs=(f"findings of {FeatureProfileValidator.__name__}",),
+            )
+        )
+        names_of_validation_stages.append(FeatureProfileValidator.__name__)
+
+    def finish_validation() -> None:
+        if path_to_report is None:
+            return  # validators have already raised errors if there were any
 
-    print("\nWriting Markdown files")
-    CustomValueLister().write_grouped_by_feature()
-    CustomValueLister().write_grouped_by_volume_and_doculect()
-    ListedValueLister().write_grouped_by_feature()
+        report = ValidationReport()
+        for name in names_of_validation_stages:
+            if name in report_for_validator_name:
+                report.extend(report_for_validator_name[name].findings)
 
-    print("\nWriting CLDF")
-    CLDFDatasetWriter().write()
+        report.write_json(path_to_report)
+        print(f"\nValidation report with {len(report)} finding(s) written to {path_to_report}")
+        if report:
+            raise ValidatorError(
+                f"Validation found {len(report)} problem(s), see {path_to_report}"
+            )
 
-    print("\nValidating CLDF")
-    Dataset.from_metadata(FILE_WITH_CLDF_DATASET_METADATA).validate()
+    # Generated files are only written if validation has passed.
+    scheduler.add(
+        Stage(
+            "finish_validation",
+            finish_validation,
+            inputs=tuple(f"findings of {name}" for name in names_of_validation_stages),
+            outputs=(VALIDATION_RESULT,),
+        )
+    )
+
+    def write_custom_values() -> None:
+        print("\nWriting Markdown files with custom values")
+        custom_value_lister = CustomValueLister(corpus=corpus)
+        custom_value_lister.write_grouped_by_feature()
+        custom_value_lister.write_grouped_by_volume_and_doculect()
+
+    def write_listed_values() -> None:
+        print("\nWriting Markdown file with listed values")
+        ListedValueLister(corpus=corpus).write_grouped_by_feature()
+
+    def write_cldf() -> None:
+        print("\nWriting CLDF")
+        CLDFDatasetWriter(
+            corpus=corpus, cache=ValueTableSegmentCache() if incremental else None
+        ).write()
+
+    def write_sqlite() -> None:
+        print("\nWriting SQLite database")
+        SQLiteDatabaseWriter(corpus=corpus).write()
+
+    def validate_cldf() -> None:
+        print("\nValidating CLDF")
+        Dataset.from_metadata(FILE_WITH_CLDF_DATASET_METADATA).validate()
+
+    scheduler.add(
+        Stage(
+            "write_custom_values",
+            write_custom_values,
+            inputs=(VALIDATION_RESULT, CORPUS, INVENTORIES_DIR),
+            outputs=(
+                DISCUSSION_FILE_WITH_CUSTOM_VALUES_BY_FEATURE,
+                DISCUSSION_FILE_WITH_CUSTOM_VALUES_BY_DOCULECT,
+            ),
+        )
+    )
+    scheduler.add(
+        Stage(
+            "write_listed_values",
+            write_listed_values,
+            inputs=(VALIDATION_RESULT, CORPUS, INVENTORIES_DIR),
+            outputs=(DISCUSSION_FILE_WITH_LISTED_VALUES,),
+        )
+    )
+    scheduler.add(
+        Stage(
+            "write_cldf",
+            write_cldf,
+            inputs=(VALIDATION_RESULT, CORPUS, INVENTORIES_DIR),
+            outputs=(CLDF_DIR,),
+        )
+    )
+    if must_write_sqlite:
+        scheduler.add(
+            Stage(
+                "write_sqlite",
+                write_sqlite,
+                inputs=(VALIDATION_RESULT, CORPUS, INVENTORIES_DIR, ASSETS_DIR),
+                outputs=(SQLITE_DIR,),
+            )
+        )
+    if must_validate_cldf:
+        scheduler.add(Stage("validate_cldf", validate_cldf, inputs=(CLDF_DIR,)))
+
+    scheduler.run()
+
+    # only reached if all stages have succeeded
+    with instrumentation.stage("save_manifest"):
+        manifest.save()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--full", action="store_true", help="run all checks, not only the affected ones"
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        metavar="PATH",
+        help="collect all validation problems instead of stopping at the first one"
+        " and write them to given JSON file",
+    )
+    parser.add_argument(
+        "--timings",
+        type=Path,
+        metavar="PATH",
+        help="write time taken by each stage and numbers of files read and written"
+        " to given JSON file",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="run given stage (or 'all' stages) under cProfile; can be repeated",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="append",
+        default=[],
+        metavar="STAGE",
+        help="measure peak memory of given stage (or 'all' stages); can be repeated."
+        " Stages are then run one by one",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="maximum number of stages running at the same time (1 runs stages one by one)",
+    )
+    parser.add_argument(
+        "--validate-cldf",
+        action="store_true",
+        help="validate written CLDF dataset with pycldf (slow; the dataset is always"
+        " checked while it is written)",
+    )
+    parser.add_argument(
+        "--sqlite",
+        action="store_true",
+        help="also export all data to an SQLite database (see SQLiteDatabaseWriter)",
+    )
+    args = parser.parse_args()
+
+    main(
+        incremental=not args.full,
+        path_to_report=args.report,
+        path_to_timings=args.timings,
+        stages_to_profile=args.profile,
+        stages_to_trace_memory=args.trace_memory,
+        workers=args.workers,
+        must_validate_cldf=args.validate_cldf,
+        must_write_sqlite=args.sqlite,
+    )
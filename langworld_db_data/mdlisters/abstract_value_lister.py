@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
+from typing import Optional
 
 from tinybear.csv_xls import (
     read_dict_from_2_csv_columns,
@@ -14,6 +15,7 @@ from langworld_db_data.constants.literals import (
     ValueType,
 )
 from langworld_db_data.constants.paths import FILE_WITH_DOCULECTS, FILE_WITH_NAMES_OF_FEATURES
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
 
 
 class AbstractValueLister(ABC):
@@ -22,7 +24,11 @@ class AbstractValueLister(ABC):
         value_type: ValueType,
         dir_with_feature_profiles: Path,
         file_with_features: Path = FILE_WITH_NAMES_OF_FEATURES,
+        corpus: Optional[FeatureProfileCorpus] = None,
     ):
+        """If `corpus` is given, feature profiles are taken from it
+        (and `dir_with_feature_profiles` is ignored).
+        """
         self.value_type = value_type
         self.file_with_features = file_with_features
 
@@ -46,7 +52,7 @@ class AbstractValueLister(ABC):
         self.filtered_rows_for_volume_doculect_id = {}
 
         list_of_files = sorted(
-            list(dir_with_feature_profiles.glob("*.csv")),
+            corpus.files if corpus is not None else list(dir_with_feature_profiles.glob("*.csv")),
             key=lambda f: (
                 int(self.encyclopedia_volume_for_doculect_id[f.stem]),
                 f.stem,
@@ -55,7 +61,7 @@ class AbstractValueLister(ABC):
 
         for file in list_of_files:
             key = f"{self.encyclopedia_volume_for_doculect_id[file.stem]}:{file.stem}"
-            rows = read_dicts_from_csv(file)
+            rows = corpus.rows(file.stem) if corpus is not None else read_dicts_from_csv(file)
             self.filtered_rows_for_volume_doculect_id[key] = [
                 row for row in rows if row[KEY_FOR_VALUE_TYPE] == self.value_type
             ]
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 
 from langworld_db_data.constants.literals import (
     ID_SEPARATOR,
@@ -12,11 +13,21 @@ from langworld_db_data.constants.paths import (
     FEATURE_PROFILES_DIR,
 )
 from langworld_db_data.mdlisters.abstract_value_lister import AbstractValueLister
+from langworld_db_data.tools.common.atomic_writer import write_text_if_changed
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
 
 
 class CustomValueLister(AbstractValueLister):
-    def __init__(self, dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR):
-        super().__init__(value_type="custom", dir_with_feature_profiles=dir_with_feature_profiles)
+    def __init__(
+        self,
+        dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
+        corpus: Optional[FeatureProfileCorpus] = None,
+    ):
+        super().__init__(
+            value_type="custom",
+            dir_with_feature_profiles=dir_with_feature_profiles,
+            corpus=corpus,
+        )
 
     def write_grouped_by_volume_and_doculect(
         self, output_file: Path = DISCUSSION_FILE_WITH_CUSTOM_VALUES_BY_DOCULECT
@@ -57,8 +68,7 @@ class CustomValueLister(AbstractValueLister):
             content += "\n"
 
         # print(content)
-        with output_file.open(mode="w+", encoding="utf-8") as fh:
-            fh.write(content)
+        write_text_if_changed(content, output_file)
 
     def write_grouped_by_feature(
         self, output_file: Path = DISCUSSION_FILE_WITH_CUSTOM_VALUES_BY_FEATURE
@@ -120,8 +130,7 @@ class CustomValueLister(AbstractValueLister):
 
         # print(content)
 
-        with output_file.open(mode="w+", encoding="utf-8") as fh:
-            fh.write(content)
+        write_text_if_changed(content, output_file)
 
 
 if __name__ == "__main__":
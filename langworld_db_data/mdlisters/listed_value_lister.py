@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Optional
 
 from tinybear.csv_xls import (
     read_column_from_csv,
@@ -21,6 +22,8 @@ from langworld_db_data.constants.paths import (
     FILE_WITH_NAMES_OF_FEATURES,
 )
 from langworld_db_data.mdlisters.abstract_value_lister import AbstractValueLister
+from langworld_db_data.tools.common.atomic_writer import write_text_if_changed
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
 
 
 class ListedValueLister(AbstractValueLister):
@@ -29,11 +32,13 @@ class ListedValueLister(AbstractValueLister):
         dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
         file_with_features: Path = FILE_WITH_NAMES_OF_FEATURES,
         file_with_listed_values: Path = FILE_WITH_LISTED_VALUES,
+        corpus: Optional[FeatureProfileCorpus] = None,
     ):
         super().__init__(
             value_type="listed",
             dir_with_feature_profiles=dir_with_feature_profiles,
             file_with_features=file_with_features,
+            corpus=corpus,
         )
         self.file_with_listed_values = file_with_listed_values
 
@@ -96,8 +101,7 @@ class ListedValueLister(AbstractValueLister):
                     f" **{len(feature_to_value_to_doculects[feature_id][value_id])}**"
                 )
 
-        with output_file.open(mode="w+", encoding="utf-8") as fh:
-            fh.write(content)
+        write_text_if_changed(content, output_file)
 
     def write_grouped_by_volume_and_doculect(self, output_file: Path) -> None:
         pass
@@ -0,0 +1,208 @@
+import csv
+import io
+import os
+import shutil
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Optional
+
+
+class AtomicWriterError(Exception):
+    pass
+
+
+def serialize_csv(rows: Sequence[Any], delimiter: str = ",") -> bytes:
+    """Returns content of CSV file with given rows exactly as `tinybear.csv_xls.write_csv`
+    would write it. All rows must be of same type (all lists/tuples, all dicts
+    or all NamedTuples). For dicts and NamedTuples, header row is added.
+    """
+    if not rows:
+        raise AtomicWriterError("No rows to write")
+
+    types_of_rows = {type(row) for row in rows}
+    if len(types_of_rows) > 1:
+        raise TypeError(
+            f"Cannot write items of different types ({types_of_rows}) in the same set of rows. "
+            "All items have to be either lists, dicts or NamedTuples"
+        )
+
+    buffer = io.StringIO(newline="")
+    first_row = rows[0]
+    rows_to_write = rows
+
+    if hasattr(first_row, "_asdict"):  # NamedTuple, must be checked before tuple
+        rows_to_write = [row._asdict() for row in rows]
+        writer: Any = csv.DictWriter(
+            buffer, fieldnames=list(first_row._asdict().keys()), delimiter=delimiter
+        )
+    elif isinstance(first_row, dict):
+        writer = csv.DictWriter(buffer, fieldnames=list(first_row.keys()), delimiter=delimiter)
+    elif isinstance(first_row, (list, tuple)):
+        writer = csv.writer(buffer, delimiter=delimiter)
+    else:
+        raise TypeError(
+            f"Each item of the list of rows is of type {type(first_row)}. "
+            "Supported types are list, tuple, dict, NamedTuple."
+        )
+
+    if isinstance(writer, csv.DictWriter):
+        writer.writeheader()
+    writer.writerows(rows_to_write)
+
+    return buffer.getvalue().encode("utf-8")
+
+
+def serialize_text(text: str) -> bytes:
+    """Returns content of text file as it would be written by a file opened in text mode."""
+    return text.replace("\n", os.linesep).encode("utf-8")
+
+
+def write_csv(
+    rows: Sequence[Any], path_to_file: Path, overwrite: bool = True, delimiter: str = ","
+) -> bool:
+    """Drop-in replacement for `tinybear.csv_xls.write_csv` that writes the file atomically
+    and does not touch the file at all if its content would not change.
+
+    Returns True if the file was written.
+    """
+    if not overwrite and path_to_file.exists():
+        raise FileExistsError(f"File {path_to_file} already exists")
+    return write_bytes_if_changed(serialize_csv(rows, delimiter=delimiter), path_to_file)
+
+
+def write_text_if_changed(text: str, path_to_file: Path) -> bool:
+    """Writes text file atomically unless it already has this content.
+    Returns True if the file was written.
+    """
+    return write_bytes_if_changed(serialize_text(text), path_to_file)
+
+
+def write_bytes_if_changed(content: bytes, path_to_file: Path) -> bool:
+    """Writes file atomically unless it already has this content.
+    Returns True if the file was written.
+
+    The content is first written to a temporary file in the same directory,
+    which then replaces the target file, so the target file is never left
+    half-written. The data is not flushed to disk: use `AtomicBatchWriter`
+    if that is needed.
+    """
+    if _read_bytes_or_none(path_to_file) == content:
+        return False
+
+    path_to_temp_file = _write_temp_file(path_to_file, content)
+    try:
+        os.replace(path_to_temp_file, path_to_file)
+    except BaseException:
+        path_to_temp_file.unlink(missing_ok=True)
+        raise
+    return True
+
+
+class AtomicBatchWriter:
+    """Writes many files so that either all of them are replaced or none are.
+
+    Files are added with `add()` or `add_csv()` and only written on `commit()`:
+
+    1. files whose content would not change are skipped;
+    2. new content of all other files is written to temporary files
+       in the same directories and flushed to disk;
+    3. the temporary files replace the target files.
+
+    If anything fails before step 3, temporary files are removed and no target file
+    is touched. If replacing fails in the middle, files that were already replaced
+    are restored from their previous content.
+    """
+
+    def __init__(self, must_sync: bool = True):
+        self.must_sync = must_sync
+        self._content_for_file: dict[Path, bytes] = {}
+
+    def __len__(self) -> int:
+        return len(self._content_for_file)
+
+    def add(self, path_to_file: Path, content: bytes) -> None:
+        """Adds file to the batch (replacing content that was added for it before)."""
+        self._content_for_file[path_to_file] = content
+
+    def add_csv(self, rows: Sequence[Any], path_to_file: Path, delimiter: str = ",") -> None:
+        self.add(path_to_file, serialize_csv(rows, delimiter=delimiter))
+
+    def discard(self) -> None:
+        self._content_for_file.clear()
+
+    def commit(self) -> list[Path]:
+        """Writes all changed files. Returns paths of files that were written."""
+        previous_content_for_file: dict[Path, Optional[bytes]] = {}
+        for file, content in self._content_for_file.items():
+            previous_content = _read_bytes_or_none(file)
+            if previous_content != content:
+                previous_content_for_file[file] = previous_content
+
+        path_to_temp_file_for_file: dict[Path, Path] = {}
+        replaced_files: list[Path] = []
+        try:
+            for file in previous_content_for_file:
+                path_to_temp_file_for_file[file] = _write_temp_file(
+                    file, self._content_for_file[file]
+                )
+            if self.must_sync:
+                self._sync(list(path_to_temp_file_for_file.values()))
+
+            for file, path_to_temp_file in path_to_temp_file_for_file.items():
+                os.replace(path_to_temp_file, file)
+                replaced_files.append(file)
+        except BaseException:
+            for path_to_temp_file in path_to_temp_file_for_file.values():
+                path_to_temp_file.unlink(missing_ok=True)
+            for file in replaced_files:
+                previous_content = previous_content_for_file[file]
+                if previous_content is None:
+                    file.unlink(missing_ok=True)
+                else:
+                    write_bytes_if_changed(previous_content, file)
+            raise
+        finally:
+            self._content_for_file.clear()
+
+        if self.must_sync:
+            self._sync_dirs({file.parent for file in replaced_files})
+
+        return replaced_files
+
+    @staticmethod
+    def _sync(files: list[Path]) -> None:
+        """Flushes given files to disk (`os.sync()` would flush the whole file system)."""
+        for file in files:
+            with file.open("rb+") as fh:
+                os.fsync(fh.fileno())
+
+    @staticmethod
+    def _sync_dirs(dirs: set[Path]) -> None:
+        """Makes sure replacing of files is stored on disk (not possible on Windows)."""
+        if os.name != "posix":
+            return  # pragma: no cover
+        for dir_ in dirs:
+            fd = os.open(dir_, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+
+def _read_bytes_or_none(path_to_file: Path) -> Optional[bytes]:
+    try:
+        return path_to_file.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _write_temp_file(path_to_file: Path, content: bytes) -> Path:
+    path_to_temp_file = path_to_file.with_name(f".{path_to_file.name}.{os.getpid()}.tmp")
+    try:
+        path_to_temp_file.write_bytes(content)
+        if path_to_file.exists():
+            shutil.copymode(path_to_file, path_to_temp_file)
+    except BaseException:
+        path_to_temp_file.unlink(missing_ok=True)
+        raise
+    return path_to_temp_file
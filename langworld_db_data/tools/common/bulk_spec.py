@@ -0,0 +1,33 @@
+from pathlib import Path
+from typing import Any
+
+from tinybear.csv_xls import read_dicts_from_csv
+from tinybear.json_toml_yaml import read_json_toml_yaml
+
+KEY_FOR_ITEMS = "items"
+
+
+class BulkSpecError(Exception):
+    pass
+
+
+def read_items_of_spec(path_to_file: Path) -> list[dict[str, Any]]:
+    """Reads specification of a bulk edit (e.g. many values or features to add).
+
+    The specification is a CSV file (one item per row, column names are keys)
+    or a YAML/JSON/TOML file with a list of mappings under top-level key `items`.
+    """
+    if path_to_file.suffix == ".csv":
+        items: Any = read_dicts_from_csv(path_to_file)
+    else:
+        data = read_json_toml_yaml(path_to_file)
+        items = data.get(KEY_FOR_ITEMS) if isinstance(data, dict) else None
+
+    if not isinstance(items, list) or not items:
+        raise BulkSpecError(f"No items found in {path_to_file.name}")
+
+    for i, item in enumerate(items, start=1):
+        if not isinstance(item, dict):
+            raise BulkSpecError(f"Item {i} in {path_to_file.name} is not a mapping: {item}")
+
+    return items
@@ -0,0 +1,127 @@
+import hashlib
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from langworld_db_data.constants.paths import CACHE_DIR, DATA_DIR, JOURNAL_DIR, PACKAGE_DIR
+
+
+@dataclass(frozen=True)
+class Changes:
+    """Files that have changed since the manifest was last saved.
+    All paths are absolute.
+
+    If `everything` is True, every file must be considered changed
+    (e.g. there is no manifest yet or the code of the package has changed).
+    """
+
+    modified: frozenset[Path] = frozenset()
+    added: frozenset[Path] = frozenset()
+    removed: frozenset[Path] = frozenset()
+    everything: bool = False
+
+    def __bool__(self) -> bool:
+        return self.everything or bool(self.modified or self.added or self.removed)
+
+    def include(self, file: Path) -> bool:
+        """Checks whether given file was modified, added or removed."""
+        if self.everything:
+            return True
+        file = file.resolve()
+        return file in self.modified or file in self.added or file in self.removed
+
+    def include_any(self, files: Iterable[Path]) -> bool:
+        return any(self.include(file) for file in files)
+
+    def include_added_or_removed_in(self, directory: Path) -> bool:
+        """Checks whether any file was added to or removed from given directory."""
+        if self.everything:
+            return True
+        directory = directory.resolve()
+        return any(file.parent == directory for file in self.added | self.removed)
+
+
+EVERYTHING = Changes(everything=True)
+
+
+class ChangeManifest:
+    """Manifest of content hashes of all files in data directory.
+
+    The manifest is meant to be saved after each successful run of the checks.
+    On the next run, `get_changes()` tells which files have changed since then,
+    so that only the checks affected by these files can be re-run.
+
+    Hashes of the source files of the package are stored as well:
+    if the code has changed, all files are considered changed.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path = DATA_DIR,
+        code_dir: Path = PACKAGE_DIR,
+        path_to_manifest: Path = CACHE_DIR / "data_manifest.json",
+        journal_dir: Path = JOURNAL_DIR,
+    ):
+        self.data_dir = data_dir.resolve()
+        # the journal of edits is not data
+        self.journal_dir = journal_dir.resolve()
+        self.code_dir = code_dir
+        self.path_to_manifest = path_to_manifest
+
+    def get_changes(self) -> Changes:
+        try:
+            saved = json.loads(self.path_to_manifest.read_text(encoding="utf-8"))
+            saved_hashes: dict[str, str] = saved["files"]
+            saved_code_hash: str = saved["code"]
+        except (OSError, ValueError, KeyError):
+            return EVERYTHING
+
+        if saved_code_hash != self._hash_code():
+            return EVERYTHING
+
+        current_hashes = self._hash_data_files()
+
+        return Changes(
+            modified=frozenset(
+                self.data_dir / name
+                for name in current_hashes.keys() & saved_hashes.keys()
+                if current_hashes[name] != saved_hashes[name]
+            ),
+            added=frozenset(
+                self.data_dir / name for name in current_hashes.keys() - saved_hashes.keys()
+            ),
+            removed=frozenset(
+                self.data_dir / name for name in saved_hashes.keys() - current_hashes.keys()
+            ),
+        )
+
+    def save(self) -> None:
+        """Stores hashes of current state of files.
+        Must only be called after all checks have passed.
+        """
+        if not self.path_to_manifest.parent.exists():
+            self.path_to_manifest.parent.mkdir(parents=True)
+
+        content = {"code": self._hash_code(), "files": self._hash_data_files()}
+        path_to_temp_file = self.path_to_manifest.with_suffix(".tmp")
+        path_to_temp_file.write_text(json.dumps(content, indent=1), encoding="utf-8")
+        path_to_temp_file.replace(self.path_to_manifest)
+
+    def _hash_data_files(self) -> dict[str, str]:
+        return {
+            file.relative_to(self.data_dir).as_posix(): self._hash(file.read_bytes())
+            for file in sorted(self.data_dir.rglob("*"))
+            if file.is_file() and not file.is_relative_to(self.journal_dir)
+        }
+
+    def _hash_code(self) -> str:
+        hash_ = hashlib.blake2b(digest_size=32)
+        for file in sorted(self.code_dir.rglob("*.py")):
+            hash_.update(file.relative_to(self.code_dir).as_posix().encode("utf-8"))
+            hash_.update(file.read_bytes())
+        return hash_.hexdigest()
+
+    @staticmethod
+    def _hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=32).hexdigest()
@@ -0,0 +1,374 @@
+import difflib
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Optional, Union
+
+from tinybear import csv_xls
+
+from langworld_db_data.constants.literals import (
+    ATOMIC_VALUE_SEPARATOR,
+    AUX_ROW_MARKER,
+    ID_SEPARATOR,
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_ID,
+    KEY_FOR_VALUE_ID,
+    KEY_FOR_VALUE_TYPE,
+)
+from langworld_db_data.constants.paths import FILE_WITH_LISTED_VALUES, FILE_WITH_NAMES_OF_FEATURES
+from langworld_db_data.tools.common import atomic_writer
+from langworld_db_data.tools.common.journal import Journal
+
+Rows = Union[list[dict[str, str]], tuple[dict[str, str], ...]]
+
+
+class EditSessionError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class FileChange:
+    """Change of one file made in an edit session. `old_content` is None for a new file."""
+
+    path: Path
+    old_content: Optional[bytes]
+    new_content: bytes
+
+    @property
+    def summary(self) -> str:
+        """Compact description of the change, e.g. `abaza.csv: +2 -1 lines`."""
+        added, removed = 0, 0
+        for line in self._get_unified_diff_lines(context=0):
+            if line.startswith(("+++", "---")):
+                continue
+            if line.startswith("+"):
+                added += 1
+            elif line.startswith("-"):
+                removed += 1
+        status = " (new file)" if self.old_content is None else ""
+        return f"{self.path.name}: +{added} -{removed} lines{status}"
+
+    def get_unified_diff(self, context: int = 3) -> str:
+        return "".join(self._get_unified_diff_lines(context=context))
+
+    def _get_unified_diff_lines(self, context: int) -> list[str]:
+        old_lines = (self.old_content or b"").decode("utf-8").splitlines(keepends=True)
+        new_lines = self.new_content.decode("utf-8").splitlines(keepends=True)
+        return [
+            line if line.endswith("\n") else f"{line}\n"
+            for line in difflib.unified_diff(
+                old_lines,
+                new_lines,
+                fromfile=f"a/{self.path.name}" if self.old_content is not None else "/dev/null",
+                tofile=f"b/{self.path.name}",
+                n=context,
+            )
+        ]
+
+
+class EditSession:
+    """Batch of edits of inventories and feature profiles that are applied together.
+
+    While a session is active (i.e. inside the `with` block), tools that edit inventories
+    and feature profiles (`FeatureAdder`, `FeatureRemover`, `ListedValueAdder`,
+    `ListedValueRemover`, `ListedValueRenamer`, `ListedValueMover`) do not touch the disk.
+    Each file is read from disk once, and all further reading and writing
+    works with rows held in memory, so every edit sees the results of previous edits.
+
+    When the `with` block is left normally, the session checks that the edited inventories
+    and feature profiles are consistent with each other and writes each changed file once.
+    If any of the edits raises an error or the check finds problems, nothing is written.
+
+    Usage:
+
+        with EditSession():
+            ListedValueAdder().add_listed_value(...)
+            ListedValueRenamer().rename_value_in_profiles_and_inventories(...)
+
+    Note that `ListedValueRenamer` reads the inventory when it is created,
+    so it has to be created inside the `with` block.
+
+    With `dry_run=True`, the session does not write anything on commit.
+    Instead, it stores the changes in `changes` and prints a compact list of changed files,
+    so that edits can be previewed without copying data to another directory:
+
+        with EditSession(dry_run=True) as session:
+            FeatureRemover().remove_feature(...)
+        print(session.get_diff())
+
+    If `journal` is given, the changes are recorded in it (under `description`)
+    before any file is written, so that they can be undone later (see `Journal`).
+    """
+
+    def __init__(
+        self,
+        file_with_features: Path = FILE_WITH_NAMES_OF_FEATURES,
+        file_with_listed_values: Path = FILE_WITH_LISTED_VALUES,
+        must_validate: bool = True,
+        dry_run: bool = False,
+        journal: Optional[Journal] = None,
+        description: str = "",
+    ):
+        self.file_with_features = file_with_features.resolve()
+        self.file_with_listed_values = file_with_listed_values.resolve()
+        self.must_validate = must_validate
+        self.dry_run = dry_run
+        self.journal = journal
+        self.description = description
+        # changes found on last commit in dry run mode
+        self.changes: list[FileChange] = []
+
+        self._rows_for_file: dict[Path, list[dict[str, str]]] = {}
+        self._changed_files: dict[Path, None] = {}  # used as ordered set
+        self._token = None
+
+    def __enter__(self) -> "EditSession":
+        if _active_session.get() is not None:
+            raise EditSessionError("Edit sessions cannot be nested")
+        self._token = _active_session.set(self)  # type: ignore
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        try:
+            if exc_type is None:
+                self.commit()
+            else:
+                self.rollback()
+        finally:
+            _active_session.reset(self._token)  # type: ignore
+            self._token = None
+
+    @property
+    def changed_files(self) -> list[Path]:
+        """Files that were written during the session and not yet committed,
+        in order in which they were first written.
+        """
+        return list(self._changed_files)
+
+    def read_dicts_from_csv(
+        self, path_to_file: Path, delimiter: str = ","
+    ) -> list[dict[str, str]]:
+        """Returns copy of rows of the file as they are in the session."""
+        file = path_to_file.resolve()
+        if file not in self._rows_for_file:
+            self._rows_for_file[file] = csv_xls.read_dicts_from_csv(file, delimiter=delimiter)
+        # Tools change rows in place, so they must not get the rows held by the session.
+        return [row.copy() for row in self._rows_for_file[file]]
+
+    def write_csv(self, rows: Rows, path_to_file: Path, overwrite: bool = True) -> None:
+        """Replaces rows of the file in the session. The file itself is written on commit."""
+        file = path_to_file.resolve()
+        if not overwrite and (file in self._rows_for_file or file.exists()):
+            raise FileExistsError(f"File {path_to_file} already exists")
+        self._rows_for_file[file] = [dict(row) for row in rows]
+        self._changed_files[file] = None
+
+    def get_changes(self) -> list[FileChange]:
+        """Returns changes of files made in the session so far
+        (files whose content has not actually changed are skipped).
+        """
+        changes = []
+        for file in self._changed_files:
+            new_content = atomic_writer.serialize_csv(self._rows_for_file[file])
+            old_content = file.read_bytes() if file.exists() else None
+            if new_content != old_content:
+                changes.append(
+                    FileChange(path=file, old_content=old_content, new_content=new_content)
+                )
+        return changes
+
+    def get_diff(self, context: int = 3) -> str:
+        """Returns unified diff of all changes (those stored in dry run mode
+        after the session is committed or, before that, those made so far).
+        """
+        changes = self.changes if self.changes else self.get_changes()
+        return "".join(change.get_unified_diff(context=context) for change in changes)
+
+    def get_problems(self) -> list[str]:
+        """Checks that changed inventories and feature profiles are consistent with each other.
+
+        Returns list of problems found (empty if there are none).
+        """
+        if not self._changed_files:
+            return []
+
+        problems = []
+
+        feature_ids: set[str] = set()
+        if self._exists(self.file_with_features):
+            for row in self.read_dicts_from_csv(self.file_with_features):
+                if row[KEY_FOR_ID] in feature_ids:
+                    problems.append(f"Feature ID {row[KEY_FOR_ID]} is repeated in inventory")
+                feature_ids.add(row[KEY_FOR_ID])
+
+        feature_id_for_value_id: dict[str, str] = {}
+        if self._exists(self.file_with_listed_values):
+            for row in self.read_dicts_from_csv(self.file_with_listed_values):
+                value_id, feature_id = row[KEY_FOR_ID], row[KEY_FOR_FEATURE_ID]
+                if value_id in feature_id_for_value_id:
+                    problems.append(f"Value ID {value_id} is repeated in inventory")
+                if feature_ids and feature_id not in feature_ids:
+                    problems.append(f"Value ID {value_id} belongs to unknown feature {feature_id}")
+                if not value_id.startswith(f"{feature_id}{ID_SEPARATOR}"):
+                    problems.append(f"Value ID {value_id} does not match feature ID {feature_id}")
+                feature_id_for_value_id[value_id] = feature_id
+
+        for file in self._changed_files:
+            if file in (self.file_with_features, self.file_with_listed_values):
+                continue
+            problems.extend(
+                self._get_problems_in_feature_profile(
+                    file=file,
+                    feature_ids=feature_ids,
+                    feature_id_for_value_id=feature_id_for_value_id,
+                )
+            )
+
+        return problems
+
+    def commit(self) -> None:
+        """Checks changes (unless `must_validate` is False) and writes each changed file once
+        (files whose content has not actually changed are not written).
+
+        If the check finds problems, nothing is written and `EditSessionError` is raised.
+        Files are written with `AtomicBatchWriter`, so if writing fails,
+        all files are left as they were before the commit.
+
+        In dry run mode, changes are stored in `changes` and listed instead of being written.
+        """
+        if self.must_validate:
+            problems = self.get_problems()
+            if problems:
+                self.rollback()
+                raise EditSessionError(
+                    "Changes were not saved because of the following problems:\n"
+                    + "\n".join(problems)
+                )
+
+        if self.dry_run:
+            try:
+                self.changes = self.get_changes()
+            finally:
+                self.rollback()
+            print(f"Dry run: {len(self.changes)} files would be changed")
+            for change in self.changes:
+                print(change.summary)
+            return
+
+        if self.journal is not None:
+            self._commit_with_journal(self.journal)
+            return
+
+        writer = atomic_writer.AtomicBatchWriter()
+        try:
+            for file in self._changed_files:
+                writer.add_csv(self._rows_for_file[file], path_to_file=file)
+            written_files = writer.commit()
+        finally:
+            self.rollback()
+
+        print(f"Saved {len(written_files)} changed files")
+
+    def _commit_with_journal(self, journal: Journal) -> None:
+        try:
+            changes = self.get_changes()
+        finally:
+            self.rollback()
+        if not changes:
+            print("Saved 0 changed files")
+            return
+
+        id_of_operation = journal.begin(description=self.description, changes=changes)
+        writer = atomic_writer.AtomicBatchWriter()
+        for change in changes:
+            writer.add(change.path, change.new_content)
+        try:
+            writer.commit()
+        except BaseException:
+            # the writer has restored the files that were already replaced
+            journal.abort(id_of_operation)
+            raise
+        journal.commit(id_of_operation)
+
+        print(f"Saved {len(changes)} changed files (operation {id_of_operation} in journal)")
+
+    def rollback(self) -> None:
+        """Discards all changes made in the session. Files on disk stay as they were."""
+        self._rows_for_file.clear()
+        self._changed_files.clear()
+
+    def _exists(self, file: Path) -> bool:
+        return file in self._rows_for_file or file.exists()
+
+    def _get_problems_in_feature_profile(
+        self,
+        file: Path,
+        feature_ids: set[str],
+        feature_id_for_value_id: dict[str, str],
+    ) -> list[str]:
+        rows = self._rows_for_file[file]
+        if not rows or KEY_FOR_VALUE_TYPE not in rows[0]:
+            return []  # not a feature profile
+
+        problems = []
+        for i, row in enumerate(rows, start=2):
+            feature_id = row[KEY_FOR_FEATURE_ID]
+            if feature_id == AUX_ROW_MARKER:
+                continue
+            if feature_ids and feature_id not in feature_ids:
+                problems.append(f"{file.name}, row {i}: unknown feature ID {feature_id}")
+
+            if row[KEY_FOR_VALUE_TYPE] != "listed" or not feature_id_for_value_id:
+                continue
+
+            for value_id in row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR):
+                if value_id not in feature_id_for_value_id:
+                    problems.append(f"{file.name}, row {i}: unknown value ID {value_id}")
+                elif feature_id_for_value_id[value_id] != feature_id:
+                    problems.append(
+                        f"{file.name}, row {i}: value ID {value_id} does not belong "
+                        f"to feature {feature_id}"
+                    )
+        return problems
+
+
+_active_session: ContextVar[Optional[EditSession]] = ContextVar("_active_session", default=None)
+
+
+def get_active_session() -> Optional[EditSession]:
+    return _active_session.get()
+
+
+# The functions below are drop-in replacements for functions from `tinybear.csv_xls`
+# used by the tools that edit inventories and feature profiles. They work with the disk
+# when no session is active and with the active session otherwise.
+# Files are written atomically and only if their content changes (see `atomic_writer`).
+
+
+def read_dicts_from_csv(path_to_file: Path, delimiter: str = ",") -> list[dict[str, str]]:
+    session = _active_session.get()
+    if session is None:
+        return csv_xls.read_dicts_from_csv(path_to_file, delimiter=delimiter)  # type: ignore
+    return session.read_dicts_from_csv(path_to_file, delimiter=delimiter)
+
+
+def read_column_from_csv(path_to_file: Path, column_name: str) -> list[str]:
+    return [row[column_name] for row in read_dicts_from_csv(path_to_file)]
+
+
+def write_csv(rows: Rows, path_to_file: Path, overwrite: bool, delimiter: str) -> None:
+    session = _active_session.get()
+    if session is None:
+        atomic_writer.write_csv(
+            rows, path_to_file=path_to_file, overwrite=overwrite, delimiter=delimiter
+        )
+        return
+    if delimiter != ",":
+        raise EditSessionError("Only comma-separated files can be written in an edit session")
+    session.write_csv(rows, path_to_file=path_to_file, overwrite=overwrite)
@@ -5,6 +5,17 @@ from .extract import (
     extract_feature_index,
     extract_value_index,
 )
+from .remap import (
+    IDMapping,
+    get_mapping_after_deletion,
+    get_mapping_after_insertion,
+    get_mapping_after_insertions,
+    remap_ids_in_feature_profile,
+    remap_ids_in_file_with_features,
+    remap_ids_in_inventory_of_features,
+    remap_ids_in_inventory_of_listed_values,
+    remove_references_to_values_in_inventory_of_features,
+)
 from .update import decrement_indices_after_deletion
 
 __all__ = [
@@ -13,4 +24,13 @@ __all__ = [
     "extract_value_index",
     "extract_category_id",
     "decrement_indices_after_deletion",
+    "IDMapping",
+    "get_mapping_after_deletion",
+    "get_mapping_after_insertion",
+    "get_mapping_after_insertions",
+    "remap_ids_in_feature_profile",
+    "remap_ids_in_file_with_features",
+    "remap_ids_in_inventory_of_features",
+    "remap_ids_in_inventory_of_listed_values",
+    "remove_references_to_values_in_inventory_of_features",
 ]
@@ -0,0 +1,286 @@
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Union
+
+from langworld_db_data.constants.literals import (
+    ATOMIC_VALUE_SEPARATOR,
+    ID_SEPARATOR,
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_ID,
+    KEY_FOR_VALUE_ID,
+)
+from langworld_db_data.tools.common.edit_session import read_dicts_from_csv, write_csv
+
+KEY_FOR_NOT_APPLICABLE_IF = "not_applicable_if"
+SEPARATOR_OF_VALUE_IDS_IN_NOT_APPLICABLE_IF = ", "
+
+Rows = Sequence[dict[str, str]]
+
+
+@dataclass(frozen=True)
+class IDMapping:
+    """Old→new feature IDs and value IDs.
+
+    If a feature ID is remapped, IDs of all its values are remapped too
+    (e.g. with A-2 → A-3, A-2-5 becomes A-3-5), unless a value ID is remapped explicitly.
+    IDs that are not in the mapping remain unchanged.
+    """
+
+    new_feature_id_for_old: Mapping[str, str] = field(default_factory=dict)
+    new_value_id_for_old: Mapping[str, str] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.new_feature_id_for_old or self.new_value_id_for_old)
+
+    def remap_feature_id(self, feature_id: str) -> str:
+        return self.new_feature_id_for_old.get(feature_id, feature_id)
+
+    def remap_value_id(self, value_id: str) -> str:
+        """Remaps atomic value ID."""
+        if value_id in self.new_value_id_for_old:
+            return self.new_value_id_for_old[value_id]
+
+        feature_id, _, value_index = value_id.rpartition(ID_SEPARATOR)
+        if feature_id not in self.new_feature_id_for_old:
+            return value_id
+        return f"{self.new_feature_id_for_old[feature_id]}{ID_SEPARATOR}{value_index}"
+
+    def remap_compound_value_id(self, value_id: str) -> str:
+        """Remaps value ID that may consist of several atomic value IDs (e.g. A-1-2&A-1-3)."""
+        if ATOMIC_VALUE_SEPARATOR not in value_id:
+            return self.remap_value_id(value_id)
+        return ATOMIC_VALUE_SEPARATOR.join(
+            self.remap_value_id(atomic_value_id)
+            for atomic_value_id in value_id.split(ATOMIC_VALUE_SEPARATOR)
+        )
+
+    def remap_list_of_value_ids(self, value_ids: str) -> str:
+        """Remaps comma-separated value IDs (as in column `not_applicable_if`)."""
+        if not value_ids:
+            return value_ids
+        return SEPARATOR_OF_VALUE_IDS_IN_NOT_APPLICABLE_IF.join(
+            self.remap_value_id(value_id)
+            for value_id in value_ids.split(SEPARATOR_OF_VALUE_IDS_IN_NOT_APPLICABLE_IF)
+        )
+
+
+def get_mapping_after_insertion(ids: Iterable[str], inserted_id: str) -> dict[str, str]:
+    """Returns new IDs for IDs that must be incremented when `inserted_id` is inserted.
+
+    Works both for feature IDs (A-1, A-2...) and value IDs (A-1-1, A-1-2...):
+    IDs with the same parent (category or feature) and index equal to or greater than
+    the index of the inserted ID are incremented.
+    """
+    return _get_mapping_after_shift(ids, first_id_to_shift=inserted_id, shift=1)
+
+
+def get_mapping_after_insertions(
+    ids: Iterable[str], insertions: Sequence[tuple[str, Optional[int]]]
+) -> tuple[dict[str, str], list[str]]:
+    """Returns new IDs for existing IDs and IDs of new items when several items
+    are inserted at once.
+
+    Each insertion is a pair of parent ID (category or feature) and index to assign
+    to the new item (`None` means after the last item of the parent). Insertions are made
+    in given order, so the result is the same as that of separate insertions
+    with `get_mapping_after_insertion`.
+
+    Throws ValueError if index to assign is out of range.
+    """
+    ids_for_parent_id: dict[str, list[str]] = {}
+    for id_ in ids:
+        ids_for_parent_id.setdefault(id_.rpartition(ID_SEPARATOR)[0], []).append(id_)
+
+    # Each parent with new items is represented by a list of its items in final order:
+    # existing items are their IDs, new items are their positions in `insertions`.
+    items_for_parent_id: dict[str, list[Union[str, int]]] = {}
+
+    for i, (parent_id, index_to_assign) in enumerate(insertions):
+        items = items_for_parent_id.setdefault(
+            parent_id, list(ids_for_parent_id.get(parent_id, ()))
+        )
+        if index_to_assign is None:
+            items.append(i)
+        elif 1 <= index_to_assign <= len(items) + 1:
+            items.insert(index_to_assign - 1, i)
+        else:
+            raise ValueError(
+                f"Invalid index_to_assign for item {i + 1} (must be between 1 and "
+                f"{len(items) + 1}, {index_to_assign} was given)"
+            )
+
+    new_id_for_old: dict[str, str] = {}
+    ids_of_new_items = [""] * len(insertions)
+
+    for parent_id, items in items_for_parent_id.items():
+        for index, id_or_position in enumerate(items, start=1):
+            id_ = f"{parent_id}{ID_SEPARATOR}{index}"
+            if isinstance(id_or_position, int):
+                ids_of_new_items[id_or_position] = id_
+            elif id_or_position != id_:
+                new_id_for_old[id_or_position] = id_
+
+    return new_id_for_old, ids_of_new_items
+
+
+def get_mapping_after_deletion(ids: Iterable[str], deleted_id: str) -> dict[str, str]:
+    """Returns new IDs for IDs that must be decremented when `deleted_id` is deleted.
+
+    Works both for feature IDs and value IDs: IDs with the same parent (category or feature)
+    and index greater than the index of the deleted ID are decremented.
+    """
+    parent_id, _, deleted_index = deleted_id.rpartition(ID_SEPARATOR)
+    return _get_mapping_after_shift(
+        ids, first_id_to_shift=f"{parent_id}{ID_SEPARATOR}{int(deleted_index) + 1}", shift=-1
+    )
+
+
+def remap_ids_in_inventory_of_features(rows: Rows, mapping: IDMapping) -> Rows:
+    """Remaps feature IDs and value IDs referenced in column `not_applicable_if`.
+
+    Rows are not modified: rows whose IDs change are copied, all other rows are shared
+    between input and output. If nothing changes, the input `rows` object is returned.
+    """
+    return _remap_rows(
+        rows,
+        remap_for_column={
+            KEY_FOR_ID: mapping.remap_feature_id,
+            KEY_FOR_NOT_APPLICABLE_IF: mapping.remap_list_of_value_ids,
+        },
+        mapping=mapping,
+    )
+
+
+def remove_references_to_values_in_inventory_of_features(
+    rows: Rows, is_removed_value_id: Callable[[str], bool]
+) -> Rows:
+    """Removes references to removed values from column `not_applicable_if`.
+
+    This must be done before remapping: IDs of removed values can be taken by other values.
+    Rows are not modified (see `remap_ids_in_inventory_of_features`).
+    """
+    if not rows or KEY_FOR_NOT_APPLICABLE_IF not in rows[0]:
+        return rows
+
+    new_rows: list[dict[str, str]] = []
+    is_changed = False
+
+    for row in rows:
+        value_ids = row[KEY_FOR_NOT_APPLICABLE_IF]
+        if not value_ids:
+            new_rows.append(row)
+            continue
+        remaining_value_ids = [
+            value_id
+            for value_id in value_ids.split(SEPARATOR_OF_VALUE_IDS_IN_NOT_APPLICABLE_IF)
+            if not is_removed_value_id(value_id)
+        ]
+        new_content = SEPARATOR_OF_VALUE_IDS_IN_NOT_APPLICABLE_IF.join(remaining_value_ids)
+        if new_content == value_ids:
+            new_rows.append(row)
+            continue
+        is_changed = True
+        new_rows.append({**row, KEY_FOR_NOT_APPLICABLE_IF: new_content})
+
+    return new_rows if is_changed else rows
+
+
+def remap_ids_in_file_with_features(
+    input_file: Path,
+    output_file: Path,
+    mapping: IDMapping,
+    is_removed_value_id: Optional[Callable[[str], bool]] = None,
+) -> None:
+    """Applies mapping to inventory of features (see `remap_ids_in_inventory_of_features`).
+    If `is_removed_value_id` is given, references to removed values are removed first
+    (see `remove_references_to_values_in_inventory_of_features`).
+    The file is only written if anything has changed.
+    """
+    if not mapping and is_removed_value_id is None:
+        return
+
+    rows = read_dicts_from_csv(input_file)
+    remapped_rows = rows
+    if is_removed_value_id is not None:
+        remapped_rows = remove_references_to_values_in_inventory_of_features(
+            remapped_rows, is_removed_value_id
+        )
+    remapped_rows = remap_ids_in_inventory_of_features(remapped_rows, mapping)
+
+    if remapped_rows is not rows:
+        print(f"Updating IDs in {output_file.name}")
+        write_csv(remapped_rows, path_to_file=output_file, overwrite=True, delimiter=",")
+
+
+def remap_ids_in_inventory_of_listed_values(rows: Rows, mapping: IDMapping) -> Rows:
+    """Remaps value IDs and feature IDs in inventory of listed values.
+
+    Rows are not modified (see `remap_ids_in_inventory_of_features`).
+    """
+    return _remap_rows(
+        rows,
+        remap_for_column={
+            KEY_FOR_ID: mapping.remap_value_id,
+            KEY_FOR_FEATURE_ID: mapping.remap_feature_id,
+        },
+        mapping=mapping,
+    )
+
+
+def remap_ids_in_feature_profile(rows: Rows, mapping: IDMapping) -> Rows:
+    """Remaps feature IDs and (atomic) value IDs in rows of a feature profile.
+
+    Rows are not modified (see `remap_ids_in_inventory_of_features`).
+    """
+    return _remap_rows(
+        rows,
+        remap_for_column={
+            KEY_FOR_FEATURE_ID: mapping.remap_feature_id,
+            KEY_FOR_VALUE_ID: mapping.remap_compound_value_id,
+        },
+        mapping=mapping,
+    )
+
+
+def _get_mapping_after_shift(
+    ids: Iterable[str], first_id_to_shift: str, shift: int
+) -> dict[str, str]:
+    parent_id, _, first_index_to_shift = first_id_to_shift.rpartition(ID_SEPARATOR)
+    new_id_for_old: dict[str, str] = {}
+
+    for id_ in ids:
+        current_parent_id, _, index = id_.rpartition(ID_SEPARATOR)
+        if current_parent_id != parent_id or int(index) < int(first_index_to_shift):
+            continue
+        new_id_for_old[id_] = f"{parent_id}{ID_SEPARATOR}{int(index) + shift}"
+
+    return new_id_for_old
+
+
+def _remap_rows(
+    rows: Rows,
+    remap_for_column: dict[str, Callable[[str], str]],
+    mapping: IDMapping,
+) -> Rows:
+    if not mapping or not rows:
+        return rows
+
+    columns = [column for column in remap_for_column if column in rows[0]]
+    new_rows: list[dict[str, str]] = []
+    is_changed = False
+
+    for row in rows:
+        new_row = row
+        for column in columns:
+            new_content = remap_for_column[column](row[column])
+            if new_content == row[column]:
+                continue
+            if new_row is row:
+                new_row = row.copy()
+            new_row[column] = new_content
+        if new_row is not row:
+            is_changed = True
+        new_rows.append(new_row)
+
+    return new_rows if is_changed else rows
@@ -0,0 +1,218 @@
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from langworld_db_data.constants.paths import CACHE_DIR, MAIN_DIR
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_RDWR | os.O_APPEND | os.O_CREAT | os.O_TRUNC
+_IGNORED_SUFFIXES = (".py", ".pyc")
+
+
+@dataclass
+class StageStats:
+    """Measurements of one stage of the pipeline."""
+
+    name: str
+    seconds: float = 0.0
+    files_read: int = 0
+    files_written: int = 0
+    peak_memory_bytes: Optional[int] = None
+    path_to_profile: Optional[str] = None
+    _read: set[str] = field(default_factory=set, repr=False)
+    _written: set[str] = field(default_factory=set, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+
+
+class Instrumentation:
+    """Measures stages of the pipeline.
+
+    Each stage is timed, and files that are opened for reading or writing
+    while the stage is running are counted (each file is counted once per stage).
+    Only files in `root_dir` are counted, except for Python source and bytecode.
+
+    Stages whose names are in `stages_to_profile` are run under `cProfile`,
+    and the statistics are saved to `dir_for_profiles`.
+    For stages whose names are in `stages_to_trace_memory`, peak memory allocated
+    by Python code is measured with `tracemalloc`. Both slow the stage down,
+    so they should only be used for stages that are being investigated.
+    `"all"` can be passed instead of a name to apply to every stage.
+
+    Stages may run in different threads at the same time:
+    files are attributed to the stage running in the thread that opened them.
+    Profiled stages and stages with traced memory are run one at a time,
+    but note that `tracemalloc` measures memory allocated by all threads of the process,
+    including those running other stages (so measurements are only exact
+    when stages are run one by one).
+
+    Stages can be nested. A profiled stage nested in another profiled stage has its own
+    profile, and its calls are not included in the profile of the outer stage.
+    Peak memory of a stage includes peak memory of the stages nested in it.
+    """
+
+    def __init__(
+        self,
+        stages_to_profile: Iterable[str] = (),
+        stages_to_trace_memory: Iterable[str] = (),
+        dir_for_profiles: Path = CACHE_DIR / "profiles",
+        root_dir: Path = MAIN_DIR,
+    ):
+        self.stages_to_profile = set(stages_to_profile)
+        self.stages_to_trace_memory = set(stages_to_trace_memory)
+        self.dir_for_profiles = dir_for_profiles
+        self.root_dir = os.path.join(os.path.abspath(root_dir), "")
+
+        self.stages: list[StageStats] = []
+        self._created_at = time.perf_counter()
+        self._stats_lock = threading.Lock()
+        # profiler and tracemalloc are process-wide, so stages using them cannot overlap
+        # (but they can be nested, hence a reentrant lock)
+        self._exclusive_lock = threading.RLock()
+        # profilers of stages that are running (the innermost is the last one),
+        # and for running stages with traced memory, peak memory that is not seen
+        # by `tracemalloc` anymore because stages nested in them have reset the peak
+        self._profilers: list[cProfile.Profile] = []
+        self._peaks_of_memory_of_outer_stages: list[int] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageStats]:
+        """Context manager measuring the code run inside it as a stage with given name."""
+        stats = StageStats(name=name)
+        with self._stats_lock:
+            self.stages.append(stats)
+
+        must_profile = self._applies_to(name, self.stages_to_profile)
+        must_trace_memory = self._applies_to(name, self.stages_to_trace_memory)
+
+        previous_stage = _current_stage_for_thread.get(threading.get_ident())
+        _install_audit_hook()
+        _current_stage_for_thread[threading.get_ident()] = (self, stats)
+
+        if must_profile or must_trace_memory:
+            self._exclusive_lock.acquire()
+
+        profiler = cProfile.Profile() if must_profile else None
+        must_stop_tracemalloc = False
+        if must_trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                must_stop_tracemalloc = True
+            if self._peaks_of_memory_of_outer_stages:
+                self._peaks_of_memory_of_outer_stages[-1] = max(
+                    self._peaks_of_memory_of_outer_stages[-1], tracemalloc.get_traced_memory()[1]
+                )
+            self._peaks_of_memory_of_outer_stages.append(0)
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter()
+        if profiler is not None:
+            if self._profilers:
+                self._profilers[-1].disable()
+            self._profilers.append(profiler)
+            profiler.enable()
+
+        try:
+            yield stats
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._profilers.pop()
+                if self._profilers:
+                    self._profilers[-1].enable()
+
+            stats.seconds = time.perf_counter() - start
+
+            if must_trace_memory:
+                stats.peak_memory_bytes = max(
+                    self._peaks_of_memory_of_outer_stages.pop(), tracemalloc.get_traced_memory()[1]
+                )
+                if self._peaks_of_memory_of_outer_stages:
+                    self._peaks_of_memory_of_outer_stages[-1] = max(
+                        self._peaks_of_memory_of_outer_stages[-1], stats.peak_memory_bytes
+                    )
+                if must_stop_tracemalloc:
+                    tracemalloc.stop()
+
+            if previous_stage is None:
+                del _current_stage_for_thread[threading.get_ident()]
+            else:
+                _current_stage_for_thread[threading.get_ident()] = previous_stage
+
+            stats.files_read = len(stats._read)
+            stats.files_written = len(stats._written)
+
+            # the file with statistics is not counted as written by the stage
+            if profiler is not None:
+                if not self.dir_for_profiles.exists():
+                    self.dir_for_profiles.mkdir(parents=True)
+                path_to_profile = self.dir_for_profiles / f"{name}.prof"
+                profiler.dump_stats(path_to_profile)
+                stats.path_to_profile = str(path_to_profile)
+
+            if must_profile or must_trace_memory:
+                self._exclusive_lock.release()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total_seconds": time.perf_counter() - self._created_at,
+            "stages": [stats.to_dict() for stats in self.stages],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def write_json(self, path_to_file: Union[Path, str]) -> None:
+        Path(path_to_file).write_text(self.to_json(), encoding="utf-8")
+
+    def _register_open(self, stats: StageStats, path: str, is_for_writing: bool) -> None:
+        if not path.startswith(self.root_dir) or path.endswith(_IGNORED_SUFFIXES):
+            return
+        (stats._written if is_for_writing else stats._read).add(path)
+
+    @staticmethod
+    def _applies_to(name: str, names: set[str]) -> bool:
+        return name in names or "all" in names
+
+
+_current_stage_for_thread: dict[int, tuple[Instrumentation, StageStats]] = {}
+_is_audit_hook_installed = False
+
+
+def _install_audit_hook() -> None:
+    # An audit hook cannot be removed once added, so it is only added once per process
+    # and does nothing when no stage is running.
+    global _is_audit_hook_installed
+    if not _is_audit_hook_installed:
+        sys.addaudithook(_audit_hook)
+        _is_audit_hook_installed = True
+
+
+def _audit_hook(event: str, args: tuple[Any, ...]) -> None:
+    if event != "open" or not _current_stage_for_thread:
+        return
+
+    current = _current_stage_for_thread.get(threading.get_ident())
+    if current is None:
+        return
+
+    path, mode, flags = args
+    if not isinstance(path, (str, os.PathLike)):
+        return  # file descriptor or bytes
+
+    if isinstance(mode, str):
+        is_for_writing = any(char in mode for char in "wax+")
+    else:
+        is_for_writing = bool(flags & _WRITE_FLAGS)
+
+    instrumentation, stats = current
+    instrumentation._register_open(stats, os.path.abspath(path), is_for_writing)
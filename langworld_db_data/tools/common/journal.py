@@ -0,0 +1,295 @@
+import hashlib
+import json
+import os
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal, Optional
+
+from langworld_db_data.constants.paths import JOURNAL_DIR
+from langworld_db_data.tools.common import atomic_writer
+
+if TYPE_CHECKING:
+    from langworld_db_data.tools.common.edit_session import FileChange
+
+StateOfOperation = Literal["pending", "applied", "undone", "aborted"]
+
+EVENT_BEGIN = "begin"
+EVENT_COMMIT = "commit"
+EVENT_ABORT = "abort"
+EVENT_UNDO = "undo"
+EVENT_REDO = "redo"
+
+STATE_AFTER_EVENT: dict[str, StateOfOperation] = {
+    EVENT_BEGIN: "pending",
+    EVENT_COMMIT: "applied",
+    EVENT_ABORT: "aborted",
+    EVENT_UNDO: "undone",
+    EVENT_REDO: "applied",
+}
+
+
+class JournalError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class JournalledFile:
+    """File changed by an operation. `hash_before` is None if the operation created the file."""
+
+    path: Path
+    hash_before: Optional[str]
+    hash_after: str
+
+
+@dataclass(frozen=True)
+class Operation:
+    id: int
+    description: str
+    time: str
+    files: tuple[JournalledFile, ...]
+    state: StateOfOperation
+
+
+class Journal:
+    """Append-only journal of edits of data files (write-ahead log).
+
+    Before files are replaced, the journal stores their previous and new content
+    (in directory `objects`, under hashes of the content) and appends a record
+    of the operation to `journal.jsonl`. Once all files are written, the operation
+    is marked as applied. This makes it possible:
+
+    - to undo last operations (`undo`) and to replay undone ones (`replay`);
+    - to finish an operation that was interrupted while files were being replaced
+      (`recover`).
+
+    Only files changed by an operation are read and written when it is undone or replayed.
+    A file is never overwritten if it was changed after the operation by something
+    the journal does not know about: `JournalError` is raised instead.
+
+    The journal is normally used through `EditSession`:
+
+        with EditSession(journal=Journal(), description="Add feature A-22"):
+            FeatureAdder().add_feature(...)
+    """
+
+    def __init__(self, dir_: Path = JOURNAL_DIR):
+        self.dir = dir_
+        self.path_to_journal = dir_ / "journal.jsonl"
+        self.dir_with_objects = dir_ / "objects"
+        # Paths are stored relative to the parent of the journal (i.e. data dir)
+        self.base_dir = dir_.resolve().parent
+
+    def get_operations(self) -> list[Operation]:
+        """Returns all operations in the journal in order in which they were started."""
+        return list(self._read_operations().values())
+
+    def begin(self, description: str, changes: Sequence["FileChange"]) -> int:
+        """Stores old and new content of files and records the operation as pending.
+        Must be called before the files are written. Returns ID of the operation.
+        """
+        self.dir_with_objects.mkdir(parents=True, exist_ok=True)
+
+        # content must be on disk before the operation is recorded
+        writer = atomic_writer.AtomicBatchWriter()
+        files = []
+        for change in changes:
+            files.append(
+                {
+                    "path": self._relative_path(change.path),
+                    "before": (
+                        self._add_object(writer, change.old_content)
+                        if change.old_content is not None
+                        else None
+                    ),
+                    "after": self._add_object(writer, change.new_content),
+                }
+            )
+        writer.commit()
+
+        operations = self._read_operations()
+        id_ = max(operations, default=0) + 1
+        self._append_event(
+            EVENT_BEGIN,
+            id_,
+            description=description,
+            time=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            files=files,
+        )
+        return id_
+
+    def commit(self, id_: int) -> None:
+        """Marks the operation as applied (all its files have been written)."""
+        self._append_event(EVENT_COMMIT, id_)
+
+    def abort(self, id_: int) -> None:
+        """Marks the operation as aborted (none of its files have been written)."""
+        self._append_event(EVENT_ABORT, id_)
+
+    def undo(self, number_of_operations: int = 1) -> list[Operation]:
+        """Restores files changed by last applied operations, the latest one first.
+        Returns operations that were undone.
+        """
+        operations = self._get_last_operations_in_state(
+            "applied", number_of_operations=number_of_operations
+        )
+        for operation in operations:
+            self._restore_files(operation, to_state="before")
+            self._append_event(EVENT_UNDO, operation.id)
+            print(f"Undone operation {operation.id}: {operation.description}")
+        return operations
+
+    def replay(self, number_of_operations: int = 1) -> list[Operation]:
+        """Applies again the operations that were last undone, the latest undone one first.
+        Returns operations that were replayed.
+        """
+        operations = self._get_last_operations_in_state(
+            "undone", number_of_operations=number_of_operations
+        )
+        for operation in operations:
+            self._restore_files(operation, to_state="after")
+            self._append_event(EVENT_REDO, operation.id)
+            print(f"Replayed operation {operation.id}: {operation.description}")
+        return operations
+
+    def recover(self) -> list[Operation]:
+        """Finishes operations that were interrupted while their files were being written
+        (each file must have either old or new content). Returns operations that were finished.
+        """
+        operations = [
+            operation
+            for operation in self._read_operations().values()
+            if operation.state == "pending"
+        ]
+        for operation in operations:
+            self._restore_files(operation, to_state="after", allow_partially_applied=True)
+            self._append_event(EVENT_COMMIT, operation.id)
+            print(f"Finished interrupted operation {operation.id}: {operation.description}")
+        return operations
+
+    def _get_last_operations_in_state(
+        self, state: StateOfOperation, number_of_operations: int
+    ) -> list[Operation]:
+        operations = self._read_operations(order_by_last_event=True)
+        if any(operation.state == "pending" for operation in operations.values()):
+            raise JournalError(
+                "Journal has an interrupted operation, it must be finished first (see `recover`)"
+            )
+
+        operations_in_state = [
+            operation for operation in reversed(operations.values()) if operation.state == state
+        ][:number_of_operations]
+        if len(operations_in_state) < number_of_operations:
+            raise JournalError(
+                f"Cannot process {number_of_operations} operations: only"
+                f" {len(operations_in_state)} operations are {state}"
+            )
+        return operations_in_state
+
+    def _restore_files(
+        self,
+        operation: Operation,
+        to_state: Literal["before", "after"],
+        allow_partially_applied: bool = False,
+    ) -> None:
+        writer = atomic_writer.AtomicBatchWriter()
+        files_to_delete = []
+
+        for file in operation.files:
+            path = self.base_dir / file.path
+            current_hash = self._hash(path.read_bytes()) if path.exists() else None
+            expected_hash, target_hash = (
+                (file.hash_after, file.hash_before)
+                if to_state == "before"
+                else (file.hash_before, file.hash_after)
+            )
+            if current_hash == target_hash and allow_partially_applied:
+                continue
+            if current_hash != expected_hash:
+                raise JournalError(
+                    f"Cannot restore {file.path} to its state {to_state} operation"
+                    f" {operation.id}: file has been changed by something else"
+                )
+
+            if target_hash is None:
+                files_to_delete.append(path)
+            else:
+                writer.add(path, self._read_object(target_hash))
+
+        writer.commit()
+        for path in files_to_delete:
+            path.unlink()
+
+    def _read_operations(self, order_by_last_event: bool = False) -> dict[int, Operation]:
+        """Returns operations in order in which they were started
+        or (if `order_by_last_event` is True) in order of their last events.
+        """
+        if not self.path_to_journal.exists():
+            return {}
+
+        operations: dict[int, Operation] = {}
+        with self.path_to_journal.open(encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                id_ = event["id"]
+
+                if event["event"] == EVENT_BEGIN:
+                    operations[id_] = Operation(
+                        id=id_,
+                        description=event["description"],
+                        time=event["time"],
+                        files=tuple(
+                            JournalledFile(
+                                path=Path(file["path"]),
+                                hash_before=file["before"],
+                                hash_after=file["after"],
+                            )
+                            for file in event["files"]
+                        ),
+                        state=STATE_AFTER_EVENT[EVENT_BEGIN],
+                    )
+                    continue
+
+                if id_ not in operations:
+                    raise JournalError(f"Journal has event for unknown operation {id_}")
+                operation = operations.pop(id_) if order_by_last_event else operations[id_]
+                operations[id_] = Operation(
+                    id=id_,
+                    description=operation.description,
+                    time=operation.time,
+                    files=operation.files,
+                    state=STATE_AFTER_EVENT[event["event"]],
+                )
+
+        return operations
+
+    def _append_event(self, event: str, id_: int, **kwargs: Any) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self.path_to_journal.open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"event": event, "id": id_, **kwargs}, ensure_ascii=False) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def _add_object(self, writer: atomic_writer.AtomicBatchWriter, content: bytes) -> str:
+        """Adds content to writer (unless it is already stored). Returns hash of content."""
+        hash_ = self._hash(content)
+        path = self.dir_with_objects / hash_
+        if not path.exists():
+            writer.add(path, content)
+        return hash_
+
+    def _read_object(self, hash_: str) -> bytes:
+        try:
+            return (self.dir_with_objects / hash_).read_bytes()
+        except FileNotFoundError:
+            raise JournalError(f"Content {hash_} is missing from {self.dir_with_objects}")
+
+    def _relative_path(self, path: Path) -> str:
+        return Path(os.path.relpath(path.resolve(), self.base_dir)).as_posix()
+
+    @staticmethod
+    def _hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=32).hexdigest()
@@ -0,0 +1,193 @@
+import sys
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from io import StringIO
+from pathlib import Path
+from typing import Any, Optional, TextIO, Union
+
+from langworld_db_data.tools.common.instrumentation import Instrumentation
+
+Resource = Union[Path, str]
+"""File or directory (`Path`) or name of an object held in memory (`str`)."""
+
+
+class StageSchedulerError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Stage:
+    """A step of a pipeline with declared inputs and outputs.
+
+    A directory in inputs or outputs stands for all files in it.
+    """
+
+    name: str
+    run: Callable[[], Any]
+    inputs: tuple[Resource, ...] = ()
+    outputs: tuple[Resource, ...] = ()
+
+
+class StageScheduler:
+    """Runs stages of a pipeline, running independent stages concurrently.
+
+    A stage depends on a stage that was added before it if it reads or writes
+    anything that stage writes, or writes anything that stage reads.
+    Stages run in threads as soon as all stages they depend on have finished,
+    so with `workers=1` they simply run one by one in order in which they were added.
+
+    Everything a stage prints is held back and printed in order of stages,
+    so the output looks the same as if the stages were run one by one.
+    If a stage fails, no more stages are started, stages that are already
+    running are allowed to finish, and the error of the earliest stage is raised.
+    """
+
+    def __init__(
+        self, instrumentation: Optional[Instrumentation] = None, workers: Optional[int] = None
+    ):
+        """`workers` is the maximum number of stages running at the same time
+        (`None` means default number of threads of `ThreadPoolExecutor`).
+        """
+        self.instrumentation = (
+            instrumentation if instrumentation is not None else Instrumentation()
+        )
+        self.workers = workers
+        self.stages: list[Stage] = []
+
+    def add(self, stage: Stage) -> None:
+        if any(existing_stage.name == stage.name for existing_stage in self.stages):
+            raise StageSchedulerError(f"Stage {stage.name} was already added")
+        self.stages.append(stage)
+
+    def get_dependencies(self) -> dict[str, list[str]]:
+        """Returns names of stages that each stage depends on."""
+        return {
+            self.stages[i].name: [self.stages[j].name for j in sorted(indices)]
+            for i, indices in enumerate(self._get_dependencies())
+        }
+
+    def run(self) -> None:
+        if self.workers == 1:
+            for stage in self.stages:
+                with self.instrumentation.stage(stage.name):
+                    stage.run()
+            return
+
+        dependencies = self._get_dependencies()
+        not_started = list(range(len(self.stages)))
+        finished: set[int] = set()
+        running: dict[Future, int] = {}
+        output_for_index: dict[int, str] = {}
+        error_for_index: dict[int, Exception] = {}
+        next_index_to_print = 0
+
+        stdout = _ThreadRoutingStdout(sys.stdout)
+        sys.stdout = stdout  # type: ignore
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                while True:
+                    if not error_for_index:
+                        for i in [i for i in not_started if dependencies[i] <= finished]:
+                            not_started.remove(i)
+                            running[executor.submit(self._run_stage, self.stages[i], stdout)] = i
+
+                    if not running:
+                        break
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        i = running.pop(future)
+                        output_for_index[i], error = future.result()
+                        if error is None:
+                            finished.add(i)
+                        else:
+                            error_for_index[i] = error
+
+                    while next_index_to_print in output_for_index:
+                        stdout.original.write(output_for_index.pop(next_index_to_print))
+                        next_index_to_print += 1
+        finally:
+            sys.stdout = stdout.original
+
+        # output of stages that ran after a stage that failed
+        for i in sorted(output_for_index):
+            print(output_for_index[i], end="")
+
+        if error_for_index:
+            raise error_for_index[min(error_for_index)]
+
+    def _run_stage(
+        self, stage: Stage, stdout: "_ThreadRoutingStdout"
+    ) -> tuple[str, Optional[Exception]]:
+        buffer = StringIO()
+        stdout.capture_for_current_thread(buffer)
+        try:
+            with self.instrumentation.stage(stage.name):
+                stage.run()
+        except Exception as e:
+            return buffer.getvalue(), e
+        finally:
+            stdout.stop_capturing_for_current_thread()
+
+        return buffer.getvalue(), None
+
+    def _get_dependencies(self) -> list[set[int]]:
+        inputs = [self._normalize(stage.inputs) for stage in self.stages]
+        outputs = [self._normalize(stage.outputs) for stage in self.stages]
+
+        return [
+            {
+                j
+                for j in range(i)
+                if self._overlap(inputs[i] + outputs[i], outputs[j])
+                or self._overlap(outputs[i], inputs[j])
+            }
+            for i in range(len(self.stages))
+        ]
+
+    @staticmethod
+    def _normalize(resources: tuple[Resource, ...]) -> tuple[Resource, ...]:
+        return tuple(r.resolve() if isinstance(r, Path) else r for r in resources)
+
+    @staticmethod
+    def _overlap(resources: tuple[Resource, ...], other_resources: tuple[Resource, ...]) -> bool:
+        for resource in resources:
+            for other_resource in other_resources:
+                if resource == other_resource:
+                    return True
+                if (
+                    isinstance(resource, Path)
+                    and isinstance(other_resource, Path)
+                    and (resource in other_resource.parents or other_resource in resource.parents)
+                ):
+                    return True
+        return False
+
+
+class _ThreadRoutingStdout:
+    """Replacement for `sys.stdout` that sends output of some threads to their own buffers
+    and everything else to the original stream.
+    """
+
+    def __init__(self, original: TextIO):
+        self.original = original
+        self._local = threading.local()
+
+    def capture_for_current_thread(self, buffer: StringIO) -> None:
+        self._local.buffer = buffer
+
+    def stop_capturing_for_current_thread(self) -> None:
+        self._local.buffer = None
+
+    def write(self, text: str) -> int:
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self.original).write(text)
+
+    def flush(self) -> None:
+        buffer = getattr(self._local, "buffer", None)
+        (buffer if buffer is not None else self.original).flush()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.original, name)
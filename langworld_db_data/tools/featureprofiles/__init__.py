@@ -1,12 +1,39 @@
+import sys
 from dataclasses import dataclass
 
+from langworld_db_data.constants.literals import (
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_RUSSIAN_NAME_OF_FEATURE,
+    KEY_FOR_VALUE_TYPE,
+)
+
+COLUMNS_WITH_REPEATING_VALUES = (
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_RUSSIAN_NAME_OF_FEATURE,
+    KEY_FOR_VALUE_TYPE,
+)
+"""Columns of feature profiles whose values are the same in many profiles."""
+
 
 @dataclass
 class ValueForFeatureProfileDictionary:
     """Class for a data structure that represents a value
     in a dictionary for reading/writing feature profiles.
+
+    Instances have no `__dict__` (attributes are stored in slots),
+    because there are hundreds of thousands of them when all profiles are loaded.
     """
 
+    __slots__ = (
+        "feature_name_ru",
+        "value_type",
+        "value_id",
+        "value_ru",
+        "comment_ru",
+        "comment_en",
+        "page_numbers",
+    )
+
     feature_name_ru: str
     value_type: str
     value_id: str
@@ -14,3 +41,16 @@ class ValueForFeatureProfileDictionary:
     comment_ru: str
     comment_en: str
     page_numbers: str
+
+
+def intern_repeating_values(row: dict[str, str]) -> dict[str, str]:
+    """Replaces values in columns that repeat across profiles (feature ID,
+    feature name, value type) with interned strings, so that each distinct string
+    is only stored once in memory however many profiles are loaded.
+
+    Modifies the row in place and returns it.
+    """
+    for key in COLUMNS_WITH_REPEATING_VALUES:
+        if key in row:
+            row[key] = sys.intern(row[key])
+    return row
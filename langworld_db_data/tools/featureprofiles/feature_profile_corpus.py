@@ -0,0 +1,190 @@
+from array import array
+from dataclasses import asdict
+from pathlib import Path
+from typing import Optional
+
+from langworld_db_data.constants.literals import (
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_VALUE_ID,
+    KEY_FOR_VALUE_TYPE,
+)
+from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR
+from langworld_db_data.tools.featureprofiles import (
+    ValueForFeatureProfileDictionary,
+    intern_repeating_values,
+)
+from langworld_db_data.tools.featureprofiles.feature_profile_reader import FeatureProfileReader
+from langworld_db_data.tools.featureprofiles.parsed_profile_cache import (
+    ParsedProfileCache,
+    read_rows_of_profile,
+)
+
+NO_CODE = -1
+"""Code stored in the matrix for a feature that is absent from a profile."""
+
+
+class FeatureProfileCorpus:
+    """All feature profiles from a directory, loaded into memory at once.
+
+    Each CSV file is parsed exactly once, when the corpus is created.
+    Validators, Markdown listers, CLDF writer and other tools that accept
+    a corpus read profiles from it instead of parsing the files themselves.
+
+    Apart from the rows of each profile, the corpus keeps a doculect × feature
+    matrix of value types and value IDs. The strings are interned:
+    the matrix only stores integer codes (in arrays), the strings themselves
+    are stored once in `value_types` and `value_ids`. Feature IDs, feature names
+    and value types in the rows are interned as well.
+
+    Tools that modify a profile that is part of the corpus must call
+    `update_profile()` after writing it, so that the consumers further down
+    the line see the new data.
+
+    If `cache` is given, profiles that have not changed since they were last parsed
+    are taken from the cache instead of being parsed again.
+    """
+
+    def __init__(
+        self,
+        dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
+        cache: Optional[ParsedProfileCache] = None,
+    ):
+        self.dir_with_feature_profiles = dir_with_feature_profiles
+        self.files = sorted(list(dir_with_feature_profiles.glob("*.csv")))
+        self.doculect_ids = [file.stem for file in self.files]
+        self._index_for_doculect_id = {
+            doculect_id: i for i, doculect_id in enumerate(self.doculect_ids)
+        }
+
+        self._rows_for_doculect_id: dict[str, list[dict[str, str]]] = {
+            file.stem: self.read_rows(file, cache) for file in self.files
+        }
+
+        self.value_types: list[str] = []
+        self.value_ids: list[str] = []
+        self._code_for_value_type: dict[str, int] = {}
+        self._code_for_value_id: dict[str, int] = {}
+
+        self._build_matrix()
+
+    def __contains__(self, doculect_id: object) -> bool:
+        return doculect_id in self._rows_for_doculect_id
+
+    def __len__(self) -> int:
+        return len(self.doculect_ids)
+
+    def path_for(self, doculect_id: str) -> Path:
+        """Returns path to the file the profile of given doculect was read from."""
+        return self.dir_with_feature_profiles / f"{doculect_id}.csv"
+
+    def contains_file(self, file: Path) -> bool:
+        """Checks whether given file is one of the files the corpus was read from."""
+        return file.stem in self and file.resolve() == self.path_for(file.stem).resolve()
+
+    def rows(self, doculect_id: str) -> list[dict[str, str]]:
+        """Returns rows of feature profile as if they were read
+        with `read_dicts_from_csv`.
+
+        The rows are shared between all consumers of the corpus and must not be modified.
+        Use `update_profile()` to change the profile.
+        """
+        return self._rows_for_doculect_id[doculect_id]
+
+    def profile(self, doculect_id: str) -> dict[str, ValueForFeatureProfileDictionary]:
+        """Returns feature profile in the same form as
+        `FeatureProfileReader.read_feature_profile_as_dict_from_file()`.
+
+        The returned objects are created anew on each call and can be modified freely.
+        """
+        return FeatureProfileReader.convert_rows_to_feature_profile_dict(
+            rows=self._rows_for_doculect_id[doculect_id], file_name_for_error_msg=doculect_id
+        )
+
+    def value_type(self, doculect_id: str, feature_id: str) -> str:
+        """Returns value type of given feature in given doculect
+        (empty string if the feature is absent from the profile).
+        """
+        code = self.value_type_codes[self._cell(doculect_id, feature_id)]
+        return self.value_types[code] if code != NO_CODE else ""
+
+    def value_id(self, doculect_id: str, feature_id: str) -> str:
+        """Returns value ID of given feature in given doculect
+        (empty string if there is no value ID or the feature is absent from the profile).
+        """
+        code = self.value_id_codes[self._cell(doculect_id, feature_id)]
+        return self.value_ids[code] if code != NO_CODE else ""
+
+    def update_profile(
+        self, doculect_id: str, feature_dict: dict[str, ValueForFeatureProfileDictionary]
+    ) -> None:
+        """Replaces profile of given doculect with the new data.
+        Accepts the same dictionary that `FeatureProfileWriterFromDictionary` accepts.
+        """
+        if doculect_id not in self:
+            raise KeyError(f"Doculect {doculect_id} is not part of the corpus")
+
+        self._rows_for_doculect_id[doculect_id] = [
+            intern_repeating_values({KEY_FOR_FEATURE_ID: feature_id, **asdict(value)})
+            for feature_id, value in feature_dict.items()
+        ]
+
+        if set(feature_dict) - set(self._index_for_feature_id):
+            self._build_matrix()
+        else:
+            self._fill_matrix_row(self._index_for_doculect_id[doculect_id])
+
+    @staticmethod
+    def read_rows(file: Path, cache: Optional[ParsedProfileCache] = None) -> list[dict[str, str]]:
+        """Reads rows of one feature profile (taking them from `cache` if possible)."""
+        return [intern_repeating_values(row) for row in read_rows_of_profile(file, cache)]
+
+    def _build_matrix(self) -> None:
+        feature_ids: dict[str, None] = {}  # ordered set
+        for doculect_id in self.doculect_ids:
+            for row in self._rows_for_doculect_id[doculect_id]:
+                if row[KEY_FOR_FEATURE_ID]:
+                    feature_ids[row[KEY_FOR_FEATURE_ID]] = None
+
+        self.feature_ids = list(feature_ids)
+        self._index_for_feature_id = {
+            feature_id: i for i, feature_id in enumerate(self.feature_ids)
+        }
+
+        number_of_cells = len(self.doculect_ids) * len(self.feature_ids)
+        self.value_type_codes = array("b", [NO_CODE]) * number_of_cells
+        self.value_id_codes = array("i", [NO_CODE]) * number_of_cells
+
+        for doculect_index in range(len(self.doculect_ids)):
+            self._fill_matrix_row(doculect_index)
+
+    def _fill_matrix_row(self, doculect_index: int) -> None:
+        width = len(self.feature_ids)
+        start = doculect_index * width
+        self.value_type_codes[start : start + width] = array("b", [NO_CODE]) * width
+        self.value_id_codes[start : start + width] = array("i", [NO_CODE]) * width
+
+        for row in self._rows_for_doculect_id[self.doculect_ids[doculect_index]]:
+            if not row[KEY_FOR_FEATURE_ID]:
+                continue
+            cell = start + self._index_for_feature_id[row[KEY_FOR_FEATURE_ID]]
+            self.value_type_codes[cell] = self._intern(
+                row[KEY_FOR_VALUE_TYPE], self.value_types, self._code_for_value_type
+            )
+            if row[KEY_FOR_VALUE_ID]:
+                self.value_id_codes[cell] = self._intern(
+                    row[KEY_FOR_VALUE_ID], self.value_ids, self._code_for_value_id
+                )
+
+    def _cell(self, doculect_id: str, feature_id: str) -> int:
+        try:
+            feature_index = self._index_for_feature_id[feature_id]
+        except KeyError:
+            raise KeyError(f"Feature {feature_id} not found in any profile of the corpus")
+        return self._index_for_doculect_id[doculect_id] * len(self.feature_ids) + feature_index
+
+    @staticmethod
+    def _intern(string: str, table: list[str], code_for_string: dict[str, int]) -> int:
+        if string not in code_for_string:
+            code_for_string[string] = len(table)
+            table.append(string)
+        return code_for_string[string]
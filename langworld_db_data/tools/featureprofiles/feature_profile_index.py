@@ -0,0 +1,133 @@
+from pathlib import Path
+from typing import Optional
+
+from langworld_db_data.constants.literals import (
+    ATOMIC_VALUE_SEPARATOR,
+    KEY_FOR_FEATURE_ID,
+    KEY_FOR_VALUE_ID,
+    KEY_FOR_VALUE_TYPE,
+)
+from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR
+from langworld_db_data.tools.common.edit_session import get_active_session, read_dicts_from_csv
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
+from langworld_db_data.tools.featureprofiles.parsed_profile_cache import ParsedProfileCache
+
+
+class FeatureProfileIndex:
+    """Inverted index of feature profiles: for each listed value ID and each feature ID,
+    doculects whose profiles use it.
+
+    Compound values (e.g. `A-1-1&A-1-2`) are indexed under each of their atomic value IDs.
+    Feature IDs are indexed together with value type, so that it is possible to find
+    e.g. all profiles where a feature has a custom value.
+
+    Tools that edit profiles use the index to open only the profiles that are affected
+    by the edit instead of all profiles. A tool that writes a profile must call `update()`
+    with the new rows, so that the index stays valid for further edits.
+
+    The index is built from rows of profiles that have already been parsed elsewhere
+    whenever possible: if `corpus` is given, rows are taken from it
+    (and `dir_with_feature_profiles` is ignored); otherwise, if `cache` is given,
+    profiles that have not changed since they were last parsed are taken from the cache.
+    Inside an edit session, profiles are read as they are in the session
+    (the cache only knows about files on disk).
+    """
+
+    def __init__(
+        self,
+        dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
+        corpus: Optional[FeatureProfileCorpus] = None,
+        cache: Optional[ParsedProfileCache] = None,
+    ):
+        self.dir_with_feature_profiles = (
+            corpus.dir_with_feature_profiles if corpus is not None else dir_with_feature_profiles
+        )
+
+        self._doculects_for_value_id: dict[str, set[str]] = {}
+        self._doculects_for_feature_id_and_value_type: dict[tuple[str, str], set[str]] = {}
+        self._keys_for_doculect: dict[str, tuple[set[str], set[tuple[str, str]]]] = {}
+
+        if corpus is not None:
+            for doculect_id in corpus.doculect_ids:
+                self.update(doculect_id=doculect_id, rows=corpus.rows(doculect_id))
+        else:
+            for file in sorted(dir_with_feature_profiles.glob("*.csv")):
+                self.update(doculect_id=file.stem, rows=self._read_rows(file, cache))
+
+    def doculects_with_value(self, value_id: str) -> list[str]:
+        """Returns sorted IDs of doculects that have given listed value,
+        on its own or as part of a compound value.
+        """
+        return sorted(self._doculects_for_value_id.get(value_id, ()))
+
+    def doculects_with_feature(
+        self, feature_id: str, value_type: Optional[str] = None
+    ) -> list[str]:
+        """Returns sorted IDs of doculects whose profiles have given feature
+        (with given value type, if it is passed).
+        """
+        if value_type is not None:
+            return sorted(
+                self._doculects_for_feature_id_and_value_type.get((feature_id, value_type), ())
+            )
+
+        doculects: set[str] = set()
+        for key, doculects_for_key in self._doculects_for_feature_id_and_value_type.items():
+            indexed_feature_id, _ = key
+            if indexed_feature_id == feature_id:
+                doculects.update(doculects_for_key)
+        return sorted(doculects)
+
+    def files_with_value(self, value_id: str) -> list[Path]:
+        return [self._path_for(doculect_id) for doculect_id in self.doculects_with_value(value_id)]
+
+    def files_with_feature(self, feature_id: str, value_type: Optional[str] = None) -> list[Path]:
+        return [
+            self._path_for(doculect_id)
+            for doculect_id in self.doculects_with_feature(feature_id, value_type)
+        ]
+
+    def update(self, doculect_id: str, rows: list[dict[str, str]]) -> None:
+        """Replaces everything that is indexed for given doculect with data from given rows."""
+        self.remove(doculect_id)
+
+        value_ids: set[str] = set()
+        feature_ids_and_value_types: set[tuple[str, str]] = set()
+        for row in rows:
+            feature_ids_and_value_types.add((row[KEY_FOR_FEATURE_ID], row[KEY_FOR_VALUE_TYPE]))
+            if row[KEY_FOR_VALUE_ID]:
+                value_ids.update(row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR))
+
+        for value_id in value_ids:
+            self._doculects_for_value_id.setdefault(value_id, set()).add(doculect_id)
+        for key in feature_ids_and_value_types:
+            self._doculects_for_feature_id_and_value_type.setdefault(key, set()).add(doculect_id)
+
+        self._keys_for_doculect[doculect_id] = (value_ids, feature_ids_and_value_types)
+
+    def remove(self, doculect_id: str) -> None:
+        """Removes everything that is indexed for given doculect."""
+        if doculect_id not in self._keys_for_doculect:
+            return
+
+        value_ids, feature_ids_and_value_types = self._keys_for_doculect.pop(doculect_id)
+        for value_id in value_ids:
+            self._discard(self._doculects_for_value_id, value_id, doculect_id)
+        for key in feature_ids_and_value_types:
+            self._discard(self._doculects_for_feature_id_and_value_type, key, doculect_id)
+
+    @staticmethod
+    def _read_rows(file: Path, cache: Optional[ParsedProfileCache]) -> list[dict[str, str]]:
+        if get_active_session() is not None:
+            return read_dicts_from_csv(file)
+        return FeatureProfileCorpus.read_rows(file, cache)
+
+    def _path_for(self, doculect_id: str) -> Path:
+        return self.dir_with_feature_profiles / f"{doculect_id}.csv"
+
+    @staticmethod
+    def _discard(doculects_for_key: dict, key: object, doculect_id: str) -> None:
+        doculects = doculects_for_key[key]
+        doculects.discard(doculect_id)
+        if not doculects:
+            del doculects_for_key[key]
@@ -1,4 +1,7 @@
+import csv
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import Optional
 
 import pyperclip
 from tinybear.csv_xls import read_dicts_from_csv
@@ -13,6 +16,11 @@ from langworld_db_data.constants.literals import (
 from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR
 from langworld_db_data.tools.featureprofiles import (
     ValueForFeatureProfileDictionary,
+    intern_repeating_values,
+)
+from langworld_db_data.tools.featureprofiles.parsed_profile_cache import (
+    ParsedProfileCache,
+    read_rows_of_profile,
 )
 
 
@@ -36,25 +44,96 @@ class FeatureProfileReader:
     @staticmethod
     def read_feature_profile_as_dict_from_file(
         file: Path,
+        cache: Optional[ParsedProfileCache] = None,
     ) -> dict[str, ValueForFeatureProfileDictionary]:
         """
-        Accepts path to feature profile.
+        Accepts path to feature profile and (optionally) cache of parsed profiles.
 
         Reads feature profile and returns dictionary:
         Keys are feature IDs, values are `ValueForFeatureProfileDictionary` objects
         with the rest of the columns for the respective row.
+
+        If cache is given and the file has not changed since it was last parsed,
+        the rows are taken from the cache.
         """
-        feature_id_to_row_dict = {}
+        rows = read_dicts_from_csv(file) if cache is None else read_rows_of_profile(file, cache)
 
-        for i, row in enumerate(read_dicts_from_csv(file), start=1):
-            if not row[KEY_FOR_FEATURE_ID]:
-                raise ValueError(f"File {file.stem} does not contain feature ID in row {i + 1}")
-            relevant_columns = {key: row[key] for key in row if key != KEY_FOR_FEATURE_ID}
-            feature_id_to_row_dict[row[KEY_FOR_FEATURE_ID]] = ValueForFeatureProfileDictionary(
-                **relevant_columns
+        return FeatureProfileReader.convert_rows_to_feature_profile_dict(
+            rows=rows, file_name_for_error_msg=file.stem
+        )
+
+    @staticmethod
+    def convert_rows_to_feature_profile_dict(
+        rows: Iterable[dict[str, str]],
+        file_name_for_error_msg: str,
+    ) -> dict[str, ValueForFeatureProfileDictionary]:
+        """
+        Accepts rows of feature profile (as read from CSV file)
+        and name of the profile to be used in error messages.
+
+        Returns dictionary:
+        Keys are feature IDs, values are `ValueForFeatureProfileDictionary` objects
+        with the rest of the columns for the respective row.
+        """
+        return dict(
+            FeatureProfileReader._convert_rows(
+                rows=rows, file_name_for_error_msg=file_name_for_error_msg
+            )
+        )
+
+    @staticmethod
+    def iterate_feature_profile(
+        file: Path,
+    ) -> Iterator[tuple[str, ValueForFeatureProfileDictionary]]:
+        """
+        Accepts path to feature profile.
+
+        Lazily yields pairs of feature ID and `ValueForFeatureProfileDictionary` object
+        with the rest of the columns for the respective row, in order of rows in the file.
+        The file is read as the rows are consumed, so the whole profile
+        is never held in memory. The file stays open until the iteration is finished
+        or the generator is closed.
+        """
+        with file.open(encoding="utf-8-sig", newline="") as fh:
+            yield from FeatureProfileReader._convert_rows(
+                rows=csv.DictReader(fh), file_name_for_error_msg=file.stem
             )
 
-        return feature_id_to_row_dict
+    @staticmethod
+    def read_value_for_feature_from_file(
+        file: Path, feature_id: str
+    ) -> ValueForFeatureProfileDictionary:
+        """
+        Accepts path to feature profile and feature ID.
+
+        Returns `ValueForFeatureProfileDictionary` object for given feature.
+        Reading stops at the row with given feature ID,
+        the rest of the file is not read.
+
+        :raises KeyError if feature ID is not found in the file.
+        """
+        rows = FeatureProfileReader.iterate_feature_profile(file)
+        try:
+            for feature_id_in_row, value in rows:
+                if feature_id_in_row == feature_id:
+                    return value
+        finally:
+            rows.close()
+
+        raise KeyError(f"Feature ID {feature_id} not found in file {file.name}")
+
+    @staticmethod
+    def _convert_rows(
+        rows: Iterable[dict[str, str]], file_name_for_error_msg: str
+    ) -> Iterator[tuple[str, ValueForFeatureProfileDictionary]]:
+        for i, row in enumerate(rows, start=1):
+            if not row[KEY_FOR_FEATURE_ID]:
+                raise ValueError(
+                    f"File {file_name_for_error_msg} does not contain feature ID in row {i + 1}"
+                )
+            relevant_columns = intern_repeating_values(dict(row))
+            feature_id = relevant_columns.pop(KEY_FOR_FEATURE_ID)
+            yield feature_id, ValueForFeatureProfileDictionary(**relevant_columns)
 
     def read_value_for_doculect_and_feature(
         self,
@@ -76,10 +155,9 @@ class FeatureProfileReader:
         """
 
         try:
-            loaded_data_for_feature = self.read_feature_profile_as_dict_from_doculect_id(
-                doculect_id=doculect_id,
-                dir_with_feature_profiles=dir_with_feature_profiles,
-            )[feature_id]
+            loaded_data_for_feature = self.read_value_for_feature_from_file(
+                file=dir_with_feature_profiles / f"{doculect_id}.csv", feature_id=feature_id
+            )
         except KeyError:
             raise KeyError(f"{feature_id=} not found for {doculect_id=}")
 
@@ -1,9 +1,8 @@
 from dataclasses import asdict
 from pathlib import Path
 
-from tinybear.csv_xls import write_csv
-
 from langworld_db_data.constants.literals import KEY_FOR_FEATURE_ID
+from langworld_db_data.tools.common.atomic_writer import write_csv
 from langworld_db_data.tools.featureprofiles import (
     ValueForFeatureProfileDictionary,
 )
@@ -15,6 +14,8 @@ class FeatureProfileWriterFromDictionary:
     where keys are feature IDs and values are `ValueForFeatureProfileDictionary`
     objects.
 
+    The file is written atomically and only if its content changes.
+
     The class is intended for use in combination with
     some other functionality that manipulates feature profile data.
 
@@ -1,7 +1,9 @@
 from copy import copy
 from pathlib import Path
+from typing import Optional
 
 from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
 from langworld_db_data.tools.featureprofiles.feature_profile_reader import FeatureProfileReader
 from langworld_db_data.tools.featureprofiles.feature_profile_writer_from_dictionary import (  # noqa E501
     FeatureProfileWriterFromDictionary,
@@ -34,12 +36,22 @@ class NotApplicableSetter:
         dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
         output_dir: Path = FEATURE_PROFILES_DIR,
         write_even_if_no_changes: bool = False,
+        corpus: Optional[FeatureProfileCorpus] = None,
     ):
-        self.feature_profiles = sorted(list(dir_with_feature_profiles.glob("*.csv")))
+        """If `corpus` is given, feature profiles are taken from it
+        (and `dir_with_feature_profiles` is ignored). Profiles that are written
+        back into the directory of the corpus are updated in the corpus as well.
+        """
+        self.corpus = corpus
+        self.feature_profiles = (
+            self.corpus.files
+            if self.corpus is not None
+            else sorted(list(dir_with_feature_profiles.glob("*.csv")))
+        )
         self.output_dir = output_dir
 
         self.reader = FeatureProfileReader
-        self.validator = FeatureProfileValidator()
+        self.validator = FeatureProfileValidator(corpus=corpus)
         self.writer = FeatureProfileWriterFromDictionary
 
         self.write_even_if_no_changes = write_even_if_no_changes
@@ -60,7 +72,10 @@ class NotApplicableSetter:
 
             print(f"\n{file.name}")
 
-            profile = self.reader.read_feature_profile_as_dict_from_file(file)
+            if self.corpus is not None:
+                profile = self.corpus.profile(file.stem)
+            else:
+                profile = self.reader.read_feature_profile_as_dict_from_file(file)
             amended_profile = copy(profile)
 
             relevant_feature_id_and_value_pairs = (
@@ -85,9 +100,10 @@ class NotApplicableSetter:
                     print(f"Type mismatch cannot be fixed automatically. {e}")
 
             if changes_made or self.write_even_if_no_changes:
-                self.writer.write(
-                    feature_dict=amended_profile, output_path=self.output_dir / file.name
-                )
+                output_path = self.output_dir / file.name
+                self.writer.write(feature_dict=amended_profile, output_path=output_path)
+                if self.corpus is not None and self.corpus.contains_file(output_path):
+                    self.corpus.update_profile(file.stem, amended_profile)
 
 
 if __name__ == "__main__":
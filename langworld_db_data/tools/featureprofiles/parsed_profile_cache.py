@@ -0,0 +1,165 @@
+import csv
+import hashlib
+import io
+import os
+import pickle
+from pathlib import Path
+from typing import Optional
+
+from tinybear.csv_xls import check_csv_for_malformed_rows
+
+from langworld_db_data.constants.paths import CACHE_DIR
+
+FORMAT_VERSION = 1
+"""Must be incremented whenever format of cache entries changes."""
+
+
+def read_content_and_stat(file: Path) -> tuple[bytes, os.stat_result]:
+    """Reads content of the file together with its status. The status is taken
+    from the same handle before reading, so if the file is changed while (or after)
+    it is read, the status does not match the new content and the change is noticed.
+    """
+    with file.open("rb") as fh:
+        stat = os.fstat(fh.fileno())
+        return fh.read(), stat
+
+
+def read_rows_of_profile(
+    file: Path, cache: Optional["ParsedProfileCache"] = None
+) -> list[dict[str, str]]:
+    """Reads rows of feature profile (as if they were read with `read_dicts_from_csv`),
+    taking them from `cache` if the file has not changed since it was last parsed.
+
+    Throws IndexError if some rows have abnormal number of columns.
+    Only rows that passed this check get into the cache.
+    """
+    if cache is not None:
+        rows_from_cache = cache.get(file)
+        if rows_from_cache is not None:
+            return rows_from_cache
+
+    # the content is read once, both for parsing and for the cache
+    content, stat = read_content_and_stat(file)
+    header, *plain_rows = csv.reader(io.StringIO(content.decode("utf-8-sig"), newline=""))
+
+    if any(len(row) != len(header) for row in plain_rows):
+        # this only happens if file is malformed: re-read it to get a detailed error
+        check_csv_for_malformed_rows(file)
+        raise IndexError(f"File {file.name}: some rows have abnormal number of columns")
+
+    rows = [dict(zip(header, row)) for row in plain_rows]
+
+    if cache is not None:
+        cache.put(file, rows, content=content, stat=stat)
+
+    return rows
+
+
+class ParsedProfileCache:
+    """On-disk cache of parsed feature profiles.
+
+    Rows of each profile are stored in a pickle file in the cache directory.
+    The entry is keyed by the path to the profile and remembers modification time,
+    size and hash of content of the file it was made from:
+
+    * if modification time and size have not changed, the file is not read at all;
+    * if they have changed (e.g. after `git checkout`), but the content has not,
+      the file is read, but not parsed;
+    * otherwise the entry is stale, and the profile has to be parsed again.
+
+    The cache only stores data, it does not parse CSV by itself:
+    the calling code must call `.put()` after parsing a profile
+    for which `.get()` has returned `None`, preferably passing the content
+    it has parsed (see `read_rows_of_profile()`).
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR / "feature_profiles"):
+        self.cache_dir = cache_dir
+
+    def get(self, file: Path) -> Optional[list[dict[str, str]]]:
+        """Returns rows of the profile (as if they were read with `read_dicts_from_csv`)
+        or `None` if there is no valid entry for given file.
+        """
+        path_to_entry = self._get_path_to_entry(file)
+
+        try:
+            version, mtime_ns, size, content_hash, header, rows = pickle.loads(
+                path_to_entry.read_bytes()
+            )
+        except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+            # no entry or corrupted entry: both mean that the profile has to be parsed
+            return None
+
+        if version != FORMAT_VERSION:
+            return None
+
+        stat = file.stat()
+        if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+            content, stat = read_content_and_stat(file)
+            if self._hash(content) != content_hash:
+                return None
+            # content is the same, only remember the new modification time
+            # (taken before the content was read, so a later change will be noticed)
+            self._write_entry(path_to_entry, stat, content_hash, header, rows)
+
+        return [dict(zip(header, row)) for row in rows]
+
+    def put(
+        self,
+        file: Path,
+        rows: list[dict[str, str]],
+        content: Optional[bytes] = None,
+        stat: Optional[os.stat_result] = None,
+    ) -> None:
+        """Stores rows of the profile that were parsed from given file.
+
+        `content` is the content of the file that was parsed and `stat` is status
+        of the file taken before it was read (see `read_content_and_stat()`).
+        They must be given together. If they are given, the file is not read again,
+        and the entry only matches the file as long as the file stays as it was read.
+        """
+        if (content is None) != (stat is None):
+            raise ValueError("Content and status of file must be given together")
+        if content is None or stat is None:
+            content, stat = read_content_and_stat(file)
+
+        header = list(rows[0].keys()) if rows else []
+        self._write_entry(
+            path_to_entry=self._get_path_to_entry(file),
+            stat=stat,
+            content_hash=self._hash(content),
+            header=header,
+            rows=[tuple(row[key] for key in header) for row in rows],
+        )
+
+    def clear(self) -> None:
+        """Removes all entries from the cache."""
+        for path_to_entry in self.cache_dir.glob("*.pickle"):
+            path_to_entry.unlink()
+
+    def _get_path_to_entry(self, file: Path) -> Path:
+        key = hashlib.blake2b(str(file.resolve()).encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / f"{file.stem}_{key}.pickle"
+
+    @staticmethod
+    def _hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=32).hexdigest()
+
+    def _write_entry(
+        self,
+        path_to_entry: Path,
+        stat: os.stat_result,
+        content_hash: str,
+        header: list[str],
+        rows: list[tuple[str, ...]],
+    ) -> None:
+        if not self.cache_dir.exists():
+            self.cache_dir.mkdir(parents=True)
+
+        entry = (FORMAT_VERSION, stat.st_mtime_ns, stat.st_size, content_hash, header, rows)
+
+        # write to a temporary file first, so that an interrupted run
+        # never leaves a truncated entry behind
+        path_to_temp_file = path_to_entry.with_suffix(".tmp")
+        path_to_temp_file.write_bytes(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        path_to_temp_file.replace(path_to_entry)
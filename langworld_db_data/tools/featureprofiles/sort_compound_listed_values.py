@@ -1,9 +1,10 @@
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 from langworld_db_data.constants.literals import ATOMIC_VALUE_SEPARATOR
 from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR
 from langworld_db_data.tools.common.ids import extract_value_index
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
 from langworld_db_data.tools.featureprofiles.feature_profile_reader import FeatureProfileReader
 from langworld_db_data.tools.featureprofiles.feature_profile_writer_from_dictionary import (
     FeatureProfileWriterFromDictionary,
@@ -11,22 +12,34 @@ from langworld_db_data.tools.featureprofiles.feature_profile_writer_from_diction
 
 
 def sort_compound_listed_values_in_feature_profiles(
-    dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR, output_dir: Path = None
+    dir_with_feature_profiles: Path = FEATURE_PROFILES_DIR,
+    output_dir: Path = None,
+    corpus: Optional[FeatureProfileCorpus] = None,
 ) -> None:
+    """If `corpus` is given, feature profiles are taken from it
+    (and `dir_with_feature_profiles` is only used as default output dir).
+    """
     output_dir = output_dir or dir_with_feature_profiles
     if not output_dir.exists():
         output_dir.mkdir()
 
-    for path_to_feature_profile in dir_with_feature_profiles.glob("*.csv"):
+    paths_to_feature_profiles = (
+        corpus.files if corpus is not None else dir_with_feature_profiles.glob("*.csv")
+    )
+
+    for path_to_feature_profile in paths_to_feature_profiles:
         _sort_compound_listed_values_in_one_profile(
             path_to_input_feature_profile=path_to_feature_profile,
             path_to_output_feature_profile=output_dir / path_to_feature_profile.name,
+            corpus=corpus,
         )
     return None
 
 
 def _sort_compound_listed_values_in_one_profile(
-    path_to_input_feature_profile: Path, path_to_output_feature_profile: Union[Path, None] = None
+    path_to_input_feature_profile: Path,
+    path_to_output_feature_profile: Union[Path, None] = None,
+    corpus: Optional[FeatureProfileCorpus] = None,
 ) -> None:
     """
     Reads feature profile from CSV file, sorts atomic values within compound values
@@ -34,11 +47,17 @@ def _sort_compound_listed_values_in_one_profile(
     (to a new CSV file if specified or updates the original file).
 
     Sorting elementary values provides a consistent order of values in feature profiles.
+
+    If the profile is part of `corpus`, it is taken from the corpus instead of the file,
+    and the corpus is updated if the sorted profile is written back into the same file.
     """
-    reader = FeatureProfileReader()
-    feature_dict = reader.read_feature_profile_as_dict_from_file(
-        file=path_to_input_feature_profile
-    )
+    if corpus is not None and corpus.contains_file(path_to_input_feature_profile):
+        feature_dict = corpus.profile(path_to_input_feature_profile.stem)
+    else:
+        reader = FeatureProfileReader()
+        feature_dict = reader.read_feature_profile_as_dict_from_file(
+            file=path_to_input_feature_profile
+        )
     sorted_feature_dict = feature_dict.copy()
 
     changes_made = False
@@ -69,10 +88,10 @@ def _sort_compound_listed_values_in_one_profile(
             f"Writing feature profile with sorted atomic values to "
             f"{path_to_output_feature_profile.name or path_to_input_feature_profile.name}"
         )
+        output_path = path_to_output_feature_profile or path_to_input_feature_profile
         writer = FeatureProfileWriterFromDictionary()
-        writer.write(
-            feature_dict=sorted_feature_dict,
-            output_path=path_to_output_feature_profile or path_to_input_feature_profile,
-        )
+        writer.write(feature_dict=sorted_feature_dict, output_path=output_path)
+        if corpus is not None and corpus.contains_file(output_path):
+            corpus.update_profile(output_path.stem, sorted_feature_dict)
 
     return None
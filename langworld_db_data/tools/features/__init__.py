@@ -1,9 +1,10 @@
-from .feature_adder import FeatureAdder, FeatureAdderError
+from .feature_adder import FeatureAdder, FeatureAdderError, FeatureToAdd
 from .feature_remover import FeatureRemover, FeatureRemoverError
 
 __all__ = [
     "FeatureAdder",
     "FeatureAdderError",
+    "FeatureToAdd",
     "FeatureRemover",
     "FeatureRemoverError",
 ]
@@ -1,10 +1,8 @@
-from typing import Union
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Optional, Union
 
-from tinybear.csv_xls import (
-    read_column_from_csv,
-    read_dicts_from_csv,
-    write_csv,
-)
 from tinybear.txt import remove_extra_space
 
 from langworld_db_data import ObjectWithPaths
@@ -21,20 +19,90 @@ from langworld_db_data.constants.literals import (
     KEY_FOR_VALUE_ID,
     KEY_FOR_VALUE_TYPE,
 )
+from langworld_db_data.tools.common.bulk_spec import read_items_of_spec
+from langworld_db_data.tools.common.edit_session import (
+    read_column_from_csv,
+    read_dicts_from_csv,
+    write_csv,
+)
 from langworld_db_data.tools.common.ids.extract import (
     extract_category_id,
     extract_feature_index,
-    extract_value_index,
+)
+from langworld_db_data.tools.common.ids.remap import (
+    IDMapping,
+    get_mapping_after_insertion,
+    get_mapping_after_insertions,
+    remap_ids_in_feature_profile,
+    remap_ids_in_inventory_of_features,
+    remap_ids_in_inventory_of_listed_values,
 )
 
 KEY_FOR_FEATURE_INDEX = "index"
 KEY_FOR_LINE_NUMBER = "line number"
+KEY_FOR_CATEGORY_ID = "category_id"
+KEY_FOR_INDEX_TO_ASSIGN = "index_to_assign"
+KEY_FOR_LISTED_VALUES = "listed_values"
+SEPARATOR_OF_LISTED_VALUES_IN_CSV = "|"
 
 
 class FeatureAdderError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class FeatureToAdd:
+    """New feature for bulk addition (see `FeatureAdder.add_features`)."""
+
+    category_id: str
+    en: str
+    ru: str
+    listed_values: tuple[dict[str, str], ...]
+    index_to_assign: Optional[int] = None
+
+    @classmethod
+    def from_item_of_spec(cls, item: dict[str, Any]) -> "FeatureToAdd":
+        """Makes feature from an item of CSV or YAML spec.
+
+        In YAML, `listed_values` is a list of mappings with keys `en` and `ru`.
+        In CSV, names of listed values are given in columns `listed_values_en`
+        and `listed_values_ru` and separated by a vertical bar. Index can be empty.
+        """
+        listed_values = item.get(KEY_FOR_LISTED_VALUES)
+
+        if listed_values is None:
+            names_en, names_ru = (
+                [
+                    name.strip()
+                    for name in str(item.get(column_name) or "").split(
+                        SEPARATOR_OF_LISTED_VALUES_IN_CSV
+                    )
+                    if name.strip()
+                ]
+                for column_name in (
+                    f"{KEY_FOR_LISTED_VALUES}_{KEY_FOR_ENGLISH}",
+                    f"{KEY_FOR_LISTED_VALUES}_{KEY_FOR_RUSSIAN}",
+                )
+            )
+            if len(names_en) != len(names_ru):
+                raise FeatureAdderError(
+                    f"Numbers of English and Russian names of listed values differ in {item}"
+                )
+            listed_values = [
+                {KEY_FOR_ENGLISH: en, KEY_FOR_RUSSIAN: ru} for en, ru in zip(names_en, names_ru)
+            ]
+
+        index_to_assign = item.get(KEY_FOR_INDEX_TO_ASSIGN)
+
+        return cls(
+            category_id=str(item.get(KEY_FOR_CATEGORY_ID) or "").strip(),
+            en=str(item.get(KEY_FOR_ENGLISH) or "").strip(),
+            ru=str(item.get(KEY_FOR_RUSSIAN) or "").strip(),
+            listed_values=tuple(dict(value) for value in listed_values),
+            index_to_assign=int(index_to_assign) if index_to_assign not in (None, "") else None,
+        )
+
+
 class FeatureAdder(ObjectWithPaths):
 
     def add_feature(
@@ -95,6 +163,130 @@ class FeatureAdder(ObjectWithPaths):
             feature_ru=feat_ru,
         )
 
+    def add_features_from_file(self, path_to_file: Path) -> list[str]:
+        """Adds features from a CSV or YAML spec (see `FeatureToAdd`
+        for keys of items) with `add_features`. Returns IDs of new features.
+        """
+        return self.add_features(
+            [FeatureToAdd.from_item_of_spec(item) for item in read_items_of_spec(path_to_file)]
+        )
+
+    def add_features(self, features_to_add: Sequence[FeatureToAdd]) -> list[str]:
+        """Adds many features (possibly to several categories) at once.
+
+        The result is the same as that of calling `add_feature` for each feature
+        in the given order (so `index_to_assign` of a feature is its index at the moment
+        when it is added), but renumbering of existing features is computed once,
+        and each inventory and feature profile is read and written only once.
+        Returns IDs of new features in the given order.
+        """
+        # names are normalized in the same way as in `add_feature`
+        _ = remove_extra_space
+        features_to_add = [
+            replace(
+                feature, category_id=_(feature.category_id), en=_(feature.en), ru=_(feature.ru)
+            )
+            for feature in features_to_add
+        ]
+
+        rows_of_features = read_dicts_from_csv(self.input_file_with_features)
+
+        mapping, ids_of_new_features = self._get_mapping_and_ids_for_insertion_of_features(
+            rows_of_features=rows_of_features,
+            features_to_add=features_to_add,
+            ids_of_categories=read_column_from_csv(
+                path_to_file=self.file_with_categories, column_name=KEY_FOR_ID
+            ),
+        )
+
+        new_rows_for_feature_id: dict[str, list[dict[str, str]]] = {}
+        new_rows_of_listed_values_for_feature_id: dict[str, list[dict[str, str]]] = {}
+        new_rows_of_profile_for_feature_id: dict[str, list[dict[str, str]]] = {}
+
+        for feature, feature_id in zip(features_to_add, ids_of_new_features):
+            new_rows_for_feature_id[feature_id] = [
+                {
+                    KEY_FOR_ID: feature_id,
+                    KEY_FOR_ENGLISH: feature.en[0].upper() + feature.en[1:],
+                    KEY_FOR_RUSSIAN: feature.ru[0].upper() + feature.ru[1:],
+                    "description_formatted_en": "",
+                    "description_formatted_ru": "",
+                    "is_multiselect": "",
+                    "not_applicable_if": "",
+                    "schema_sections": "",
+                }
+            ]
+            new_rows_of_listed_values_for_feature_id[feature_id] = [
+                {
+                    KEY_FOR_ID: f"{feature_id}{ID_SEPARATOR}{i}",
+                    KEY_FOR_FEATURE_ID: feature_id,
+                    KEY_FOR_ENGLISH: value[KEY_FOR_ENGLISH],
+                    KEY_FOR_RUSSIAN: value[KEY_FOR_RUSSIAN],
+                    "description_formatted_en": "",
+                    "description_formatted_ru": "",
+                }
+                for i, value in enumerate(feature.listed_values, start=1)
+            ]
+            new_rows_of_profile_for_feature_id[feature_id] = [
+                {
+                    KEY_FOR_FEATURE_ID: feature_id,
+                    KEY_FOR_RUSSIAN_NAME_OF_FEATURE: feature.ru,
+                    KEY_FOR_VALUE_TYPE: "not_stated",
+                    KEY_FOR_VALUE_ID: "",
+                    KEY_FOR_RUSSIAN_NAME_OF_VALUE: "",
+                    KEY_FOR_RUSSIAN_COMMENT: "",
+                    KEY_FOR_ENGLISH_COMMENT: "",
+                }
+            ]
+            print(f"Feature {feature_id} ({feature.en} / {feature.ru}) will be added")
+
+        write_csv(
+            self._insert_rows_of_new_features(
+                rows=remap_ids_in_inventory_of_features(rows_of_features, mapping),
+                feature_id_column=KEY_FOR_ID,
+                new_rows_for_feature_id=new_rows_for_feature_id,
+            ),
+            path_to_file=self.output_file_with_features,
+            overwrite=True,
+            delimiter=",",
+        )
+        print("Updated list of features")
+
+        write_csv(
+            self._insert_rows_of_new_features(
+                rows=remap_ids_in_inventory_of_listed_values(
+                    read_dicts_from_csv(self.input_file_with_listed_values), mapping
+                ),
+                feature_id_column=KEY_FOR_FEATURE_ID,
+                new_rows_for_feature_id=new_rows_of_listed_values_for_feature_id,
+            ),
+            path_to_file=self.output_file_with_listed_values,
+            overwrite=True,
+            delimiter=",",
+        )
+        print("Updated file with listed values")
+
+        for file in self.input_feature_profiles:
+            rows = self._insert_rows_of_new_features(
+                rows=remap_ids_in_feature_profile(read_dicts_from_csv(file), mapping),
+                feature_id_column=KEY_FOR_FEATURE_ID,
+                new_rows_for_feature_id=new_rows_of_profile_for_feature_id,
+            )
+            write_csv(
+                rows=rows,
+                path_to_file=self.output_dir_with_feature_profiles / file.name,
+                overwrite=True,
+                delimiter=",",
+            )
+            self._update_feature_profile_index(file, rows)
+
+        print(
+            f"Added features {', '.join(ids_of_new_features)} to feature profiles"
+            " with value type 'not_stated'"
+        )
+
+        return ids_of_new_features
+
     def _add_feature_to_inventory_of_features(
         self,
         category_id: str,
@@ -167,27 +359,26 @@ class FeatureAdder(ObjectWithPaths):
             line_number_of_new_feature = (
                 feature_indices_to_inventory_line_numbers[-1][KEY_FOR_LINE_NUMBER] + 1
             )
-            rows_with_updated_feature_indices = tuple(rows.copy())
 
         else:  # new feature being inserted in the middle
             id_of_new_feature = f"{category_id}{ID_SEPARATOR}{index_to_assign}"
 
-            # Go through features of the category, ignore indices less than index_to_assign,
-            # increment all other indices
-            rows_with_updated_feature_indices = (
-                self._increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
-                    rows=rows,
-                    feature_indices_to_inventory_line_numbers=tuple(
-                        feature_indices_to_inventory_line_numbers
-                    ),
-                    index_to_assign=index_to_assign,
-                )
-            )
-
             for feature_index_and_line_number in feature_indices_to_inventory_line_numbers:
                 if feature_index_and_line_number[KEY_FOR_FEATURE_INDEX] == index_to_assign:
                     line_number_of_new_feature = feature_index_and_line_number[KEY_FOR_LINE_NUMBER]
 
+        # Features following the new one (if any) get incremented IDs, and so do
+        # references to their values in other features
+        rows_with_updated_feature_indices = tuple(
+            remap_ids_in_inventory_of_features(
+                rows,
+                self._get_mapping_for_insertion_of_feature(
+                    feature_ids=(row[KEY_FOR_ID] for row in rows),
+                    id_of_new_feature=id_of_new_feature,
+                ),
+            )
+        )
+
         row_with_new_feature = tuple(
             [
                 {
@@ -235,8 +426,6 @@ class FeatureAdder(ObjectWithPaths):
         Add values of the new feature to the inventory of listed values.
         """
 
-        id_of_category_where_feature_is_inserted = extract_category_id(feature_id)
-
         rows_to_add_to_file_with_listed_values = []
 
         for i, new_listed_value in enumerate(listed_values_to_add, start=1):
@@ -255,45 +444,21 @@ class FeatureAdder(ObjectWithPaths):
 
         rows_before_insertion = read_dicts_from_csv(self.input_file_with_listed_values)
 
-        line_number_where_insertion_starts = 0
-
-        line_number_to_insert_before_is_found = False
-
-        for i, row in enumerate(rows_before_insertion):
-            if (
-                extract_category_id(row[KEY_FOR_FEATURE_ID])
-                != id_of_category_where_feature_is_inserted
-            ):
-                continue  # ignore all other categories
-
-            if row[KEY_FOR_ID] == rows_to_add_to_file_with_listed_values[0][KEY_FOR_ID]:
-                line_number_where_insertion_starts = i
-                line_number_to_insert_before_is_found = True
-
-            feature_index_of_current_row = extract_feature_index(row[KEY_FOR_FEATURE_ID])
-            value_index_of_current_row = extract_value_index(row[KEY_FOR_ID])
-
-            if feature_index_of_current_row >= extract_feature_index(feature_id):
-                # if feature index of the current value row is equal or more than the index of feature we are adding
-                # then increment feature index of the current row in both feature ID and value ID
-                row[KEY_FOR_FEATURE_ID] = (
-                    f"{id_of_category_where_feature_is_inserted}{ID_SEPARATOR}{feature_index_of_current_row + 1}"
-                )
-                row[KEY_FOR_ID] = (
-                    f"{row[KEY_FOR_FEATURE_ID]}{ID_SEPARATOR}{value_index_of_current_row}"
-                )
-
-            if not line_number_to_insert_before_is_found:
-                line_number_where_insertion_starts = i + 1
-                # This is necessary in case when new values are added to the end of the category.
-                # If we leave line_number_where_insertion_starts to be equal to i,
-                # then adding values will start at penultimate position of the feature
-                # resulting in e.g. order C-3-1, C-3-2, C-3-3, C-2-5
+        line_number_where_insertion_starts = self._get_line_number_for_insertion(
+            rows=rows_before_insertion, feature_id_column=KEY_FOR_FEATURE_ID, feature_id=feature_id
+        )
+        rows_with_updated_ids = remap_ids_in_inventory_of_listed_values(
+            rows_before_insertion,
+            self._get_mapping_for_insertion_of_feature(
+                feature_ids=(row[KEY_FOR_FEATURE_ID] for row in rows_before_insertion),
+                id_of_new_feature=feature_id,
+            ),
+        )
 
         rows_after_insertion = (
-            rows_before_insertion[:line_number_where_insertion_starts]
+            list(rows_with_updated_ids[:line_number_where_insertion_starts])
             + rows_to_add_to_file_with_listed_values
-            + rows_before_insertion[line_number_where_insertion_starts:]
+            + list(rows_with_updated_ids[line_number_where_insertion_starts:])
         )
 
         write_csv(
@@ -314,8 +479,6 @@ class FeatureAdder(ObjectWithPaths):
         Add feature to feature profiles. not_stated will be the value of the vew feature in each profile.
         """
 
-        id_of_category_where_feature_is_inserted = extract_category_id(feature_id)
-
         row_to_add = {
             KEY_FOR_FEATURE_ID: feature_id,
             KEY_FOR_RUSSIAN_NAME_OF_FEATURE: feature_ru,
@@ -330,49 +493,23 @@ class FeatureAdder(ObjectWithPaths):
 
             rows_before_insertion = read_dicts_from_csv(file)
 
-            line_number_where_row_will_be_inserted = 0
-
-            line_number_to_insert_before_is_found = False
-
-            for i, row in enumerate(rows_before_insertion):
-                if (
-                    extract_category_id(row[KEY_FOR_FEATURE_ID])
-                    != id_of_category_where_feature_is_inserted
-                ):
-                    continue
-
-                if row[KEY_FOR_FEATURE_ID] == row_to_add[KEY_FOR_FEATURE_ID]:
-                    line_number_where_row_will_be_inserted = i
-                    line_number_to_insert_before_is_found = True
-
-                feature_index_of_current_row = extract_feature_index(row[KEY_FOR_FEATURE_ID])
-
-                if feature_index_of_current_row >= extract_feature_index(feature_id):
-                    # Same as in the previous method
-                    row[KEY_FOR_FEATURE_ID] = (
-                        f"{id_of_category_where_feature_is_inserted}{ID_SEPARATOR}{feature_index_of_current_row + 1}"
-                    )
-
-                    if row[KEY_FOR_VALUE_TYPE] == "listed":
-                        if "&" not in row[KEY_FOR_VALUE_ID]:
-                            row[KEY_FOR_VALUE_ID] = (
-                                f"{row[KEY_FOR_FEATURE_ID]}{ID_SEPARATOR}{extract_value_index(row[KEY_FOR_VALUE_ID])}"
-                            )
-                        else:
-                            atomic_value_ids = row[KEY_FOR_VALUE_ID].split("&")
-                            new_atomic_value_ids = []
-                            for atomic_value_id in atomic_value_ids:
-                                atomic_value_id = f"{row[KEY_FOR_FEATURE_ID]}{ID_SEPARATOR}{extract_value_index(atomic_value_id)}"
-                                new_atomic_value_ids.append(atomic_value_id)
-                            row[KEY_FOR_VALUE_ID] = "&".join(new_atomic_value_ids)
-
-                if not line_number_to_insert_before_is_found:
-                    line_number_where_row_will_be_inserted = i + 1
+            line_number_where_row_will_be_inserted = self._get_line_number_for_insertion(
+                rows=rows_before_insertion,
+                feature_id_column=KEY_FOR_FEATURE_ID,
+                feature_id=feature_id,
+            )
+            rows_with_updated_ids = remap_ids_in_feature_profile(
+                rows_before_insertion,
+                self._get_mapping_for_insertion_of_feature(
+                    feature_ids=(row[KEY_FOR_FEATURE_ID] for row in rows_before_insertion),
+                    id_of_new_feature=feature_id,
+                ),
+            )
 
             rows_after_insertion = (
-                rows_before_insertion[:line_number_where_row_will_be_inserted]
+                list(rows_with_updated_ids[:line_number_where_row_will_be_inserted])
                 + [row_to_add]
-                + rows_before_insertion[line_number_where_row_will_be_inserted:]
+                + list(rows_with_updated_ids[line_number_where_row_will_be_inserted:])
             )
 
             write_csv(
@@ -381,35 +518,149 @@ class FeatureAdder(ObjectWithPaths):
                 overwrite=True,
                 delimiter=",",
             )
+            self._update_feature_profile_index(file, rows_after_insertion)
 
         print(f"\nAdding feature {feature_id} to feature profiles with value type" " 'not_stated'")
 
     @staticmethod
-    def _increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
-        rows: list[dict[str, str]],
-        feature_indices_to_inventory_line_numbers: tuple[dict[str, int], ...],
-        index_to_assign: int,
-    ) -> tuple[dict[str, str], ...]:
+    def _get_mapping_for_insertion_of_feature(
+        feature_ids: Iterable[str], id_of_new_feature: str
+    ) -> IDMapping:
+        """
+        Returns mapping that increments IDs of features of the same category
+        whose indices are equal to or greater than index of the new feature
+        (and, consequently, IDs of their values).
         """
-        Increases by 1 index of every feature that will come after the feature passed for insertion.
+        return IDMapping(
+            new_feature_id_for_old=get_mapping_after_insertion(
+                ids=set(feature_ids), inserted_id=id_of_new_feature
+            )
+        )
 
-        Returns tuple of dictionaries with incremented indices and line numbers.
+    @staticmethod
+    def _get_line_number_for_insertion(
+        rows: Sequence[dict[str, str]],
+        feature_id_column: str,
+        feature_id: str,
+    ) -> int:
+        """
+        Returns line number before which rows of the new feature must be inserted:
+        the first row of a feature of the same category with equal or greater index
+        or, if there is no such row, the row after the last row of the category.
         """
+        category_id = extract_category_id(feature_id)
+        feature_index = extract_feature_index(feature_id)
+        line_number = 0
 
-        rows_with_incremented_indices = rows[:]
-        for feature_index_and_line_number in feature_indices_to_inventory_line_numbers:
-            if feature_index_and_line_number[KEY_FOR_FEATURE_INDEX] < index_to_assign:
+        for i, row in enumerate(rows):
+            if extract_category_id(row[feature_id_column]) != category_id:
                 continue
-            row_where_id_must_be_incremented = feature_index_and_line_number[KEY_FOR_LINE_NUMBER]
-            feature_id_to_increment = rows_with_incremented_indices[
-                row_where_id_must_be_incremented
-            ][KEY_FOR_ID]
-            rows_with_incremented_indices[row_where_id_must_be_incremented][KEY_FOR_ID] = (
-                f"{extract_category_id(feature_id_to_increment)}{ID_SEPARATOR}"
-                f"{extract_feature_index(feature_id_to_increment) + 1}"
+            if extract_feature_index(row[feature_id_column]) >= feature_index:
+                return i
+            line_number = i + 1
+
+        return line_number
+
+    @staticmethod
+    def _get_mapping_and_ids_for_insertion_of_features(
+        rows_of_features: Sequence[dict[str, str]],
+        features_to_add: Sequence[FeatureToAdd],
+        ids_of_categories: Iterable[str],
+    ) -> tuple[IDMapping, list[str]]:
+        """Checks new features and computes their IDs and the combined mapping
+        of IDs of existing features that have to be incremented.
+        """
+        ids_of_categories = set(ids_of_categories)
+        ids_of_categories_with_features = {
+            extract_category_id(row[KEY_FOR_ID]) for row in rows_of_features
+        }
+        names = {row[KEY_FOR_ENGLISH] for row in rows_of_features} | {
+            row[KEY_FOR_RUSSIAN] for row in rows_of_features
+        }
+
+        for i, feature in enumerate(features_to_add):
+            error_msg_start = f"Failed to add feature {i + 1} ({feature.ru or feature.en})."
+
+            if not (feature.category_id and feature.en and feature.ru and feature.listed_values):
+                raise FeatureAdderError(
+                    f"{error_msg_start} None of the following can be empty: "
+                    "category_id, en, ru, listed_values."
+                )
+            for value in feature.listed_values:
+                if not (value.get(KEY_FOR_ENGLISH) and value.get(KEY_FOR_RUSSIAN)):
+                    raise FeatureAdderError(
+                        f"{error_msg_start} Listed value must have keys 'en' and 'ru'. "
+                        f"Your value: {value}"
+                    )
+            if feature.category_id not in ids_of_categories:
+                raise FeatureAdderError(
+                    f"{error_msg_start} Category ID <{feature.category_id}> not found"
+                )
+            if feature.category_id not in ids_of_categories_with_features:
+                raise FeatureAdderError(
+                    f"{error_msg_start} Category {feature.category_id} has no features yet"
+                )
+            if feature.en in names or feature.ru in names:
+                raise FeatureAdderError(
+                    f"{error_msg_start} English or Russian feature name is already present"
+                    " in list of features"
+                )
+            names.update((feature.en, feature.ru))
+
+        try:
+            new_feature_id_for_old, ids_of_new_features = get_mapping_after_insertions(
+                ids=(row[KEY_FOR_ID] for row in rows_of_features),
+                insertions=[
+                    (feature.category_id, feature.index_to_assign) for feature in features_to_add
+                ],
+            )
+        except ValueError as e:
+            raise FeatureAdderError(f"Failed to add features. {e}")
+
+        return IDMapping(new_feature_id_for_old=new_feature_id_for_old), ids_of_new_features
+
+    @staticmethod
+    def _insert_rows_of_new_features(
+        rows: Sequence[dict[str, str]],
+        feature_id_column: str,
+        new_rows_for_feature_id: dict[str, list[dict[str, str]]],
+    ) -> list[dict[str, str]]:
+        """Inserts rows of new features into rows whose IDs have already been remapped
+        (so that they do not clash with IDs of new features) in one pass.
+
+        Rows of each new feature are put where `_get_line_number_for_insertion`
+        would put them. New features of categories that are absent in rows are put at the end.
+        """
+        new_feature_ids_for_category_id: dict[str, list[str]] = {}
+        for feature_id in sorted(new_rows_for_feature_id, key=extract_feature_index):
+            new_feature_ids_for_category_id.setdefault(extract_category_id(feature_id), []).append(
+                feature_id
             )
 
-        return tuple(rows_with_incremented_indices)
+        new_rows: list[dict[str, str]] = []
+
+        def insert_new_features_of_category(category_id: str, up_to_index: float) -> None:
+            new_feature_ids = new_feature_ids_for_category_id.get(category_id, [])
+            while new_feature_ids and extract_feature_index(new_feature_ids[0]) < up_to_index:
+                new_rows.extend(new_rows_for_feature_id[new_feature_ids.pop(0)])
+
+        previous_category_id = None
+
+        for row in rows:
+            category_id = extract_category_id(row[feature_id_column])
+            if previous_category_id is not None and category_id != previous_category_id:
+                insert_new_features_of_category(previous_category_id, up_to_index=float("inf"))
+            if category_id in new_feature_ids_for_category_id:
+                insert_new_features_of_category(
+                    category_id, up_to_index=extract_feature_index(row[feature_id_column])
+                )
+            new_rows.append(row)
+            previous_category_id = category_id
+
+        for category_id in new_feature_ids_for_category_id:
+            insert_new_features_of_category(category_id, up_to_index=float("inf"))
+
+        return new_rows
 
 
 if __name__ == "__main__":
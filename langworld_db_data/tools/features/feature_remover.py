@@ -1,15 +1,22 @@
-from tinybear.csv_xls import (
+from collections.abc import Iterable
+
+from tinybear.csv_xls import remove_rows_with_given_content_in_lookup_column
+
+from langworld_db_data import ObjectWithPaths
+from langworld_db_data.constants.literals import KEY_FOR_FEATURE_ID, KEY_FOR_ID
+from langworld_db_data.tools.common.edit_session import (
     read_column_from_csv,
     read_dicts_from_csv,
-    remove_rows_with_given_content_in_lookup_column,
     write_csv,
 )
-
-from langworld_db_data import ObjectWithPaths
-from langworld_db_data.constants.literals import KEY_FOR_ID
-from langworld_db_data.tools.common.ids.extract import extract_category_id
-from langworld_db_data.tools.common.ids.update import (
-    decrement_indices_after_deletion,
+from langworld_db_data.tools.common.ids.extract import extract_feature_id
+from langworld_db_data.tools.common.ids.remap import (
+    IDMapping,
+    get_mapping_after_deletion,
+    remap_ids_in_feature_profile,
+    remap_ids_in_inventory_of_features,
+    remap_ids_in_inventory_of_listed_values,
+    remove_references_to_values_in_inventory_of_features,
 )
 
 
@@ -55,13 +62,22 @@ class FeatureRemover(ObjectWithPaths):
             )
         )
 
-        rows_with_removed_row_and_updated_indices = decrement_indices_after_deletion(
-            lookup_column="id",
-            match_value=extract_category_id(feature_id),
-            type_of_id="feature",
-            type_of_index="feature",
-            line_number_after_which_rows_must_be_updated=line_number_of_removed_row,
-            rows=rows_with_removed_row,
+        # References to values of the removed feature in column `not_applicable_if`
+        # are removed first: otherwise they would point to values of the feature
+        # that takes the ID of the removed one.
+        rows_with_removed_row = remove_references_to_values_in_inventory_of_features(
+            rows_with_removed_row,
+            is_removed_value_id=lambda value_id: extract_feature_id(value_id) == feature_id,
+        )
+
+        # Features following the removed one get decremented IDs, and so do references
+        # to their values in column `not_applicable_if` (in any line of the inventory).
+        rows_with_removed_row_and_updated_indices = remap_ids_in_inventory_of_features(
+            rows_with_removed_row,
+            self._get_mapping_after_deletion_of_feature(
+                feature_ids=(row[KEY_FOR_ID] for row in rows_with_removed_row),
+                feature_id=feature_id,
+            ),
         )
 
         write_csv(
@@ -80,33 +96,18 @@ class FeatureRemover(ObjectWithPaths):
             path_to_file=self.input_file_with_listed_values,
         )
 
-        rows_with_removed_rows, range_of_line_numbers_of_removed_rows = (
-            remove_rows_with_given_content_in_lookup_column(
-                lookup_column="feature_id", match_value=feature_id, rows=rows
-            )
-        )
-
-        line_number_of_first_removed_value = range_of_line_numbers_of_removed_rows[0]
-
-        category_id_where_feature_is_removed = extract_category_id(feature_id)
-
-        rows_with_removed_rows_and_updated_value_indices = decrement_indices_after_deletion(
-            lookup_column="id",
-            match_value=category_id_where_feature_is_removed,
-            type_of_id="value",
-            type_of_index="feature",
-            line_number_after_which_rows_must_be_updated=line_number_of_first_removed_value,
-            rows=rows_with_removed_rows,
+        rows_with_removed_rows, _ = remove_rows_with_given_content_in_lookup_column(
+            lookup_column="feature_id", match_value=feature_id, rows=rows
         )
 
+        # value IDs and feature IDs of values are updated in one pass
         rows_with_removed_rows_and_updated_feature_and_value_indices = (
-            decrement_indices_after_deletion(
-                lookup_column="feature_id",
-                match_value=category_id_where_feature_is_removed,
-                type_of_id="feature",
-                type_of_index="feature",
-                line_number_after_which_rows_must_be_updated=line_number_of_first_removed_value,
-                rows=rows_with_removed_rows_and_updated_value_indices,
+            remap_ids_in_inventory_of_listed_values(
+                rows_with_removed_rows,
+                self._get_mapping_after_deletion_of_feature(
+                    feature_ids=(row[KEY_FOR_FEATURE_ID] for row in rows_with_removed_rows),
+                    feature_id=feature_id,
+                ),
             )
         )
 
@@ -128,20 +129,16 @@ class FeatureRemover(ObjectWithPaths):
 
             rows = read_dicts_from_csv(feature_profile)
 
-            rows_with_removed_row, (line_number_of_removed_row,) = (
-                remove_rows_with_given_content_in_lookup_column(
-                    lookup_column="feature_id", match_value=feature_id, rows=rows
-                )
+            rows_with_removed_row, _ = remove_rows_with_given_content_in_lookup_column(
+                lookup_column="feature_id", match_value=feature_id, rows=rows
             )
 
-            rows_with_removed_row_and_updated_indices = decrement_indices_after_deletion(
-                lookup_column="feature_id",
-                match_value=extract_category_id(feature_id),
-                type_of_id="feature",
-                type_of_index="feature",
-                line_number_after_which_rows_must_be_updated=line_number_of_removed_row,
-                rows=rows_with_removed_row,
-                rows_are_a_feature_profile=True,
+            rows_with_removed_row_and_updated_indices = remap_ids_in_feature_profile(
+                rows_with_removed_row,
+                self._get_mapping_after_deletion_of_feature(
+                    feature_ids=(row[KEY_FOR_FEATURE_ID] for row in rows_with_removed_row),
+                    feature_id=feature_id,
+                ),
             )
 
             write_csv(
@@ -150,6 +147,22 @@ class FeatureRemover(ObjectWithPaths):
                 overwrite=True,
                 delimiter=",",
             )
+            self._update_feature_profile_index(
+                feature_profile, rows_with_removed_row_and_updated_indices
+            )
+
+    @staticmethod
+    def _get_mapping_after_deletion_of_feature(
+        feature_ids: Iterable[str], feature_id: str
+    ) -> IDMapping:
+        """Returns mapping that decrements IDs of features following the removed one
+        (and, with them, IDs of their values).
+        """
+        return IDMapping(
+            new_feature_id_for_old=get_mapping_after_deletion(
+                ids=feature_ids, deleted_id=feature_id
+            )
+        )
 
 
 if __name__ == "__main__":
@@ -1,4 +1,4 @@
-from .listed_value_adder import ListedValueAdder, ListedValueAdderError
+from .listed_value_adder import ListedValueAdder, ListedValueAdderError, ListedValueToAdd
 from .listed_value_mover import ListedValueMover, ListedValueMoverError
 from .listed_value_remover import ListedValueRemover, ListedValueRemoverError
 from .listed_value_renamer import ListedValueRenamer, ListedValueRenamerError
@@ -6,6 +6,7 @@ from .listed_value_renamer import ListedValueRenamer, ListedValueRenamerError
 __all__ = [
     "ListedValueAdder",
     "ListedValueAdderError",
+    "ListedValueToAdd",
     "ListedValueMover",
     "ListedValueMoverError",
     "ListedValueRemover",
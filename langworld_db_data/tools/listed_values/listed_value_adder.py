@@ -1,10 +1,11 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Union
-
-from tinybear.csv_xls import read_dicts_from_csv, write_csv
+from typing import Any, Optional, Union
 
 from langworld_db_data import ObjectWithPaths
 from langworld_db_data.constants.literals import (
+    ATOMIC_VALUE_SEPARATOR,
     ID_SEPARATOR,
     KEY_FOR_ENGLISH,
     KEY_FOR_FEATURE_ID,
@@ -14,16 +15,66 @@ from langworld_db_data.constants.literals import (
     KEY_FOR_VALUE_ID,
     KEY_FOR_VALUE_TYPE,
 )
-from langworld_db_data.tools.common.ids.extract import extract_feature_id, extract_value_index
+from langworld_db_data.tools.common.bulk_spec import read_items_of_spec
+from langworld_db_data.tools.common.edit_session import read_dicts_from_csv, write_csv
+from langworld_db_data.tools.common.ids.extract import extract_value_index
+from langworld_db_data.tools.common.ids.remap import (
+    IDMapping,
+    get_mapping_after_insertion,
+    get_mapping_after_insertions,
+    remap_ids_in_feature_profile,
+    remap_ids_in_file_with_features,
+    remap_ids_in_inventory_of_listed_values,
+)
 
 KEY_FOR_FEATURE_VALUE_INDEX = "index"
 KEY_FOR_LINE_NUMBER = "line number"
+KEY_FOR_INDEX_TO_ASSIGN = "index_to_assign"
+KEY_FOR_CUSTOM_VALUES_TO_RENAME = "custom_values_to_rename"
+SEPARATOR_OF_CUSTOM_VALUES_IN_CSV = "|"
 
 
 class ListedValueAdderError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class ListedValueToAdd:
+    """New listed value for bulk addition (see `ListedValueAdder.add_listed_values`)."""
+
+    feature_id: str
+    en: str
+    ru: str
+    index_to_assign: Optional[int] = None
+    custom_values_to_rename: tuple[str, ...] = ()
+    description_formatted_en: str = ""
+    description_formatted_ru: str = ""
+
+    @classmethod
+    def from_item_of_spec(cls, item: dict[str, Any]) -> "ListedValueToAdd":
+        """Makes value from an item of CSV or YAML spec. In CSV, index can be empty
+        and custom values to rename are separated by a vertical bar.
+        """
+        index_to_assign = item.get(KEY_FOR_INDEX_TO_ASSIGN)
+        custom_values_to_rename = item.get(KEY_FOR_CUSTOM_VALUES_TO_RENAME) or ()
+        if isinstance(custom_values_to_rename, str):
+            custom_values_to_rename = custom_values_to_rename.split(
+                SEPARATOR_OF_CUSTOM_VALUES_IN_CSV
+            )
+
+        return cls(
+            feature_id=str(item.get(KEY_FOR_FEATURE_ID) or "").strip(),
+            en=str(item.get(KEY_FOR_ENGLISH) or "").strip(),
+            ru=str(item.get(KEY_FOR_RUSSIAN) or "").strip(),
+            index_to_assign=int(index_to_assign) if index_to_assign not in (None, "") else None,
+            custom_values_to_rename=tuple(
+                value.strip() for value in custom_values_to_rename if value.strip()
+            ),
+            description_formatted_en=item.get("description_formatted_en") or "",
+            description_formatted_ru=item.get("description_formatted_ru") or "",
+        )
+
+
 class ListedValueAdder(ObjectWithPaths):
     def add_listed_value(
         self,
@@ -66,7 +117,7 @@ class ListedValueAdder(ObjectWithPaths):
 
         self._increment_value_ids_in_feature_profiles(
             new_value_id=id_of_new_value,
-            input_files=self.input_feature_profiles,
+            input_files=self.feature_profile_index.files_with_feature(feature_id, "listed"),
             output_dir=self.output_dir_with_feature_profiles,
         )
 
@@ -77,6 +128,47 @@ class ListedValueAdder(ObjectWithPaths):
             custom_values_to_rename=custom_values_to_rename,
         )
 
+    def add_listed_values_from_file(self, path_to_file: Path) -> list[str]:
+        """Adds listed values from a CSV or YAML spec (see `ListedValueToAdd`
+        for keys of items) with `add_listed_values`. Returns IDs of new values.
+        """
+        return self.add_listed_values(
+            [ListedValueToAdd.from_item_of_spec(item) for item in read_items_of_spec(path_to_file)]
+        )
+
+    def add_listed_values(self, values_to_add: Sequence[ListedValueToAdd]) -> list[str]:
+        """Adds many listed values (possibly to several features) at once.
+
+        The result is the same as that of calling `add_listed_value` for each value
+        in the given order (so `index_to_assign` of a value is its index at the moment
+        when it is added), but the inventory and each affected feature profile
+        are read and written only once. Returns IDs of new values in the given order.
+        """
+        rows = read_dicts_from_csv(self.input_file_with_listed_values)
+
+        rows_with_new_values, mapping, ids_of_new_values = self._add_many_to_rows_of_inventory(
+            rows=rows, values_to_add=values_to_add
+        )
+
+        write_csv(
+            rows_with_new_values,
+            path_to_file=self.output_file_with_listed_values,
+            overwrite=True,
+            delimiter=",",
+        )
+        remap_ids_in_file_with_features(
+            self.input_file_with_features, self.output_file_with_features, mapping
+        )
+
+        for value, value_id in zip(values_to_add, ids_of_new_values):
+            print(f"Value ID {value_id} - {value.ru} added to inventory of listed values")
+
+        self._update_feature_profiles_after_addition_of_many_values(
+            values_to_add=values_to_add, ids_of_new_values=ids_of_new_values, mapping=mapping
+        )
+
+        return ids_of_new_values
+
     def _add_to_inventory_of_listed_values(
         self,
         feature_id: str,
@@ -145,24 +237,22 @@ class ListedValueAdder(ObjectWithPaths):
             line_number_of_new_value = (
                 value_indices_to_inventory_line_numbers[-1][KEY_FOR_LINE_NUMBER] + 1
             )
-            rows_with_updated_value_indices = tuple(rows.copy())
 
         # If value is inserted into range of values, IDs following it must be incremented
         else:  # new value being inserted in the middle
             id_of_new_value = f"{feature_id}{ID_SEPARATOR}{index_to_assign}"
 
-            # Go through values of the feature, ignore indices less than index_to_assign,
-            # increment all other indices
-            rows_with_updated_value_indices = self._increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
-                rows=rows,
-                value_indices_to_inventory_line_numbers=value_indices_to_inventory_line_numbers,
-                index_to_assign=index_to_assign,
-            )
-
             for value_index_and_line_number in value_indices_to_inventory_line_numbers:
                 if value_index_and_line_number[KEY_FOR_FEATURE_VALUE_INDEX] == index_to_assign:
                     line_number_of_new_value = value_index_and_line_number[KEY_FOR_LINE_NUMBER]
 
+        # Values following the new one (if any) get incremented IDs both in this inventory
+        # and in references to them in the inventory of features.
+        mapping = self._get_mapping_for_insertion_of_value(rows, id_of_new_value)
+        rows_with_updated_value_indices = tuple(
+            remap_ids_in_inventory_of_listed_values(rows, mapping)
+        )
+
         row_with_new_value = tuple(
             [
                 {
@@ -188,6 +278,9 @@ class ListedValueAdder(ObjectWithPaths):
             overwrite=True,
             delimiter=",",
         )
+        remap_ids_in_file_with_features(
+            self.input_file_with_features, self.output_file_with_features, mapping
+        )
 
         return id_of_new_value
 
@@ -226,86 +319,56 @@ class ListedValueAdder(ObjectWithPaths):
         return tuple(value_indices_to_inventory_line_numbers)
 
     @staticmethod
-    def _increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
-        rows: list[dict[str, str]],
-        value_indices_to_inventory_line_numbers: tuple[dict[str, int], ...],
-        index_to_assign: int,
-    ) -> tuple[dict[str, str], ...]:
-        """
-        Increases by 1 index of every value that will come after the value passed for insertion.
-
-        Returns tuple of dictionaries with incremented indices and line numbers.
+    def _get_mapping_for_insertion_of_value(
+        rows: Sequence[dict[str, str]], id_of_new_value: str
+    ) -> IDMapping:
+        """Returns mapping that increments IDs of values of the same feature
+        whose indices are equal to or greater than index of the new value.
         """
-
-        rows_with_incremented_indices = rows[:]
-        for value_index_and_line_number in value_indices_to_inventory_line_numbers:
-            if value_index_and_line_number[KEY_FOR_FEATURE_VALUE_INDEX] < index_to_assign:
-                continue
-            row_where_id_must_be_incremented = value_index_and_line_number[KEY_FOR_LINE_NUMBER]
-            value_id_to_increment = rows_with_incremented_indices[
-                row_where_id_must_be_incremented
-            ][KEY_FOR_ID]
-            rows_with_incremented_indices[row_where_id_must_be_incremented][KEY_FOR_ID] = (
-                f"{extract_feature_id(value_id_to_increment)}-"
-                f"{extract_value_index(value_id_to_increment) + 1}"
+        return IDMapping(
+            new_value_id_for_old=get_mapping_after_insertion(
+                ids=(row[KEY_FOR_ID] for row in rows), inserted_id=id_of_new_value
             )
+        )
 
-        return tuple(rows_with_incremented_indices)
-
-    @staticmethod
     def _increment_value_ids_in_feature_profiles(
+        self,
         new_value_id: str,
         input_files: list[Path],
         output_dir: Path,
     ):
+        """Increments IDs of values of the feature that are equal or greater than
+        ID of the new value. Only files that were changed are written
+        (and updated in the index of feature profiles).
+        """
         for file in input_files:
-            is_changed = False
             rows = read_dicts_from_csv(file)
 
-            target_feature_id = extract_feature_id(new_value_id)
-            new_value_index = extract_value_index(new_value_id)
-            for row in rows:
-                if (
-                    row[KEY_FOR_FEATURE_ID] != target_feature_id
-                    or row[KEY_FOR_VALUE_TYPE] != "listed"
-                ):
-                    continue
-                elif "&" in row[KEY_FOR_VALUE_ID]:
-                    atomic_value_ids = row[KEY_FOR_VALUE_ID].split("&")
-                    new_atomic_value_ids = []
-                    for atomic_value_id in atomic_value_ids:
-                        atomic_value_index = extract_value_index(atomic_value_id)
-                        if atomic_value_index < new_value_index:
-                            new_atomic_value_ids.append(atomic_value_id)
-                            continue
-
-                        incremented_atomic_value_id = (
-                            f"{target_feature_id}{ID_SEPARATOR}{atomic_value_index + 1}"
-                        )
-                        is_changed = True
-                        new_atomic_value_ids.append(incremented_atomic_value_id)
-                    row[KEY_FOR_VALUE_ID] = "&".join(new_atomic_value_ids)
-                    print(f"Writing new file with combined values for {file.stem}")
-
-                else:
-                    current_value_index = extract_value_index(row[KEY_FOR_VALUE_ID])
-                    if current_value_index < new_value_index:
-                        continue
-
-                    incremented_current_value_id = (
-                        f"{target_feature_id}{ID_SEPARATOR}{current_value_index + 1}"
+            atomic_value_ids = [
+                atomic_value_id
+                for row in rows
+                if row[KEY_FOR_VALUE_TYPE] == "listed"
+                for atomic_value_id in row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR)
+            ]
+            updated_rows = remap_ids_in_feature_profile(
+                rows,
+                IDMapping(
+                    new_value_id_for_old=get_mapping_after_insertion(
+                        ids=atomic_value_ids, inserted_id=new_value_id
                     )
-                    row[KEY_FOR_VALUE_ID] = incremented_current_value_id
-                    is_changed = True
-                    print(f"Writing new file for {file.stem}")
+                ),
+            )
+            if updated_rows is rows:
+                continue
 
-            if is_changed:
-                write_csv(
-                    rows,
-                    path_to_file=output_dir / file.name,
-                    overwrite=True,
-                    delimiter=",",
-                )
+            print(f"Writing new file for {file.stem}")
+            write_csv(
+                updated_rows,
+                path_to_file=output_dir / file.name,
+                overwrite=True,
+                delimiter=",",
+            )
+            self._update_feature_profile_index(file, updated_rows)
 
     def _mark_value_as_listed_in_feature_profiles(
         self,
@@ -314,7 +377,8 @@ class ListedValueAdder(ObjectWithPaths):
         new_value_ru: str,
         custom_values_to_rename: Optional[list[str]] = None,
     ) -> None:
-        for file in self.input_feature_profiles:
+        # only profiles where the feature has a custom value can be affected
+        for file in self.feature_profile_index.files_with_feature(feature_id, "custom"):
             is_changed = False
             rows = read_dicts_from_csv(file)
 
@@ -351,6 +415,167 @@ class ListedValueAdder(ObjectWithPaths):
                     overwrite=True,
                     delimiter=",",
                 )
+                self._update_feature_profile_index(file, rows)
+
+    @staticmethod
+    def _add_many_to_rows_of_inventory(
+        rows: list[dict[str, str]],
+        values_to_add: Sequence[ListedValueToAdd],
+    ) -> tuple[list[dict[str, str]], IDMapping, list[str]]:
+        """Inserts new values into rows of inventory of listed values.
+
+        Returns new rows, mapping of existing value IDs that were changed
+        and IDs of new values.
+        """
+        rows_for_feature_id: dict[str, list[dict[str, str]]] = {}
+        for row in rows:
+            rows_for_feature_id.setdefault(row[KEY_FOR_FEATURE_ID], []).append(row)
+
+        names_for_feature_id: dict[str, set[str]] = {}
+
+        for i, value in enumerate(values_to_add):
+            error_msg_start = f"Failed to add value {i + 1} ({value.ru or value.en})."
+
+            if not (value.feature_id and value.en and value.ru):
+                raise ListedValueAdderError(
+                    f"{error_msg_start} None of the following strings can be empty: "
+                    "feature_id, en, ru."
+                )
+            if value.feature_id not in rows_for_feature_id:
+                raise ListedValueAdderError(
+                    f"{error_msg_start} Feature ID {value.feature_id} not found"
+                )
+
+            names = names_for_feature_id.setdefault(
+                value.feature_id,
+                {
+                    name
+                    for row in rows_for_feature_id[value.feature_id]
+                    for name in (row[KEY_FOR_ENGLISH], row[KEY_FOR_RUSSIAN])
+                },
+            )
+            if value.en in names or value.ru in names:
+                raise ListedValueAdderError(
+                    f"{error_msg_start} Feature {value.feature_id} already has this value"
+                )
+            names.update((value.en, value.ru))
+
+        try:
+            new_value_id_for_old, ids_of_new_values = get_mapping_after_insertions(
+                ids=(row[KEY_FOR_ID] for row in rows),
+                insertions=[(value.feature_id, value.index_to_assign) for value in values_to_add],
+            )
+        except ValueError as e:
+            raise ListedValueAdderError(f"Failed to add values. {e}")
+
+        new_rows_for_feature_id: dict[str, list[dict[str, str]]] = {
+            feature_id: [
+                (
+                    {**row, KEY_FOR_ID: new_value_id_for_old[row[KEY_FOR_ID]]}
+                    if row[KEY_FOR_ID] in new_value_id_for_old
+                    else row
+                )
+                for row in rows_for_feature_id[feature_id]
+            ]
+            for feature_id in names_for_feature_id
+        }
+        for value, value_id in zip(values_to_add, ids_of_new_values):
+            new_rows_for_feature_id[value.feature_id].append(
+                {
+                    KEY_FOR_ID: value_id,
+                    KEY_FOR_FEATURE_ID: value.feature_id,
+                    KEY_FOR_ENGLISH: value.en[0].upper() + value.en[1:],
+                    KEY_FOR_RUSSIAN: value.ru[0].upper() + value.ru[1:],
+                    "description_formatted_en": value.description_formatted_en,
+                    "description_formatted_ru": value.description_formatted_ru,
+                }
+            )
+        for new_rows_of_feature in new_rows_for_feature_id.values():
+            new_rows_of_feature.sort(key=lambda row: extract_value_index(row[KEY_FOR_ID]))
+
+        # values of each feature occupy consecutive rows, so rows of a feature with new values
+        # are replaced by its new rows where the first of its old rows was
+        new_rows: list[dict[str, str]] = []
+        for row in rows:
+            feature_id = row[KEY_FOR_FEATURE_ID]
+            if feature_id not in new_rows_for_feature_id:
+                new_rows.append(row)
+            elif rows_for_feature_id[feature_id][0] is row:
+                new_rows.extend(new_rows_for_feature_id[feature_id])
+
+        return new_rows, IDMapping(new_value_id_for_old=new_value_id_for_old), ids_of_new_values
+
+    def _update_feature_profiles_after_addition_of_many_values(
+        self,
+        values_to_add: Sequence[ListedValueToAdd],
+        ids_of_new_values: list[str],
+        mapping: IDMapping,
+    ) -> None:
+        """Updates IDs of listed values and marks matching custom values as listed
+        in one pass over the affected feature profiles.
+        """
+        # for each feature: ID and name of each new value and all variants of its name
+        new_values_for_feature_id: dict[str, list[tuple[str, str, set[str]]]] = {}
+        for value, value_id in zip(values_to_add, ids_of_new_values):
+            new_values_for_feature_id.setdefault(value.feature_id, []).append(
+                (
+                    value_id,
+                    value.ru,
+                    {name.lower() for name in (value.ru, *value.custom_values_to_rename)},
+                )
+            )
+
+        files = sorted(
+            {
+                file
+                for feature_id in new_values_for_feature_id
+                for value_type in ("listed", "custom")
+                for file in self.feature_profile_index.files_with_feature(feature_id, value_type)
+            }
+        )
+
+        for file in files:
+            rows = read_dicts_from_csv(file)
+            updated_rows = list(remap_ids_in_feature_profile(rows, mapping))
+
+            for i, row in enumerate(updated_rows):
+                if (
+                    row[KEY_FOR_VALUE_TYPE] != "custom"
+                    or row[KEY_FOR_FEATURE_ID] not in new_values_for_feature_id
+                ):
+                    continue
+
+                value_ru = row[KEY_FOR_RUSSIAN_NAME_OF_VALUE].strip()
+                value_ru = value_ru[:-1] if value_ru.endswith(".") else value_ru
+
+                for value_id, new_value_ru, names in new_values_for_feature_id[
+                    row[KEY_FOR_FEATURE_ID]
+                ]:
+                    if value_ru.lower() not in names:
+                        continue
+                    print(
+                        f"{file.name}: changing row {i + 2} (feature {row[KEY_FOR_FEATURE_ID]}). "
+                        f"Custom value <{row[KEY_FOR_RUSSIAN_NAME_OF_VALUE]}> will become "
+                        f"listed value <{new_value_ru}> ({value_id})"
+                    )
+                    updated_rows[i] = {
+                        **row,
+                        KEY_FOR_VALUE_TYPE: "listed",
+                        KEY_FOR_VALUE_ID: value_id,
+                        KEY_FOR_RUSSIAN_NAME_OF_VALUE: new_value_ru,
+                    }
+                    break
+
+            if updated_rows == rows:
+                continue
+
+            write_csv(
+                updated_rows,
+                path_to_file=self.output_dir_with_feature_profiles / file.name,
+                overwrite=True,
+                delimiter=",",
+            )
+            self._update_feature_profile_index(file, updated_rows)
 
 
 if __name__ == "__main__":
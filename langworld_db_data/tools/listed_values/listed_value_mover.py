@@ -1,13 +1,20 @@
 from langworld_db_data import ObjectWithPaths
 from langworld_db_data.constants.literals import (
-    KEY_FOR_ENGLISH,
+    ATOMIC_VALUE_SEPARATOR,
+    ID_SEPARATOR,
     KEY_FOR_FEATURE_ID,
-    KEY_FOR_RUSSIAN,
+    KEY_FOR_ID,
+    KEY_FOR_RUSSIAN_NAME_OF_VALUE,
+    KEY_FOR_VALUE_ID,
+    KEY_FOR_VALUE_TYPE,
+)
+from langworld_db_data.tools.common.edit_session import read_dicts_from_csv, write_csv
+from langworld_db_data.tools.common.ids.extract import extract_feature_id, extract_value_index
+from langworld_db_data.tools.common.ids.remap import (
+    IDMapping,
+    remap_ids_in_file_with_features,
+    remap_ids_in_inventory_of_listed_values,
 )
-from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR, FILE_WITH_LISTED_VALUES
-from langworld_db_data.tools.common.ids.extract import extract_value_index
-from langworld_db_data.tools.listed_values.listed_value_adder import ListedValueAdder
-from langworld_db_data.tools.listed_values.listed_value_remover import ListedValueRemover
 
 
 class ListedValueMoverError(Exception):
@@ -15,45 +22,169 @@ class ListedValueMoverError(Exception):
 
 
 class ListedValueMover(ObjectWithPaths):
-    def __init__(
-        self,
-        listed_value_adder_input_file_with_inventories=FILE_WITH_LISTED_VALUES,
-        listed_value_adder_input_dir_with_feature_profiles=FEATURE_PROFILES_DIR,
-        **kwargs,
-    ):
-        super().__init__(**kwargs)
-        self.listed_value_adder = ListedValueAdder(
-            input_file_with_listed_values=listed_value_adder_input_file_with_inventories,
-            input_dir_with_feature_profiles=listed_value_adder_input_dir_with_feature_profiles,
-            output_file_with_listed_values=self.output_file_with_listed_values,
-            output_dir_with_feature_profiles=self.output_dir_with_feature_profiles,
-        )
-        self.listed_value_remover = ListedValueRemover(
-            **kwargs,
-        )
-
     def move_listed_value(
         self,
         initial_value_id: str,
         index_to_assign: int,
-    ):
+    ) -> None:
         """
         Moves value with the passed ID to the position of the passed index
         within the same feature. Refreshes other IDs of the feature in both
         the inventory and the feature profiles.
+
+        The new IDs of all values of the feature are computed once
+        and applied to the inventory, to the profiles that have listed values
+        of the feature (including compound values) and to references to the values
+        in the inventory of features, in one pass over each file.
+        Atomic values within compound values are kept sorted by value ID.
         """
         if extract_value_index(initial_value_id) == index_to_assign:
             raise ListedValueMoverError("Initial and final indices cannot be equal.")
-        value_to_move = self.listed_value_remover.remove_listed_value(initial_value_id)
-        self.listed_value_adder.add_listed_value(
-            feature_id=value_to_move[KEY_FOR_FEATURE_ID],
-            new_value_en=value_to_move[KEY_FOR_ENGLISH],
-            new_value_ru=value_to_move[KEY_FOR_RUSSIAN],
-            index_to_assign=index_to_assign,
-            description_formatted_en=value_to_move["description_formatted_en"],
-            description_formatted_ru=value_to_move["description_formatted_ru"],
+
+        feature_id = extract_feature_id(initial_value_id)
+        rows = read_dicts_from_csv(self.input_file_with_listed_values)
+
+        line_numbers_of_values_of_feature = [
+            i for i, row in enumerate(rows) if row[KEY_FOR_FEATURE_ID] == feature_id
+        ]
+        value_ids_of_feature = [rows[i][KEY_FOR_ID] for i in line_numbers_of_values_of_feature]
+
+        if initial_value_id not in value_ids_of_feature:
+            raise ListedValueMoverError(f"Value ID {initial_value_id} not found")
+
+        if not 1 <= index_to_assign <= len(value_ids_of_feature):
+            raise ListedValueMoverError(
+                f"Invalid index_to_assign (must be between 1 and {len(value_ids_of_feature)}, "
+                f"{index_to_assign} was given)"
+            )
+
+        mapping = IDMapping(
+            new_value_id_for_old=self._get_new_value_ids(
+                value_ids_of_feature=value_ids_of_feature,
+                initial_value_id=initial_value_id,
+                index_to_assign=index_to_assign,
+            )
+        )
+
+        print(f"Moving value {initial_value_id} to {mapping.remap_value_id(initial_value_id)}")
+
+        self._move_in_inventory_of_listed_values(
+            rows=rows,
+            line_numbers_of_values_of_feature=line_numbers_of_values_of_feature,
+            mapping=mapping,
+        )
+        self._move_in_feature_profiles(feature_id=feature_id, mapping=mapping)
+        remap_ids_in_file_with_features(
+            self.input_file_with_features, self.output_file_with_features, mapping
+        )
+
+    @staticmethod
+    def _get_new_value_ids(
+        value_ids_of_feature: list[str],
+        initial_value_id: str,
+        index_to_assign: int,
+    ) -> dict[str, str]:
+        """Returns new ID for each value ID of the feature whose ID changes.
+
+        The moved value gets `index_to_assign`, values between its old and new position
+        are shifted by one towards its old position.
+        """
+        feature_id = extract_feature_id(initial_value_id)
+        initial_index = extract_value_index(initial_value_id)
+
+        new_value_id_for_old_value_id = {
+            initial_value_id: f"{feature_id}{ID_SEPARATOR}{index_to_assign}"
+        }
+
+        for value_id in value_ids_of_feature:
+            index = extract_value_index(value_id)
+            if index_to_assign <= index < initial_index:
+                new_index = index + 1
+            elif initial_index < index <= index_to_assign:
+                new_index = index - 1
+            else:
+                continue
+            new_value_id_for_old_value_id[value_id] = f"{feature_id}{ID_SEPARATOR}{new_index}"
+
+        return new_value_id_for_old_value_id
+
+    def _move_in_inventory_of_listed_values(
+        self,
+        rows: list[dict[str, str]],
+        line_numbers_of_values_of_feature: list[int],
+        mapping: IDMapping,
+    ) -> None:
+        rows = list(remap_ids_in_inventory_of_listed_values(rows, mapping))
+        rows_of_feature = [rows[i] for i in line_numbers_of_values_of_feature]
+
+        # values of the feature stay on the same lines, but in the order of new IDs
+        rows_of_feature.sort(key=lambda row: extract_value_index(row[KEY_FOR_ID]))
+        for i, row in zip(line_numbers_of_values_of_feature, rows_of_feature):
+            rows[i] = row
+
+        write_csv(
+            rows,
+            path_to_file=self.output_file_with_listed_values,
+            overwrite=True,
+            delimiter=",",
         )
 
+    def _move_in_feature_profiles(
+        self,
+        feature_id: str,
+        mapping: IDMapping,
+    ) -> None:
+        # only profiles where the feature has a listed value can be affected
+        for file in self.feature_profile_index.files_with_feature(feature_id, "listed"):
+            rows = read_dicts_from_csv(file)
+
+            is_changed = False
+            for row in rows:
+                if row[KEY_FOR_FEATURE_ID] != feature_id or row[KEY_FOR_VALUE_TYPE] != "listed":
+                    continue
+                if self._move_in_row(row, mapping):
+                    is_changed = True
+
+            if is_changed:
+                print(f"Updating value IDs in {file.stem}")
+                write_csv(
+                    rows,
+                    path_to_file=self.output_dir_with_feature_profiles / file.name,
+                    overwrite=True,
+                    delimiter=",",
+                )
+                self._update_feature_profile_index(file, rows)
+
+    @staticmethod
+    def _move_in_row(row: dict[str, str], mapping: IDMapping) -> bool:
+        """Replaces value IDs in the row (keeping atomic values sorted by ID).
+        Returns True if the row was changed.
+        """
+        value_ids = row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR)
+        new_value_ids = [mapping.remap_value_id(value_id) for value_id in value_ids]
+        if new_value_ids == value_ids:
+            return False
+
+        if len(new_value_ids) == 1:
+            row[KEY_FOR_VALUE_ID] = new_value_ids[0]
+            return True
+
+        value_names = row[KEY_FOR_RUSSIAN_NAME_OF_VALUE].split(ATOMIC_VALUE_SEPARATOR)
+        if len(value_names) == len(new_value_ids):
+            pairs = sorted(
+                zip(new_value_ids, value_names), key=lambda pair: extract_value_index(pair[0])
+            )
+            row[KEY_FOR_VALUE_ID] = ATOMIC_VALUE_SEPARATOR.join(pair[0] for pair in pairs)
+            row[KEY_FOR_RUSSIAN_NAME_OF_VALUE] = ATOMIC_VALUE_SEPARATOR.join(
+                pair[1] for pair in pairs
+            )
+        else:
+            # names do not correspond to IDs one to one, so only IDs can be sorted
+            row[KEY_FOR_VALUE_ID] = ATOMIC_VALUE_SEPARATOR.join(
+                sorted(new_value_ids, key=extract_value_index)
+            )
+        return True
+
 
 if __name__ == "__main__":
     ListedValueMover().move_listed_value(
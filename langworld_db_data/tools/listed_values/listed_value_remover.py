@@ -1,14 +1,21 @@
-from tinybear.csv_xls import read_dicts_from_csv, write_csv
-
 from langworld_db_data import ObjectWithPaths
 from langworld_db_data.constants.literals import (
-    ID_SEPARATOR,
+    ATOMIC_VALUE_SEPARATOR,
     KEY_FOR_FEATURE_ID,
     KEY_FOR_ID,
+    KEY_FOR_RUSSIAN_NAME_OF_VALUE,
     KEY_FOR_VALUE_ID,
     KEY_FOR_VALUE_TYPE,
 )
-from langworld_db_data.tools.common.ids.extract import extract_feature_id, extract_value_index
+from langworld_db_data.tools.common.edit_session import read_dicts_from_csv, write_csv
+from langworld_db_data.tools.common.ids.extract import extract_feature_id
+from langworld_db_data.tools.common.ids.remap import (
+    IDMapping,
+    get_mapping_after_deletion,
+    remap_ids_in_feature_profile,
+    remap_ids_in_file_with_features,
+    remap_ids_in_inventory_of_listed_values,
+)
 
 
 class ListedValueRemoverError(Exception):
@@ -40,7 +47,6 @@ class ListedValueRemover(ObjectWithPaths):
         self,
         id_of_value_to_remove: str,
     ) -> dict[str, str]:
-
         line_number_of_value_to_remove = 0
         value_to_remove: dict[str, str] = {}
 
@@ -63,12 +69,17 @@ class ListedValueRemover(ObjectWithPaths):
             rows[:line_number_of_value_to_remove] + rows[line_number_of_value_to_remove + 1 :]
         )
 
-        rows_without_removed_value_and_with_updated_value_indices = (
-            self._update_value_indices_in_inventory(
-                rows=rows_without_removed_value,
-                id_of_removed_value=id_of_value_to_remove,
+        # Values following the removed one get decremented IDs both in this inventory
+        # and in references to them in the inventory of features.
+        mapping = IDMapping(
+            new_value_id_for_old=get_mapping_after_deletion(
+                ids=(row[KEY_FOR_ID] for row in rows_without_removed_value),
+                deleted_id=id_of_value_to_remove,
             )
         )
+        rows_without_removed_value_and_with_updated_value_indices = (
+            remap_ids_in_inventory_of_listed_values(rows_without_removed_value, mapping)
+        )
 
         write_csv(
             rows_without_removed_value_and_with_updated_value_indices,
@@ -77,90 +88,107 @@ class ListedValueRemover(ObjectWithPaths):
             delimiter=",",
         )
 
+        # references to the removed value are removed: otherwise they would point
+        # to the value that takes its ID
+        remap_ids_in_file_with_features(
+            self.input_file_with_features,
+            self.output_file_with_features,
+            mapping,
+            is_removed_value_id=lambda value_id: value_id == id_of_value_to_remove,
+        )
+
         print(f"Removed value {id_of_value_to_remove} from inventory of listed values")
         return value_to_remove
 
     def _remove_from_feature_profiles_and_update_ids_whose_indices_are_greater_than_one_of_removed_value(
         self,
         id_of_value_to_remove: str,
-    ):
-        print(id_of_value_to_remove)
-        for file in self.input_feature_profiles:
-            is_changed = False
+    ) -> None:
+        """Removes the value from feature profiles and decrements IDs of following values
+        of the feature.
+
+        If the removed value is one of atomic values of a compound value, it is removed
+        from the compound value together with its name. If it is the only value,
+        value type is changed to custom (keeping the name of the value).
+        """
+        feature_id = extract_feature_id(id_of_value_to_remove)
+
+        # only profiles where the feature has a listed value can be affected
+        for file in self.feature_profile_index.files_with_feature(feature_id, "listed"):
             rows = read_dicts_from_csv(file)
 
-            for row in rows:
-                if row[KEY_FOR_VALUE_TYPE] != "listed":
-                    continue
-                if row[KEY_FOR_FEATURE_ID] != extract_feature_id(id_of_value_to_remove):
+            # the removed value must be removed before remapping: its ID
+            # can be taken by the value following it
+            rows_without_removed_value = rows
+            for i, row in enumerate(rows):
+                new_row = self._remove_value_from_row(row, id_of_value_to_remove)
+                if new_row is row:
                     continue
-
-                if row[KEY_FOR_VALUE_ID] == id_of_value_to_remove:
-                    row[KEY_FOR_VALUE_ID] = ""
-                    row[KEY_FOR_VALUE_TYPE] = "custom"
+                if new_row[KEY_FOR_VALUE_TYPE] == "custom":
                     print(f"Changing value type to custom in {file.stem}")
-                    is_changed = True
-                    break
-                elif "&" in row[KEY_FOR_VALUE_ID]:
-                    atomic_value_ids = row[KEY_FOR_VALUE_ID].split("&")
-                    new_atomic_value_ids = []
-                    for atomic_value_id in atomic_value_ids:
-                        if extract_value_index(atomic_value_id) > extract_value_index(
-                            id_of_value_to_remove
-                        ):
-                            new_atomic_value_index = str(extract_value_index(atomic_value_id) - 1)
-                            new_atomic_value_ids.append(
-                                f"{extract_feature_id(row[KEY_FOR_VALUE_ID])}{ID_SEPARATOR}{new_atomic_value_index}"
-                            )
-                            is_changed = True
-                        else:
-                            new_atomic_value_ids.append(atomic_value_id)
-                        new_combined_value_ids = "&".join(new_atomic_value_ids)
-                        row[KEY_FOR_VALUE_ID] = new_combined_value_ids
-                        print(f"Updating atomic valie ids in {file.stem}")
-                elif extract_value_index(row[KEY_FOR_VALUE_ID]) > extract_value_index(
-                    id_of_value_to_remove
-                ):
-                    print(row[KEY_FOR_VALUE_ID])
-                    new_value_index = str(extract_value_index(row[KEY_FOR_VALUE_ID]) - 1)
-                    row[KEY_FOR_VALUE_ID] = (
-                        f"{extract_feature_id(row[KEY_FOR_VALUE_ID])}{ID_SEPARATOR}{new_value_index}"
+                else:
+                    print(f"Removing value from compound value in {file.stem}")
+                rows_without_removed_value = list(rows)
+                rows_without_removed_value[i] = new_row
+                break
+
+            atomic_value_ids = [
+                atomic_value_id
+                for row in rows_without_removed_value
+                if row[KEY_FOR_VALUE_TYPE] == "listed"
+                for atomic_value_id in row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR)
+            ]
+            updated_rows = remap_ids_in_feature_profile(
+                rows_without_removed_value,
+                IDMapping(
+                    new_value_id_for_old=get_mapping_after_deletion(
+                        ids=atomic_value_ids, deleted_id=id_of_value_to_remove
                     )
-                    print(f"Updating value id in {file.stem}")
-                    is_changed = True
-                    break
-
-            if is_changed:
-                write_csv(
-                    rows,
-                    path_to_file=self.output_dir_with_feature_profiles / file.name,
-                    overwrite=True,
-                    delimiter=",",
-                )
-            else:
+                ),
+            )
+
+            if updated_rows is rows:
                 print(f"{file.stem} is not changed")
+                continue
+
+            print(f"Updating value id in {file.stem}")
+            write_csv(
+                updated_rows,
+                path_to_file=self.output_dir_with_feature_profiles / file.name,
+                overwrite=True,
+                delimiter=",",
+            )
+            self._update_feature_profile_index(file, updated_rows)
 
     @staticmethod
-    def _update_value_indices_in_inventory(
-        rows: list[dict[str, str]],
-        id_of_removed_value: str,
-    ) -> list[dict[str, str]]:
-        feature_id = extract_feature_id(id_of_removed_value)
-        index_of_value_to_remove = extract_value_index(id_of_removed_value)
-        rows_with_updated_indices = rows.copy()
+    def _remove_value_from_row(row: dict[str, str], id_of_value_to_remove: str) -> dict[str, str]:
+        """Returns copy of row without given atomic value
+        (or the row itself if it does not have this value).
+        """
+        if row[KEY_FOR_VALUE_TYPE] != "listed":
+            return row
 
-        for i, row in enumerate(rows):
-            if row[KEY_FOR_FEATURE_ID] != feature_id:
-                continue
-            current_value_index = extract_value_index(row[KEY_FOR_ID])
-            if current_value_index > index_of_value_to_remove:
-                new_current_value_index = str(current_value_index - 1)
-                new_current_value_id = (
-                    f"{extract_feature_id(row[KEY_FOR_ID])}{ID_SEPARATOR}{new_current_value_index}"
-                )
-                rows_with_updated_indices[i][KEY_FOR_ID] = new_current_value_id
-
-        return rows_with_updated_indices
+        atomic_value_ids = row[KEY_FOR_VALUE_ID].split(ATOMIC_VALUE_SEPARATOR)
+        if id_of_value_to_remove not in atomic_value_ids:
+            return row
+
+        if len(atomic_value_ids) == 1:
+            return {**row, KEY_FOR_VALUE_ID: "", KEY_FOR_VALUE_TYPE: "custom"}
+
+        index_of_removed_value = atomic_value_ids.index(id_of_value_to_remove)
+        atomic_value_names = row[KEY_FOR_RUSSIAN_NAME_OF_VALUE].split(ATOMIC_VALUE_SEPARATOR)
+        if len(atomic_value_names) != len(atomic_value_ids):
+            raise ListedValueRemoverError(
+                f"Numbers of atomic value IDs and names do not match in row {row}"
+            )
+        del atomic_value_ids[index_of_removed_value]
+        del atomic_value_names[index_of_removed_value]
+
+        return {
+            **row,
+            KEY_FOR_VALUE_ID: ATOMIC_VALUE_SEPARATOR.join(atomic_value_ids),
+            KEY_FOR_RUSSIAN_NAME_OF_VALUE: ATOMIC_VALUE_SEPARATOR.join(atomic_value_names),
+        }
 
 
 if __name__ == "__main__":
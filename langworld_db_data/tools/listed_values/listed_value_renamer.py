@@ -1,6 +1,6 @@
 from pathlib import Path
+from typing import Optional
 
-from tinybear.csv_xls import read_dicts_from_csv, write_csv
 from tinybear.txt import remove_extra_space
 
 from langworld_db_data.constants.literals import (
@@ -11,6 +11,9 @@ from langworld_db_data.constants.literals import (
     KEY_FOR_VALUE_ID,
 )
 from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR, INVENTORIES_DIR
+from langworld_db_data.tools.common.edit_session import read_dicts_from_csv, write_csv
+from langworld_db_data.tools.featureprofiles.feature_profile_index import FeatureProfileIndex
+from langworld_db_data.tools.featureprofiles.parsed_profile_cache import ParsedProfileCache
 
 
 class ListedValueRenamerError(Exception):
@@ -24,11 +27,15 @@ class ListedValueRenamer:
         input_inventories_dir: Path = INVENTORIES_DIR,
         output_feature_profiles_dir: Path = FEATURE_PROFILES_DIR,
         output_inventories_dir: Path = INVENTORIES_DIR,
+        feature_profile_index: Optional[FeatureProfileIndex] = None,
+        parsed_profile_cache: Optional[ParsedProfileCache] = None,
     ) -> None:
         self.input_feature_profiles_dir = input_feature_profiles_dir
         self.input_inventories_dir = input_inventories_dir
         self.output_feature_profiles_dir = output_feature_profiles_dir
         self.output_inventories_dir = output_inventories_dir
+        self.feature_profile_index = feature_profile_index
+        self.parsed_profile_cache = parsed_profile_cache
         self.inventory_of_listed_values = read_dicts_from_csv(
             self.input_inventories_dir / "features_listed_values.csv"
         )
@@ -58,15 +65,25 @@ class ListedValueRenamer:
             input_file=self.input_inventories_dir / "features_listed_values.csv",
             output_file=self.output_inventories_dir / "features_listed_values.csv",
         )
-        files = list(self.input_feature_profiles_dir.glob("*.csv"))
-        for file in files:
+
+        if self.feature_profile_index is None:
+            cache = self.parsed_profile_cache
+            if cache is None and self.input_feature_profiles_dir == FEATURE_PROFILES_DIR:
+                cache = ParsedProfileCache()
+            self.feature_profile_index = FeatureProfileIndex(
+                self.input_feature_profiles_dir, cache=cache
+            )
+
+        # only profiles that have the value (on its own or in a compound value) are processed
+        for file in self.feature_profile_index.files_with_value(id_of_value_to_rename):
             print(f"Processing {file.name}")
-            self._update_one_feature_profile(
+            rows = self._update_one_feature_profile(
                 id_of_value_to_rename=id_of_value_to_rename,
                 new_value_name=new_value_name,
                 input_file=file,
                 output_dir=self.output_feature_profiles_dir,
             )
+            self.feature_profile_index.update(doculect_id=file.stem, rows=rows)
 
     def _value_id_exists(
         self,
@@ -120,7 +137,10 @@ class ListedValueRenamer:
         new_value_name: str,
         input_file: Path,
         output_dir: Path,
-    ) -> None:
+    ) -> list[dict[str, str]]:
+        """Renames value in one feature profile and writes it to output dir.
+        Returns rows that were written.
+        """
 
         number_of_replacements = 0
         data_from_file = read_dicts_from_csv(input_file)
@@ -164,6 +184,7 @@ class ListedValueRenamer:
         output_file = output_dir / input_file.name
         write_csv(rows=data_to_write, path_to_file=output_file, overwrite=True, delimiter=",")
         print(f"Successfully written to {output_file}")
+        return data_to_write
 
 
 if __name__ == "__main__":
@@ -6,7 +6,12 @@ from tinybear.csv_xls import (
     read_plain_rows_from_csv,
 )
 
-from langworld_db_data.constants.paths import ASSETS_DIR, FILE_WITH_DOCULECTS
+from langworld_db_data.constants.paths import (
+    ASSETS_DIR,
+    FILE_WITH_DOCULECTS,
+    FILE_WITH_MAP_TO_DOCULECT,
+    FILE_WITH_MAPS,
+)
 from langworld_db_data.validators.validator import Validator, ValidatorError
 
 
@@ -25,6 +30,10 @@ class AssetValidator(Validator):
         self.file_with_encyclopedia_maps = file_with_encyclopedia_maps
         self.file_matching_maps_to_doculects = file_matching_maps_to_doculects
 
+    @classmethod
+    def get_default_input_files(cls) -> tuple[Path, ...]:
+        return FILE_WITH_DOCULECTS, FILE_WITH_MAPS, FILE_WITH_MAP_TO_DOCULECT
+
     def validate(self) -> None:
         print("\nValidating files describing assets")
         self._validate_file_matching_maps_to_doculects()
@@ -38,33 +47,49 @@ class AssetValidator(Validator):
         ]
 
         counter = Counter(rows_as_tuples)
-        for key in counter:
-            if counter[key] > 1:
-                raise AssetValidatorError(
+        repeating_rows = [key for key in counter if counter[key] > 1]
+        for key in repeating_rows:
+            self._fail(
+                AssetValidatorError(
                     f"File {self.file_matching_maps_to_doculects.name} has a repeating"
                     f" row: {key} ({counter[key]})"
-                )
-        print("OK: No repeating rows found")
+                ),
+                file=self.file_matching_maps_to_doculects,
+            )
+        if not repeating_rows:
+            print("OK: No repeating rows found")
 
         doculect_ids = self._read_ids(self.file_with_doculects)
         map_ids = self._read_ids(self.file_with_encyclopedia_maps)
 
+        ids_are_ok = True
         for i, row in enumerate(
             read_dicts_from_csv(self.file_matching_maps_to_doculects), start=2
         ):
             if row["encyclopedia_map_id"] not in map_ids:
-                raise AssetValidatorError(
-                    f"Row {i} in file {self.file_matching_maps_to_doculects.name}: Map"
-                    f" ID {row['encyclopedia_map_id']} not found in file"
-                    f" {self.file_with_encyclopedia_maps.name}"
+                ids_are_ok = False
+                self._fail(
+                    AssetValidatorError(
+                        f"Row {i} in file {self.file_matching_maps_to_doculects.name}: Map"
+                        f" ID {row['encyclopedia_map_id']} not found in file"
+                        f" {self.file_with_encyclopedia_maps.name}"
+                    ),
+                    file=self.file_matching_maps_to_doculects,
+                    row=i,
                 )
             if row["doculect_id"] not in doculect_ids:
-                raise AssetValidatorError(
-                    f"Row {i} in file {self.file_matching_maps_to_doculects.name}:"
-                    f" Doculect ID {row['doculect_id']} not found in file"
-                    f" {self.file_with_doculects.name}"
+                ids_are_ok = False
+                self._fail(
+                    AssetValidatorError(
+                        f"Row {i} in file {self.file_matching_maps_to_doculects.name}:"
+                        f" Doculect ID {row['doculect_id']} not found in file"
+                        f" {self.file_with_doculects.name}"
+                    ),
+                    file=self.file_matching_maps_to_doculects,
+                    row=i,
                 )
-        print("OK: IDs of encyclopedia maps and doculects match IDs in respective files")
+        if ids_are_ok:
+            print("OK: IDs of encyclopedia maps and doculects match IDs in respective files")
 
 
 if __name__ == "__main__":
@@ -13,6 +13,7 @@ from langworld_db_data.constants.paths import (
     FILE_WITH_DOCULECTS,
     FILE_WITH_GENEALOGY_NAMES,
 )
+from langworld_db_data.tools.common.change_manifest import Changes
 from langworld_db_data.validators.validator import Validator, ValidatorError
 
 
@@ -45,6 +46,17 @@ class DoculectInventoryValidator(Validator):
             d[KEY_FOR_ID]: d["has_feature_profile"] for d in self.doculects
         }
 
+    @classmethod
+    def get_default_input_files(cls) -> tuple[Path, ...]:
+        return FILE_WITH_DOCULECTS, FILE_WITH_GENEALOGY_NAMES
+
+    @classmethod
+    def is_affected_by(cls, changes: Changes) -> bool:
+        # content of feature profiles does not matter here, only their names
+        return super().is_affected_by(changes) or changes.include_added_or_removed_in(
+            FEATURE_PROFILES_DIR
+        )
+
     def validate(self) -> None:
         """
         Runs all checks.
@@ -63,13 +75,20 @@ class DoculectInventoryValidator(Validator):
 
         :raises DoculectInventoryValidatorError
         """
+        is_ok = True
         for doculect in self.doculects:
             if doculect["family_id"] not in self.genealogy_family_ids:
-                raise DoculectInventoryValidatorError(
-                    f"{doculect[KEY_FOR_ID].capitalize()}: genealogy family ID"
-                    f" {doculect['family_id']} not found in genealogy inventory"
+                is_ok = False
+                self._fail(
+                    DoculectInventoryValidatorError(
+                        f"{doculect[KEY_FOR_ID].capitalize()}: genealogy family ID"
+                        f" {doculect['family_id']} not found in genealogy inventory"
+                    )
                 )
-        print("OK: ID of language family for each doculect is present in genealogy" " inventory")
+        if is_ok:
+            print(
+                "OK: ID of language family for each doculect is present in genealogy" " inventory"
+            )
 
     def _check_uniqueness_of_coordinates(self) -> None:
         """Checks that all pairs of coordinates are unique.
@@ -90,9 +109,11 @@ class DoculectInventoryValidator(Validator):
             print("\nFound doculects with identical coordinates:")
             for pair in coords_with_more_than_one_doculect:
                 print(", ".join(coords_to_doculect_ids[pair]), ": ", pair, sep="")
-            raise DoculectInventoryValidatorError("Some doculects have identical coordinates")
-
-        print("OK: All pairs of coordinates are unique")
+            self._fail(
+                DoculectInventoryValidatorError("Some doculects have identical coordinates")
+            )
+        else:
+            print("OK: All pairs of coordinates are unique")
 
     def _match_doculects_to_files(self) -> None:
         """Checks that each doculect in list of doculects
@@ -101,18 +122,23 @@ class DoculectInventoryValidator(Validator):
 
         :raises DoculectInventoryValidatorError
         """
+        is_ok = True
         for doculect in self.doculects:
             if (
                 doculect["has_feature_profile"] == "1"
                 and doculect[KEY_FOR_ID] not in self.names_of_feature_profiles
             ):
-                raise DoculectInventoryValidatorError(
-                    f"Doculect {doculect[KEY_FOR_ID]} has no file with feature profile."
+                is_ok = False
+                self._fail(
+                    DoculectInventoryValidatorError(
+                        f"Doculect {doculect[KEY_FOR_ID]} has no file with feature profile."
+                    )
                 )
-        print(
-            "OK: Every doculect that is marked as having a feature profile has a"
-            " matching .csv file."
-        )
+        if is_ok:
+            print(
+                "OK: Every doculect that is marked as having a feature profile has a"
+                " matching .csv file."
+            )
 
     def _match_files_to_doculects(self) -> None:
         """Checks that each feature profile matches a line
@@ -121,16 +147,24 @@ class DoculectInventoryValidator(Validator):
 
         :raises DoculectInventoryValidatorError
         """
-        for name in self.names_of_feature_profiles:
+        is_ok = True
+        for name in sorted(self.names_of_feature_profiles):
             if name not in self.doculect_ids:
-                raise DoculectInventoryValidatorError(
-                    f"Feature profile {name} has no match in file with doculects."
+                is_ok = False
+                self._fail(
+                    DoculectInventoryValidatorError(
+                        f"Feature profile {name} has no match in file with doculects."
+                    )
                 )
-            if self.has_feature_profile_for_doculect_id[name] != "1":
-                raise DoculectInventoryValidatorError(
-                    f'Feature profile {name} is not marked with "1" in file with' " doculects."
+            elif self.has_feature_profile_for_doculect_id[name] != "1":
+                is_ok = False
+                self._fail(
+                    DoculectInventoryValidatorError(
+                        f'Feature profile {name} is not marked with "1" in file with' " doculects."
+                    )
                 )
-        print("OK: Every feature profile is marked correspondingly in file with" " doculects.")
+        if is_ok:
+            print("OK: Every feature profile is marked correspondingly in file with" " doculects.")
 
 
 if __name__ == "__main__":
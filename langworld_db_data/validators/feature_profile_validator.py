@@ -1,11 +1,14 @@
+import os
 import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from copy import copy
+from io import StringIO
 from pathlib import Path
+from typing import Optional
 
-from tinybear.csv_xls import (
-    check_csv_for_malformed_rows,
-    check_csv_for_repetitions_in_column,
-    read_dict_from_2_csv_columns,
-)
+from tinybear.csv_xls import read_dict_from_2_csv_columns
 
 from langworld_db_data.constants.literals import (
     ATOMIC_VALUE_SEPARATOR,
@@ -23,11 +26,18 @@ from langworld_db_data.constants.paths import (
     FILE_WITH_NAMES_OF_FEATURES,
     FILE_WITH_VALUE_TYPES,
 )
+from langworld_db_data.tools.common.change_manifest import Changes
 from langworld_db_data.tools.featureprofiles import (
     ValueForFeatureProfileDictionary,
 )
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
 from langworld_db_data.tools.featureprofiles.feature_profile_reader import FeatureProfileReader
-from langworld_db_data.validators.validator import Validator, ValidatorError
+from langworld_db_data.validators.validator import (
+    ValidationFinding,
+    ValidationReport,
+    Validator,
+    ValidatorError,
+)
 
 
 class FeatureProfileValidatorError(ValidatorError):
@@ -63,16 +73,33 @@ class FeatureProfileValidator(Validator):
         file_with_value_types: Path = FILE_WITH_VALUE_TYPES,
         must_throw_error_at_feature_or_value_name_mismatch: bool = True,
         must_throw_error_at_not_applicable_rule_breach: bool = False,
+        corpus: Optional[FeatureProfileCorpus] = None,
     ):
+        """If `corpus` is given, feature profiles are taken from it
+        (and `dir_with_feature_profiles` is ignored), so no profile is read from disk.
+        Otherwise, the validator loads its own corpus from `dir_with_feature_profiles`.
+
+        Either way, each file is read only once: malformed rows are detected when
+        the corpus is loaded, and the rest of the checks work with rows in memory.
+        """
+        self.file_with_features = file_with_features
+        self.file_with_listed_values = file_with_listed_values
+        self.file_with_value_types = file_with_value_types
+
         self.reader = FeatureProfileReader()
         self.valid_value_types = self._read_ids(file_with_value_types)
+        self.corpus = (
+            corpus if corpus is not None else FeatureProfileCorpus(dir_with_feature_profiles)
+        )
+        self.feature_profiles = self.corpus.files
 
-        self.feature_profiles = sorted(list(dir_with_feature_profiles.glob("*.csv")))
-
-        for file in self.feature_profiles:
-            check_csv_for_malformed_rows(file)
+        for doculect_id in self.corpus.doculect_ids:
             for column_name in (KEY_FOR_FEATURE_ID, KEY_FOR_RUSSIAN_NAME_OF_FEATURE):
-                check_csv_for_repetitions_in_column(file, column_name=column_name)
+                self._check_rows_for_repetitions_in_column(
+                    rows=self.corpus.rows(doculect_id),
+                    file=self.corpus.path_for(doculect_id),
+                    column_name=column_name,
+                )
 
         self.feature_ru_for_feature_id = read_dict_from_2_csv_columns(
             file_with_features, key_col=KEY_FOR_ID, val_col=KEY_FOR_RUSSIAN
@@ -98,28 +125,101 @@ class FeatureProfileValidator(Validator):
             must_throw_error_at_not_applicable_rule_breach
         )
 
-    def validate(self) -> None:
-        print(f"\nChecking feature profiles ({len(self.feature_profiles)} files)")
-        for feature_profile in self.feature_profiles:
+    @classmethod
+    def get_default_input_files(cls) -> tuple[Path, ...]:
+        return (
+            FILE_WITH_NAMES_OF_FEATURES,
+            FILE_WITH_LISTED_VALUES,
+            FILE_WITH_VALUE_TYPES,
+            *sorted(FEATURE_PROFILES_DIR.glob("*.csv")),
+        )
+
+    def validate(self, workers: Optional[int] = 1, changes: Optional[Changes] = None) -> None:
+        """Validates all feature profiles.
+
+        With `workers` greater than 1 (or `None` for the number of CPUs),
+        profiles are validated in parallel in that many processes.
+        Messages and errors are still reported in order of files,
+        and the error raised is the one that a serial run would raise.
+
+        If `changes` are given, only profiles that have changed are validated,
+        unless one of the inventories has changed (then all profiles are validated).
+        """
+        files = self.feature_profiles
+
+        if changes is not None and not changes.include_any(
+            (self.file_with_features, self.file_with_listed_values, self.file_with_value_types)
+        ):
+            files = [file for file in files if changes.include(file)]
+
+        print(f"\nChecking feature profiles ({len(files)} files)")
+
+        number_of_workers = workers if workers is not None else os.cpu_count() or 1
+        if number_of_workers > 1 and len(files) > 1:
+            self._validate_in_parallel(files=files, number_of_workers=number_of_workers)
+            return
+
+        for feature_profile in files:
             self.validate_one_file(feature_profile)
 
     def validate_one_file(self, file: Path) -> None:
         try:
-            data_from_profile = self.reader.read_feature_profile_as_dict_from_file(file)
+            if self.corpus.contains_file(file):
+                data_from_profile = self.corpus.profile(file.stem)
+            else:
+                data_from_profile = self.reader.read_feature_profile_as_dict_from_file(file)
         except ValueError as e:
-            raise FeatureProfileValidatorError(e)
+            self._fail(FeatureProfileValidatorError(e), file=file)
+            return
+
+        self._validate_profile(data_from_profile=data_from_profile, file=file)
+
+    def _validate_in_parallel(self, files: list[Path], number_of_workers: int) -> None:
+        # Inventories and settings are sent to each worker once (in the initializer),
+        # and then only rows of profiles are sent with each task.
+        # The corpus itself stays in this process.
+        validator_for_workers = copy(self)
+        validator_for_workers.corpus = None  # type: ignore
+
+        chunksize = max(1, len(files) // (number_of_workers * 4))
+
+        with ProcessPoolExecutor(
+            max_workers=number_of_workers,
+            initializer=_initialize_worker,
+            initargs=(validator_for_workers,),
+        ) as executor:
+            results = executor.map(
+                _validate_rows_of_one_file_in_worker,
+                files,
+                [self.corpus.rows(file.stem) for file in files],
+                chunksize=chunksize,
+            )
 
+            # `map` returns results in order of input, which is sorted by file
+            for printed_output, error, findings in results:
+                print(printed_output, end="")
+                if self.report is not None:
+                    self.report.extend(findings)
+                if error is not None:
+                    executor.shutdown(wait=True, cancel_futures=True)
+                    raise error
+
+    def _validate_profile(
+        self, data_from_profile: dict[str, ValueForFeatureProfileDictionary], file: Path
+    ) -> None:
         file_name_for_error_msg = f"File {file.stem}"
 
         self._check_consistency_of_each_row(
             data_from_profile=data_from_profile,
             file_name_for_error_msg=file_name_for_error_msg,
+            file=file,
         )
 
         try:
             self.check_all_features_that_may_need_not_applicable_type(
                 profile=data_from_profile,
                 file_name_for_error_msg=file_name_for_error_msg,
+                file=file,
             )
         except ValueTypeValidationError as e:
             if self.must_throw_error_at_not_applicable_rule_breach:
@@ -127,93 +227,139 @@ class FeatureProfileValidator(Validator):
             else:
                 print(e)
 
+    @staticmethod
+    def _check_rows_for_repetitions_in_column(
+        rows: list[dict[str, str]], file: Path, column_name: str
+    ) -> None:
+        """Same as `check_csv_for_repetitions_in_column`, but for rows already in memory.
+
+        :raises FeatureProfileValidatorError
+        """
+        if rows and column_name not in rows[0]:
+            raise FeatureProfileValidatorError(
+                f"File {file}: cannot check uniqueness of value in column <{column_name}>"
+                " because it does not exist"
+            )
+
+        counter = Counter(row[column_name] for row in rows)
+        non_unique_keys = [key for key in counter if counter[key] > 1]
+
+        if non_unique_keys:
+            raise FeatureProfileValidatorError(
+                f"File {file} has repeating values in column <{column_name}>:"
+                f" {', '.join(non_unique_keys)}"
+            )
+
     def _check_consistency_of_each_row(
         self,
         data_from_profile: dict[str, ValueForFeatureProfileDictionary],
         file_name_for_error_msg: str,
+        file: Optional[Path] = None,
     ) -> None:
-        """Check whether each row in the profile contains accepted value for each value type."""
+        """Check whether each row in the profile contains accepted value for each value type.
+
+        In report mode, the first problem in each row is recorded,
+        and the check goes on with the next row.
+        """
         for i, feature_id in enumerate(data_from_profile.keys(), start=1):
             if feature_id == AUX_ROW_MARKER:
                 continue
 
-            # possible absence of feature ID in file is caught when reading
-            # data_from_profile
-            data_row = data_from_profile[feature_id]
+            try:
+                self._check_one_row(
+                    feature_id=feature_id,
+                    # possible absence of feature ID in file is caught when reading
+                    # data_from_profile
+                    data_row=data_from_profile[feature_id],
+                    file_name_for_error_msg=file_name_for_error_msg,
+                    row_name_for_error_msg=f"row {i + 1}",
+                )
+            except FeatureProfileValidatorError as e:
+                self._fail(e, file=file, row=i + 1, feature_id=feature_id)
+
+    def _check_one_row(
+        self,
+        feature_id: str,
+        data_row: ValueForFeatureProfileDictionary,
+        file_name_for_error_msg: str,
+        row_name_for_error_msg: str,
+    ) -> None:
+        if data_row.value_type not in self.valid_value_types:
+            raise FeatureProfileValidatorError(
+                f"{file_name_for_error_msg} contains invalid value type in {row_name_for_error_msg}"
+            )
 
-            row_name_for_error_msg = f"row {i + 1}"
-            if data_row.value_type not in self.valid_value_types:
+        if data_row.value_type == "custom":
+            if data_row.value_id:
                 raise FeatureProfileValidatorError(
-                    f"{file_name_for_error_msg} contains invalid value type in {row_name_for_error_msg}"
+                    f"{file_name_for_error_msg} must not contain value ID"
+                    f" {data_row.value_id} in {row_name_for_error_msg} or value type must be"
+                    ' "listed"'
+                )
+            if not data_row.value_ru:
+                raise FeatureProfileValidatorError(
+                    f"{file_name_for_error_msg} does not contain value text "
+                    f"in {row_name_for_error_msg}"
                 )
 
-            if data_row.value_type == "custom":
-                if data_row.value_id:
-                    raise FeatureProfileValidatorError(
-                        f"{file_name_for_error_msg} must not contain value ID"
-                        f" {data_row.value_id} in {row_name_for_error_msg} or value type must be"
-                        ' "listed"'
-                    )
-                if not data_row.value_ru:
-                    raise FeatureProfileValidatorError(
-                        f"{file_name_for_error_msg} does not contain value text "
-                        f"in {row_name_for_error_msg}"
-                    )
-
-            elif data_row.value_type in (
-                "not_stated",
-                "not_applicable",
-                "explicit_gap",
-            ):
-                if data_row.value_id or data_row.value_ru:
-                    raise FeatureProfileValidatorError(
-                        f"{file_name_for_error_msg} must not contain value ID or value text "
-                        f"in {row_name_for_error_msg} or value type must be different"
-                    )
+        elif data_row.value_type in (
+            "not_stated",
+            "not_applicable",
+            "explicit_gap",
+        ):
+            if data_row.value_id or data_row.value_ru:
+                raise FeatureProfileValidatorError(
+                    f"{file_name_for_error_msg} must not contain value ID or value text "
+                    f"in {row_name_for_error_msg} or value type must be different"
+                )
 
-            elif data_row.value_type == "listed":
-                if self.feature_is_multiselect_for_feature_id[feature_id] == "1":
-                    # validate each pair of value ID and value name
-                    for value_id, value_ru in zip(
-                        data_row.value_id.split(ATOMIC_VALUE_SEPARATOR),
-                        data_row.value_ru.split(ATOMIC_VALUE_SEPARATOR),
-                    ):
-                        self._check_listed_value_id_is_valid_and_matches_value_name(
-                            feature_id=feature_id,
-                            value_id=value_id,
-                            value_ru=value_ru,
-                            file_name_for_error_msg=file_name_for_error_msg,
-                            row_name_for_error_msg=row_name_for_error_msg,
-                        )
-                else:
+        elif data_row.value_type == "listed":
+            if self.feature_is_multiselect_for_feature_id[feature_id] == "1":
+                # validate each pair of value ID and value name
+                for value_id, value_ru in zip(
+                    data_row.value_id.split(ATOMIC_VALUE_SEPARATOR),
+                    data_row.value_ru.split(ATOMIC_VALUE_SEPARATOR),
+                ):
                     self._check_listed_value_id_is_valid_and_matches_value_name(
                         feature_id=feature_id,
-                        value_id=data_row.value_id,
-                        value_ru=data_row.value_ru,
+                        value_id=value_id,
+                        value_ru=value_ru,
                         file_name_for_error_msg=file_name_for_error_msg,
                         row_name_for_error_msg=row_name_for_error_msg,
                     )
-
-            if data_row.feature_name_ru != self.feature_ru_for_feature_id[feature_id]:
-                message = (
-                    f"{file_name_for_error_msg}, {row_name_for_error_msg}: feature name"
-                    f" {data_row.feature_name_ru} in {row_name_for_error_msg} does not match name of"
-                    " this feature in inventory"
-                    f" ({self.feature_ru_for_feature_id[feature_id]})"
+            else:
+                self._check_listed_value_id_is_valid_and_matches_value_name(
+                    feature_id=feature_id,
+                    value_id=data_row.value_id,
+                    value_ru=data_row.value_ru,
+                    file_name_for_error_msg=file_name_for_error_msg,
+                    row_name_for_error_msg=row_name_for_error_msg,
                 )
-                if self.must_throw_error_at_feature_or_value_name_mismatch:
-                    raise FeatureProfileValidatorError(message)
-                else:
-                    print(message)  # pragma: no cover
+
+        if data_row.feature_name_ru != self.feature_ru_for_feature_id[feature_id]:
+            message = (
+                f"{file_name_for_error_msg}, {row_name_for_error_msg}: feature name"
+                f" {data_row.feature_name_ru} in {row_name_for_error_msg} does not match name of"
+                " this feature in inventory"
+                f" ({self.feature_ru_for_feature_id[feature_id]})"
+            )
+            if self.must_throw_error_at_feature_or_value_name_mismatch:
+                raise FeatureProfileValidatorError(message)
+            else:
+                print(message)  # pragma: no cover
 
     def check_all_features_that_may_need_not_applicable_type(
         self,
         profile: dict[str, ValueForFeatureProfileDictionary],
         file_name_for_error_msg: str,
+        file: Optional[Path] = None,
     ) -> None:
         """
         Check that features are `not_applicable` if there are corresponding
         "trigger" values in feature(s) they depend on.
+
+        In report mode (if breach of these rules is an error),
+        each breach is recorded, and the check goes on with the next feature.
         """
         for feature_id_to_check in self.not_applicable_trigger_values_for_feature_id:
 
@@ -223,11 +369,16 @@ class FeatureProfileValidator(Validator):
                 #  where it can't be `not_applicable` (i.e. the other way round)
                 continue
 
-            self.check_one_feature_that_may_need_not_applicable_type(
-                profile=profile,
-                feature_id=feature_id_to_check,
-                file_name_for_error_msg=file_name_for_error_msg,
-            )
+            try:
+                self.check_one_feature_that_may_need_not_applicable_type(
+                    profile=profile,
+                    feature_id=feature_id_to_check,
+                    file_name_for_error_msg=file_name_for_error_msg,
+                )
+            except ValueTypeValidationError as e:
+                if not self.must_throw_error_at_not_applicable_rule_breach:
+                    raise
+                self._fail(e, file=file, feature_id=feature_id_to_check)
 
     def check_one_feature_that_may_need_not_applicable_type(
         self,
@@ -310,5 +461,49 @@ class FeatureProfileValidator(Validator):
                 print(message)
 
 
+_validator_in_worker: Optional[FeatureProfileValidator] = None
+
+
+def _initialize_worker(validator: FeatureProfileValidator) -> None:
+    global _validator_in_worker
+    _validator_in_worker = validator
+
+
+def _validate_rows_of_one_file_in_worker(
+    file: Path, rows: list[dict[str, str]]
+) -> tuple[str, Optional[Exception], list[ValidationFinding]]:
+    """Validates one profile in a worker process.
+    Returns everything the validation printed, the error it raised (if any)
+    and findings it recorded in report mode,
+    so that the main process can report them in order.
+    """
+    assert _validator_in_worker is not None
+
+    if _validator_in_worker.report is not None:
+        # findings of each file are sent back separately
+        _validator_in_worker.report = ValidationReport()
+
+    output = StringIO()
+    with redirect_stdout(output):
+        try:
+            try:
+                data_from_profile = FeatureProfileReader.convert_rows_to_feature_profile_dict(
+                    rows=rows, file_name_for_error_msg=file.stem
+                )
+            except ValueError as e:
+                _validator_in_worker._fail(FeatureProfileValidatorError(e), file=file)
+            else:
+                _validator_in_worker._validate_profile(
+                    data_from_profile=data_from_profile, file=file
+                )
+        except Exception as e:
+            return output.getvalue(), e, []
+
+    findings = (
+        _validator_in_worker.report.findings if _validator_in_worker.report is not None else []
+    )
+    return output.getvalue(), None, findings
+
+
 if __name__ == "__main__":
-    FeatureProfileValidator().validate()  # pragma: no cover
+    FeatureProfileValidator().validate(workers=None)  # pragma: no cover
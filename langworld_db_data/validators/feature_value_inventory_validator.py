@@ -34,44 +34,65 @@ class FeatureValueInventoryValidator(Validator):
         self.feature_ids = self._read_ids(file_with_features)
         self.rows_with_listed_values = read_dicts_from_csv(file_with_listed_values)
 
+    @classmethod
+    def get_default_input_files(cls) -> tuple[Path, ...]:
+        return FILE_WITH_NAMES_OF_FEATURES, FILE_WITH_LISTED_VALUES
+
     def validate(self) -> None:
         self._validate_feature_ids()
         self._validate_listed_values()
 
     def _validate_feature_ids(self) -> None:
+        is_ok = True
         if len(self.feature_ids) > len(set(self.feature_ids)):
-            raise FeatureValueInventoryValidatorError("Some feature IDs are not unique")
+            is_ok = False
+            self._fail(FeatureValueInventoryValidatorError("Some feature IDs are not unique"))
 
         for feature_id in self.feature_ids:
             if not re.match(r"[A-Z]-\d+", feature_id):
-                raise FeatureValueInventoryValidatorError(f"Invalid feature ID {feature_id}")
+                is_ok = False
+                self._fail(
+                    FeatureValueInventoryValidatorError(f"Invalid feature ID {feature_id}"),
+                    feature_id=feature_id,
+                )
 
-        print("Feature IDs OK")
+        if is_ok:
+            print("Feature IDs OK")
 
     def _validate_listed_values(self) -> None:
         feature_id_for_value_id = {
             row[KEY_FOR_ID]: row[KEY_FOR_FEATURE_ID] for row in self.rows_with_listed_values
         }
 
-        for value_id in feature_id_for_value_id:
-            if not value_id.startswith(feature_id_for_value_id[value_id]):
-                raise FeatureValueInventoryValidatorError(
-                    f"Value ID {value_id} does not start with feature ID"
-                    f" {feature_id_for_value_id[value_id]}"
+        is_ok = True
+        for value_id, feature_id in feature_id_for_value_id.items():
+            if not value_id.startswith(feature_id):
+                is_ok = False
+                self._fail(
+                    FeatureValueInventoryValidatorError(
+                        f"Value ID {value_id} does not start with feature ID {feature_id}"
+                    ),
+                    feature_id=feature_id,
                 )
-            if not re.match(rf"{feature_id_for_value_id[value_id]}-\d+", value_id):
-                raise FeatureValueInventoryValidatorError(
-                    f"Value ID {value_id} was not formed correctly from feature ID"
-                    f" {feature_id_for_value_id[value_id]}"
+            elif not re.match(rf"{feature_id}-\d+", value_id):
+                is_ok = False
+                self._fail(
+                    FeatureValueInventoryValidatorError(
+                        f"Value ID {value_id} was not formed correctly from feature ID"
+                        f" {feature_id}"
+                    ),
+                    feature_id=feature_id,
                 )
 
-        print("OK: all value IDs are derived from feature ID")
+        if is_ok:
+            print("OK: all value IDs are derived from feature ID")
 
         # Check uniqueness of Russian and English value names within one feature
         names_of_listed_values_for_feature_id: dict[str, list[str]] = {
             feature_id: [] for feature_id in self.feature_ids
         }
 
+        is_ok = True
         for locale in LOCALES:
             for feature_id in self.feature_ids:
                 names_of_listed_values_for_feature_id[feature_id] = [
@@ -86,12 +107,17 @@ class FeatureValueInventoryValidator(Validator):
                 duplicate_value_names = [value for value in counter if counter[value] > 1]
 
                 if duplicate_value_names:
-                    raise FeatureValueInventoryValidatorError(
-                        f"Duplicate value names found for feature {feature_id}:"
-                        f" {', '.join(duplicate_value_names)}"
+                    is_ok = False
+                    self._fail(
+                        FeatureValueInventoryValidatorError(
+                            f"Duplicate value names found for feature {feature_id}:"
+                            f" {', '.join(duplicate_value_names)}"
+                        ),
+                        feature_id=feature_id,
                     )
 
-        print("OK: all values within each feature have unique names")
+        if is_ok:
+            print("OK: all values within each feature have unique names")
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 import re
 from collections import Counter
+from functools import partial
 from pathlib import Path
 
 from tinybear.csv_xls import (
@@ -14,7 +15,7 @@ from langworld_db_data.constants.paths import (
     FILE_WITH_GENEALOGY_HIERARCHY,
     FILE_WITH_GENEALOGY_NAMES,
 )
-from langworld_db_data.validators.validator import Validator, ValidatorError
+from langworld_db_data.validators.validator import ERRORS_IN_DATA, Validator, ValidatorError
 
 
 class GenealogyValidatorError(ValidatorError):
@@ -32,13 +33,25 @@ class GenealogyValidator(Validator):
 
         self.family_ids_from_file_with_names = self._read_ids(self.file_with_names)
 
+    @classmethod
+    def get_default_input_files(cls) -> tuple[Path, ...]:
+        return FILE_WITH_GENEALOGY_HIERARCHY, FILE_WITH_GENEALOGY_NAMES
+
     def validate(self) -> None:
         print("\nChecking genealogy")
 
-        check_yaml_file(self.file_with_hierarchy, verbose=False)
-
-        check_csv_for_malformed_rows(self.file_with_names)
-        check_csv_for_repetitions_in_column(self.file_with_names, KEY_FOR_ID)
+        for check_file, file in (
+            (partial(check_yaml_file, verbose=False), self.file_with_hierarchy),
+            (check_csv_for_malformed_rows, self.file_with_names),
+            (
+                partial(check_csv_for_repetitions_in_column, column_name=KEY_FOR_ID),
+                self.file_with_names,
+            ),
+        ):
+            try:
+                check_file(file)
+            except ERRORS_IN_DATA as e:
+                self._fail(e, file=file)
 
         family_ids_from_hierarchy = self._check_and_get_ids_from_hierarchy()
         self._check_ids_in_list_of_names(family_ids_from_hierarchy)
@@ -57,6 +70,7 @@ class GenealogyValidator(Validator):
         pattern = re.compile(r"^-\s*(?P<id>[a-z_]+):?$")
 
         family_ids = []
+        is_ok = True
 
         for line in lines:
             if line.strip() == "---":
@@ -64,35 +78,49 @@ class GenealogyValidator(Validator):
 
             match = pattern.match(line)
             if not match:
-                raise GenealogyValidatorError(
-                    f"Family ID in line {line} is incorrectly formed. "
-                    "It can only contain lowercase letters and underscores"
+                is_ok = False
+                self._fail(
+                    GenealogyValidatorError(
+                        f"Family ID in line {line} is incorrectly formed. "
+                        "It can only contain lowercase letters and underscores"
+                    ),
+                    file=self.file_with_hierarchy,
                 )
+                continue
 
             family_id = match.group(KEY_FOR_ID)
 
             if family_id not in self.family_ids_from_file_with_names:
-                raise GenealogyValidatorError(
-                    f"Family ID {family_id} in hierarchy not found in file with names"
-                    " of families"
+                is_ok = False
+                self._fail(
+                    GenealogyValidatorError(
+                        f"Family ID {family_id} in hierarchy not found in file with names"
+                        " of families"
+                    ),
+                    file=self.file_with_hierarchy,
                 )
 
             family_ids.append(family_id)
 
-        print(
-            "OK: All family IDs in the hierarchy are formed correctly and match IDs in"
-            " list of families"
-        )
+        if is_ok:
+            print(
+                "OK: All family IDs in the hierarchy are formed correctly and match IDs in"
+                " list of families"
+            )
 
         counter = Counter(family_ids)
+        repeating_family_ids = [key for key in counter if counter[key] > 1]
 
-        for key in counter:
-            if counter[key] > 1:
-                raise GenealogyValidatorError(
+        for key in repeating_family_ids:
+            self._fail(
+                GenealogyValidatorError(
                     f"Family ID {key} was seen {counter[key]} times in the genealogy"
                     " hierarchy. It must be unique."
-                )
-        print("OK: All family IDs in genealogy hierarchy are unique")
+                ),
+                file=self.file_with_hierarchy,
+            )
+        if not repeating_family_ids:
+            print("OK: All family IDs in genealogy hierarchy are unique")
 
         return family_ids
 
@@ -106,23 +134,33 @@ class GenealogyValidator(Validator):
 
         pattern = re.compile(r"[a-z_]+")
 
+        is_ok = True
         for family_id in self.family_ids_from_file_with_names:
             if not pattern.match(family_id):
-                raise GenealogyValidatorError(
-                    f"File with names of families: invalid ID {family_id} (only use"
-                    " lowercase letters and underscore)"
+                is_ok = False
+                self._fail(
+                    GenealogyValidatorError(
+                        f"File with names of families: invalid ID {family_id} (only use"
+                        " lowercase letters and underscore)"
+                    ),
+                    file=self.file_with_names,
                 )
 
             if family_id not in ids_from_hierarchy:
-                raise GenealogyValidatorError(
-                    f"File with names of families: ID {family_id} not found in file"
-                    " with genealogy hierarchy"
+                is_ok = False
+                self._fail(
+                    GenealogyValidatorError(
+                        f"File with names of families: ID {family_id} not found in file"
+                        " with genealogy hierarchy"
+                    ),
+                    file=self.file_with_names,
                 )
 
-        print(
-            "OK: All family IDs in file with names of families are formed correctly "
-            "and match IDs in the hierarchy"
-        )
+        if is_ok:
+            print(
+                "OK: All family IDs in file with names of families are formed correctly "
+                "and match IDs in the hierarchy"
+            )
 
 
 if __name__ == "__main__":
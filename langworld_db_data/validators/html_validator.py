@@ -1,32 +1,45 @@
+from pathlib import Path
+
 from tinybear.csv_xls import read_dicts_from_csv
+from tinybear.exceptions import ParsingError
 from tinybear.html import validate_html
 
 from langworld_db_data import ObjectWithPaths
+from langworld_db_data.constants.paths import FILE_WITH_LISTED_VALUES, FILE_WITH_NAMES_OF_FEATURES
 from langworld_db_data.validators.validator import Validator
 
 
 class HTMLValidator(ObjectWithPaths, Validator):
     """Validator for HTML content in feature and listed value descriptions."""
 
+    @classmethod
+    def get_default_input_files(cls) -> tuple[Path, ...]:
+        return FILE_WITH_NAMES_OF_FEATURES, FILE_WITH_LISTED_VALUES
+
     def validate(self) -> None:
         print("Validating HTML descriptions of features")
-        features_data = read_dicts_from_csv(self.input_file_with_features)
-        for row in features_data:
-            # Feature descriptions are often multi-paragraph and contain lists,
-            # so text at root level is not allowed.
-            for locale in ("en", "ru"):
-                validate_html(
-                    row[f"description_formatted_{locale}"], is_text_at_root_level_allowed=False
-                )
+        # Feature descriptions are often multi-paragraph and contain lists,
+        # so text at root level is not allowed.
+        self._validate_descriptions(
+            self.input_file_with_features, is_text_at_root_level_allowed=False
+        )
 
         print("Validating HTML descriptions of listed values")
-        values_data = read_dicts_from_csv(self.input_file_with_listed_values)
-        for row in values_data:
-            # Value descriptions can have text at root level.
+        # Value descriptions can have text at root level.
+        self._validate_descriptions(
+            self.input_file_with_listed_values, is_text_at_root_level_allowed=True
+        )
+
+    def _validate_descriptions(self, file: Path, is_text_at_root_level_allowed: bool) -> None:
+        for i, row in enumerate(read_dicts_from_csv(file), start=2):
             for locale in ("en", "ru"):
-                validate_html(
-                    row[f"description_formatted_{locale}"], is_text_at_root_level_allowed=True
-                )
+                try:
+                    validate_html(
+                        row[f"description_formatted_{locale}"],
+                        is_text_at_root_level_allowed=is_text_at_root_level_allowed,
+                    )
+                except ParsingError as e:
+                    self._fail(e, file=file, row=i)
 
 
 if __name__ == "__main__":
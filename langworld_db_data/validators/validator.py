@@ -1,20 +1,150 @@
+import json
 from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any, Optional, Union
 
 from tinybear.csv_xls import read_column_from_csv
+from tinybear.exceptions import ParsingError
 
 from langworld_db_data.constants.literals import KEY_FOR_ID
+from langworld_db_data.tools.common.change_manifest import Changes
 
 
 class ValidatorError(ValueError):
     pass
 
 
+# Errors that mean a problem in data, as opposed to a bug in code. Apart from
+# `ValidatorError` (which is a `ValueError`), these are raised by checks from `tinybear`
+# and by code reading the data: `IndexError` for malformed rows of CSV files,
+# `KeyError` for missing columns, `ParsingError` for invalid YAML or HTML.
+ERRORS_IN_DATA: tuple[type[Exception], ...] = (ValueError, IndexError, KeyError, ParsingError)
+
+
+@dataclass(frozen=True)
+class ValidationFinding:
+    """One problem found by a validator running in report mode."""
+
+    validator: str
+    error_class: str
+    message: str
+    file: Optional[str] = None
+    row: Optional[int] = None
+    feature_id: Optional[str] = None
+
+
+@dataclass
+class ValidationReport:
+    """Findings accumulated by one or more validators running in report mode."""
+
+    findings: list[ValidationFinding] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.findings)
+
+    def add_error(
+        self,
+        error: Exception,
+        validator: str,
+        file: Optional[Path] = None,
+        row: Optional[int] = None,
+        feature_id: Optional[str] = None,
+    ) -> None:
+        self.findings.append(
+            ValidationFinding(
+                validator=validator,
+                error_class=type(error).__name__,
+                message=str(error),
+                file=str(file) if file is not None else None,
+                row=row,
+                feature_id=feature_id,
+            )
+        )
+
+    def extend(self, findings: list[ValidationFinding]) -> None:
+        self.findings.extend(findings)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "number_of_findings": len(self.findings),
+            "findings": [asdict(finding) for finding in self.findings],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+
+    def write_json(self, path_to_file: Union[Path, str]) -> None:
+        Path(path_to_file).write_text(self.to_json(), encoding="utf-8")
+
+
 class Validator(ABC):
+    report: Optional[ValidationReport] = None
+    """If set, problems that do not prevent further checks are added to the report
+    instead of being raised (see `validate_collecting_findings()`).
+    """
+
     @abstractmethod
     def validate(self) -> None:
         pass
 
+    def validate_collecting_findings(
+        self, report: Optional[ValidationReport] = None, **kwargs: Any
+    ) -> ValidationReport:
+        """Runs `validate()` in report mode: instead of stopping at the first problem,
+        the validator records it and goes on, so that one run surfaces all problems.
+
+        A problem after which the checks cannot go on (one of `ERRORS_IN_DATA`)
+        is still recorded, but ends the run of this validator.
+
+        Keyword arguments are passed to `validate()`.
+        If `report` is given, findings are added to it.
+        """
+        self.report = report if report is not None else ValidationReport()
+
+        try:
+            self.validate(**kwargs)
+        except ERRORS_IN_DATA as e:
+            self.report.add_error(e, validator=type(self).__name__)
+
+        report, self.report = self.report, None
+        return report
+
+    def _fail(
+        self,
+        error: Exception,
+        file: Optional[Path] = None,
+        row: Optional[int] = None,
+        feature_id: Optional[str] = None,
+    ) -> None:
+        """Raises the error or, in report mode, records it so that the checks can go on.
+        The calling code must be ready to go on after this method returns.
+
+        The error is raised as is, so errors of checks from `tinybear`
+        can be passed here too (see `ERRORS_IN_DATA`).
+        """
+        if self.report is None:
+            raise error
+
+        self.report.add_error(
+            error, validator=type(self).__name__, file=file, row=row, feature_id=feature_id
+        )
+
+    @classmethod
+    def get_default_input_files(cls) -> Optional[tuple[Path, ...]]:
+        """Returns files that the validator reads when created with default arguments.
+        `None` means that the inputs are not known and the validator must always run.
+        """
+        return None
+
+    @classmethod
+    def is_affected_by(cls, changes: Changes) -> bool:
+        """Checks whether validator (created with default arguments)
+        has to run again after given changes in data.
+        """
+        input_files = cls.get_default_input_files()
+        return input_files is None or changes.include_any(input_files)
+
     @staticmethod
     def _read_ids(path_to_file: Path) -> list[str]:
         """A helper method for a common operation:
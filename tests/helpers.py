@@ -1,8 +1,15 @@
+import shutil
 from pathlib import Path
+from typing import TypeVar
 
 from tinybear.csv_xls import read_plain_rows_from_csv
 from tinybear.txt import read_non_empty_lines_from_txt_file
 
+from langworld_db_data import ObjectWithPaths
+from langworld_db_data.constants.paths import FILE_WITH_CATEGORIES
+
+ToolWithPaths = TypeVar("ToolWithPaths", bound=ObjectWithPaths)
+
 
 def check_existence_of_output_csv_file_and_compare_with_gold_standard(
     output_file: Path, gold_standard_file: Path, unlink_if_successful: bool = True
@@ -61,3 +68,39 @@ def check_existence_of_output_txt_file_and_compare_with_benchmark(
     if unlink_if_successful:
         print(f"Deleting test output file {output_file.name}")
         output_file.unlink()
+
+
+def make_tool_with_copy_of_data(
+    tool_class: type[ToolWithPaths],
+    dir_: Path,
+    dir_with_feature_profiles: Path,
+    file_with_features: Path,
+    file_with_listed_values: Path,
+    file_with_categories: Path = FILE_WITH_CATEGORIES,
+) -> ToolWithPaths:
+    """Copies feature profiles and inventories into `dir_` and returns
+    a tool that edits the copies in place.
+    """
+    (dir_ / "feature_profiles").mkdir(parents=True)
+    for file in dir_with_feature_profiles.glob("*.csv"):
+        shutil.copy(file, dir_ / "feature_profiles")
+    shutil.copy(file_with_categories, dir_ / "feature_categories.csv")
+    shutil.copy(file_with_features, dir_ / "features.csv")
+    shutil.copy(file_with_listed_values, dir_ / "features_listed_values.csv")
+
+    return tool_class(
+        file_with_categories=dir_ / "feature_categories.csv",
+        input_file_with_features=dir_ / "features.csv",
+        output_file_with_features=dir_ / "features.csv",
+        input_file_with_listed_values=dir_ / "features_listed_values.csv",
+        output_file_with_listed_values=dir_ / "features_listed_values.csv",
+        input_dir_with_feature_profiles=dir_ / "feature_profiles",
+        output_dir_with_feature_profiles=dir_ / "feature_profiles",
+    )
+
+
+def read_all_csv_files(dir_: Path) -> dict[Path, bytes]:
+    """Returns content of all CSV files in the dir and its subdirs
+    (keyed by relative paths), so that whole trees of data can be compared.
+    """
+    return {file.relative_to(dir_): file.read_bytes() for file in sorted(dir_.rglob("*.csv"))}
@@ -0,0 +1,165 @@
+import shutil
+
+import pytest
+from pycldf import Dataset
+
+from langworld_db_data.constants.paths import (
+    FEATURE_PROFILES_DIR,
+    FILE_WITH_DOCULECTS,
+    FILE_WITH_LISTED_VALUES,
+)
+from langworld_db_data.export.cldf_dataset_writer import (
+    COLUMNS_OF_VALUE_TABLE,
+    CLDFDatasetWriter,
+)
+from langworld_db_data.export.cldf_table_checker import CLDFTableCheckerError
+from langworld_db_data.export.value_table_segment_cache import ValueTableSegmentCache
+
+DOCULECTS = ("abaza", "bashkir", "russian")
+
+
+@pytest.fixture(scope="function")
+def dir_with_feature_profiles(tmp_path):
+    dir_ = tmp_path / "feature_profiles"
+    dir_.mkdir()
+    for doculect in DOCULECTS:
+        shutil.copy(FEATURE_PROFILES_DIR / f"{doculect}.csv", dir_)
+    return dir_
+
+
+def test_write_streams_value_table_in_pycldf_format(tmp_path, dir_with_feature_profiles):
+    writer = CLDFDatasetWriter(
+        dir_with_feature_profiles=dir_with_feature_profiles, output_dir=tmp_path / "cldf"
+    )
+    writer.write()
+
+    dataset = Dataset.from_metadata(tmp_path / "cldf" / "StructureDataset-metadata.json")
+    dataset.validate()
+
+    value_table = dataset["ValueTable"]
+    rows = list(writer.iter_value_table_rows())
+    assert value_table.common_props["dc:extent"] == len(rows) == len(list(value_table))
+    assert {row[1] for row in rows} == set(DOCULECTS)
+
+    # pycldf would write exactly the same file
+    value_table.write(
+        [dict(zip(COLUMNS_OF_VALUE_TABLE, row)) for row in rows],
+        fname=tmp_path / "values_written_by_pycldf.csv",
+    )
+    assert (tmp_path / "values_written_by_pycldf.csv").read_bytes() == (
+        tmp_path / "cldf" / "values.csv"
+    ).read_bytes()
+
+
+def test_ids_of_rows_are_unique_and_do_not_depend_on_other_rows(dir_with_feature_profiles):
+    writer = CLDFDatasetWriter(dir_with_feature_profiles=dir_with_feature_profiles)
+    rows_before = list(writer.iter_value_table_rows())
+    ids_before = [row[0] for row in rows_before]
+
+    assert len(set(ids_before)) == len(ids_before)
+    # multiselect value, listed value, custom value
+    assert {"abaza-I-5-1", "abaza-I-5-2", "abaza-A-1-1", "russian-A-20"} <= set(ids_before)
+
+    file = dir_with_feature_profiles / "abaza.csv"
+    lines = file.read_text(encoding="utf-8").splitlines(keepends=True)
+    file.write_text(
+        "".join(line for line in lines if not line.startswith("A-2,")), encoding="utf-8"
+    )
+
+    # only the row of the removed value is gone, all other rows are the same
+    rows_after = list(writer.iter_value_table_rows())
+    assert [row for row in rows_before if row[0] != "abaza-A-2-1"] == rows_after
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_write_throws_exception_for_invalid_reference(
+    tmp_path, dir_with_feature_profiles, use_cache
+):
+    file_with_doculects = tmp_path / FILE_WITH_DOCULECTS.name
+    shutil.copy(FILE_WITH_DOCULECTS, file_with_doculects)
+    cache = ValueTableSegmentCache(tmp_path / "cache") if use_cache else None
+
+    def write():
+        CLDFDatasetWriter(
+            dir_with_feature_profiles=dir_with_feature_profiles,
+            file_with_doculects=file_with_doculects,
+            output_dir=tmp_path / "cldf",
+            cache=cache,
+        ).write()
+
+    write()
+    file_with_values = tmp_path / "cldf" / "values.csv"
+    content_of_file_with_values = file_with_values.read_bytes()
+
+    file = dir_with_feature_profiles / "bashkir.csv"
+    content = file.read_text(encoding="utf-8")
+    file.write_text(content + "Z-1,Несуществующий признак,custom,,Что-то,,,\r\n", encoding="utf-8")
+
+    with pytest.raises(CLDFTableCheckerError, match="'Z-1' in column Parameter_ID"):
+        write()
+    # the file written before is not truncated
+    assert file_with_values.read_bytes() == content_of_file_with_values
+    assert list(file_with_values.parent.glob("*.tmp")) == []
+
+    file.write_text(content, encoding="utf-8")
+    write()
+
+    # doculect removed from the inventory (its segment may be taken from the cache)
+    lines = file_with_doculects.read_text(encoding="utf-8").splitlines(keepends=True)
+    file_with_doculects.write_text(
+        "".join(line for line in lines if not line.startswith("bashkir,")), encoding="utf-8"
+    )
+    with pytest.raises(CLDFTableCheckerError, match="'bashkir' in column Language_ID"):
+        write()
+
+
+def test_incremental_write_gives_same_result_as_full_write_and_only_redoes_changed_profiles(
+    tmp_path, dir_with_feature_profiles, monkeypatch
+):
+    file_with_listed_values = tmp_path / FILE_WITH_LISTED_VALUES.name
+    shutil.copy(FILE_WITH_LISTED_VALUES, file_with_listed_values)
+    cache = ValueTableSegmentCache(tmp_path / "cache")
+
+    original_method = CLDFDatasetWriter._iter_value_table_rows_of_profile
+    processed_doculects = []
+
+    def iter_rows(self, file):
+        processed_doculects.append(file.stem)
+        return original_method(self, file)
+
+    monkeypatch.setattr(CLDFDatasetWriter, "_iter_value_table_rows_of_profile", iter_rows)
+
+    def write_and_compare_with_full_write():
+        """Returns doculects whose rows were made anew in incremental write."""
+        for output_dir, cache_or_none in (("full", None), ("incremental", cache)):
+            processed_doculects.clear()
+            CLDFDatasetWriter(
+                dir_with_feature_profiles=dir_with_feature_profiles,
+                file_with_listed_values=file_with_listed_values,
+                output_dir=tmp_path / output_dir,
+                cache=cache_or_none,
+            ).write()
+        for file in (tmp_path / "full").iterdir():
+            assert (tmp_path / "incremental" / file.name).read_bytes() == file.read_bytes()
+        return processed_doculects
+
+    assert write_and_compare_with_full_write() == list(DOCULECTS)
+    assert write_and_compare_with_full_write() == []
+
+    file = dir_with_feature_profiles / "bashkir.csv"
+    file.write_text(
+        file.read_text(encoding="utf-8") + "A-1,Количество рядов,custom,,Что-то,,\r\n",
+        encoding="utf-8",
+    )
+    assert write_and_compare_with_full_write() == ["bashkir"]
+
+    file.unlink()
+    assert write_and_compare_with_full_write() == []
+    assert sorted(path.stem for path in cache.cache_dir.iterdir()) == ["abaza", "russian"]
+
+    # a change of inventory may change any row
+    file_with_listed_values.write_text(
+        file_with_listed_values.read_text(encoding="utf-8").replace(",Two,", ",Two (2),"),
+        encoding="utf-8",
+    )
+    assert write_and_compare_with_full_write() == ["abaza", "russian"]
@@ -0,0 +1,79 @@
+import pytest
+from pycldf import StructureDataset
+
+from langworld_db_data.export.cldf_table_checker import CLDFTableChecker, CLDFTableCheckerError
+
+LANGUAGES = [
+    {"ID": "abaza", "Name": "Abaza", "Glottocode": ["abaz1241"], "ISO639P3code": ["abq"]},
+    {"ID": "russian", "Name": "Russian", "Glottocode": [""], "ISO639P3code": ["rus"]},
+]
+PARAMETERS = [{"ID": "A-1", "Name": "Number of heights"}]
+CODES = [{"ID": "A-1-1", "Parameter_ID": "A-1", "Name": "Two"}]
+VALUE = {
+    "ID": "abaza-A-1-1",
+    "Language_ID": "abaza",
+    "Parameter_ID": "A-1",
+    "Value": "Two",
+    "Code_ID": "A-1-1",
+    "Comment": "",
+    "Source": "",
+}
+
+
+@pytest.fixture(scope="function")
+def checker(tmp_path):
+    dataset = StructureDataset.in_dir(tmp_path)
+    for component_name in ("CodeTable", "LanguageTable", "ParameterTable"):
+        dataset.add_component(component_name)
+
+    checker = CLDFTableChecker(dataset)
+    checker.check_rows("LanguageTable", LANGUAGES)
+    checker.check_rows("ParameterTable", PARAMETERS)
+    checker.check_rows("CodeTable", CODES)
+    return checker
+
+
+def test_check_rows_passes_valid_rows(checker):
+    checker.check_rows(
+        "ValueTable", [VALUE, {**VALUE, "ID": "russian-A-1", "Language_ID": "russian"}]
+    )
+    checker.check_foreign_key("ValueTable", "Language_ID", "russian")
+
+
+@pytest.mark.parametrize(
+    "value, error_message",
+    [
+        ({"Language_ID": "bashkir"}, "'bashkir' in column Language_ID .+ does not exist"),
+        ({"Parameter_ID": "A-2"}, "'A-2' in column Parameter_ID .+ does not exist"),
+        ({"Code_ID": "A-1-5"}, "'A-1-5' in column Code_ID .+ does not exist"),
+        ({"Parameter_ID": ""}, "no value in required column Parameter_ID"),
+        ({"ID": "abaza A-1-1"}, "does not match format"),
+        ({"Source": ["Smith 1990; 2000"]}, "contains separator"),
+    ],
+)
+def test_check_rows_throws_exception_for_invalid_row(checker, value, error_message):
+    with pytest.raises(CLDFTableCheckerError, match=error_message):
+        checker.check_rows("ValueTable", [{**VALUE, **value}])
+
+
+def test_check_rows_throws_exception_for_duplicate_id(checker):
+    with pytest.raises(CLDFTableCheckerError, match="abaza-A-1-1 is not unique"):
+        checker.check_rows("ValueTable", [VALUE, {**VALUE, "Comment": "Duplicate"}])
+
+
+def test_check_rows_throws_exception_for_invalid_glottocode(checker):
+    with pytest.raises(CLDFTableCheckerError, match="'abaz124' in column Glottocode"):
+        checker.check_rows("LanguageTable", [{"ID": "abaza_2", "Glottocode": ["abaz124"]}])
+
+
+def test_check_foreign_key_throws_exception_for_unknown_language(checker):
+    with pytest.raises(CLDFTableCheckerError, match="does not exist in languages.csv"):
+        checker.check_foreign_key("ValueTable", "Language_ID", "bashkir")
+
+
+def test_check_rows_throws_exception_if_referred_table_was_not_checked(tmp_path):
+    dataset = StructureDataset.in_dir(tmp_path)
+    dataset.add_component("LanguageTable")
+
+    with pytest.raises(CLDFTableCheckerError, match="languages.csv must be checked before"):
+        CLDFTableChecker(dataset).check_rows("ValueTable", [VALUE])
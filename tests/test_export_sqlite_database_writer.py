@@ -0,0 +1,105 @@
+import shutil
+import sqlite3
+
+import pytest
+
+from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR
+from langworld_db_data.export.sqlite_database_writer import (
+    INDEXES,
+    SQLiteDatabaseWriter,
+    SQLiteDatabaseWriterError,
+)
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
+
+DOCULECTS = ("abaza", "bashkir", "russian")
+
+
+@pytest.fixture(scope="function")
+def dir_with_feature_profiles(tmp_path):
+    dir_ = tmp_path / "feature_profiles"
+    dir_.mkdir()
+    for doculect in DOCULECTS:
+        shutil.copy(FEATURE_PROFILES_DIR / f"{doculect}.csv", dir_)
+    return dir_
+
+
+def test_write(tmp_path, dir_with_feature_profiles):
+    output_file = tmp_path / "sqlite" / "test.sqlite"
+    SQLiteDatabaseWriter(
+        dir_with_feature_profiles=dir_with_feature_profiles, output_file=output_file
+    ).write()
+
+    connection = sqlite3.connect(output_file)
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master")}
+    assert {
+        "doculects",
+        "features",
+        "features_listed_values",
+        "encyclopedia_maps",
+        "families",
+        "family_ancestors",
+        "feature_values",
+        *INDEXES,
+    } <= tables
+
+    # one row per atomic value of a multiselect feature
+    assert connection.execute(
+        "SELECT value_id, value_ru FROM feature_values"
+        " WHERE doculect_id = 'abaza' AND feature_id = 'I-5' ORDER BY value_id"
+    ).fetchall() == [("I-5-1", "Прошедшее"), ("I-5-2", "Настоящее"), ("I-5-3", "Будущее")]
+    # all rows of a profile are included (not only listed and custom values)
+    rows = FeatureProfileCorpus(dir_with_feature_profiles).rows("russian")
+    assert connection.execute(
+        "SELECT COUNT(DISTINCT feature_id), COUNT(DISTINCT value_type) FROM feature_values"
+        " WHERE doculect_id = 'russian'"
+    ).fetchone() == (len(rows), len({row["value_type"] for row in rows}))
+
+    assert connection.execute(
+        "SELECT parent_id FROM families WHERE id = 'kipchak'"
+    ).fetchone() == ("turk",)
+
+    query = (
+        "SELECT d.id FROM feature_values AS v"
+        " JOIN doculects AS d ON d.id = v.doculect_id"
+        " JOIN family_ancestors AS a ON a.family_id = d.family_id"
+        " WHERE v.feature_id = 'A-11' AND v.value_id = 'A-11-1' AND a.ancestor_id = 'turk'"
+    )
+    assert connection.execute(query).fetchall() == [("bashkir",)]
+    plan = " ".join(row[-1] for row in connection.execute(f"EXPLAIN QUERY PLAN {query}"))
+    for index_name in (
+        "feature_values_by_feature_and_value",
+        "doculects_by_family",
+        "family_ancestors_by_ancestor",
+    ):
+        assert index_name in plan
+
+    connection.close()
+
+
+def test_write_gives_same_result_with_corpus(tmp_path, dir_with_feature_profiles):
+    writer_reading_files = SQLiteDatabaseWriter(
+        dir_with_feature_profiles=dir_with_feature_profiles, output_file=tmp_path / "1.sqlite"
+    )
+    writer_with_corpus = SQLiteDatabaseWriter(
+        corpus=FeatureProfileCorpus(dir_with_feature_profiles), output_file=tmp_path / "2.sqlite"
+    )
+
+    assert list(writer_reading_files.iter_rows_of_feature_values()) == list(
+        writer_with_corpus.iter_rows_of_feature_values()
+    )
+
+
+def test_write_throws_exception_for_unexpected_columns(tmp_path, dir_with_feature_profiles):
+    file = dir_with_feature_profiles / "russian.csv"
+    file.write_text(
+        file.read_text(encoding="utf-8").replace("page_numbers", "pages", 1), encoding="utf-8"
+    )
+
+    with pytest.raises(SQLiteDatabaseWriterError, match="Unexpected columns in russian.csv"):
+        SQLiteDatabaseWriter(
+            dir_with_feature_profiles=dir_with_feature_profiles,
+            output_file=tmp_path / "test.sqlite",
+        ).write()
+
+    # no incomplete database is left behind
+    assert list(tmp_path.glob("test.*")) == []
@@ -0,0 +1,120 @@
+import os
+from typing import NamedTuple
+
+import pytest
+from tinybear import csv_xls
+
+from langworld_db_data.tools.common import atomic_writer
+from langworld_db_data.tools.common.atomic_writer import (
+    AtomicBatchWriter,
+    serialize_csv,
+    write_csv,
+    write_text_if_changed,
+)
+
+
+class Row(NamedTuple):
+    id: str
+    name: str
+
+
+ROWS_FOR_TYPE = {
+    "dicts": [{"id": "A-1", "name": 'with "quotes"'}, {"id": "A-2", "name": "with, comma\n"}],
+    "lists": [["id", "name"], ["A-1", "Ёлка"]],
+    "named tuples": [Row("A-1", "one"), Row("A-2", "two")],
+}
+
+
+@pytest.mark.parametrize("type_of_rows", ROWS_FOR_TYPE)
+def test_serialize_csv_gives_same_content_as_tinybear(tmp_path, type_of_rows):
+    rows = ROWS_FOR_TYPE[type_of_rows]
+    csv_xls.write_csv(rows, path_to_file=tmp_path / "a.csv", overwrite=True, delimiter=",")
+
+    assert serialize_csv(rows) == (tmp_path / "a.csv").read_bytes()
+
+
+def test_serialize_csv_fails_with_mixed_or_no_rows():
+    with pytest.raises(TypeError, match="different types"):
+        serialize_csv([{"id": "A-1"}, ["A-2"]])
+    with pytest.raises(atomic_writer.AtomicWriterError):
+        serialize_csv([])
+
+
+def test_write_csv_skips_unchanged_file(tmp_path):
+    file = tmp_path / "a.csv"
+    rows = ROWS_FOR_TYPE["dicts"]
+
+    assert write_csv(rows, path_to_file=file)
+    os.utime(file, ns=(0, 0))
+
+    assert not write_csv(rows, path_to_file=file)
+    assert file.stat().st_mtime_ns == 0
+
+    assert write_csv(rows[:1], path_to_file=file)
+    assert file.read_bytes() == serialize_csv(rows[:1])
+    assert not list(tmp_path.glob("*.tmp"))
+
+    with pytest.raises(FileExistsError):
+        write_csv(rows, path_to_file=file, overwrite=False)
+
+
+def test_write_text_if_changed(tmp_path):
+    file = tmp_path / "a.md"
+
+    assert write_text_if_changed("# Заголовок\n", file)
+    assert not write_text_if_changed("# Заголовок\n", file)
+    assert file.read_text(encoding="utf-8") == "# Заголовок\n"
+
+
+def test_batch_writer_writes_only_changed_files(tmp_path):
+    for name in ("same.csv", "changed.csv"):
+        write_csv(ROWS_FOR_TYPE["lists"], path_to_file=tmp_path / name)
+
+    writer = AtomicBatchWriter()
+    writer.add_csv(ROWS_FOR_TYPE["lists"], path_to_file=tmp_path / "same.csv")
+    writer.add_csv(ROWS_FOR_TYPE["dicts"], path_to_file=tmp_path / "changed.csv")
+    writer.add(tmp_path / "new.txt", b"new")
+    assert len(writer) == 3
+
+    assert writer.commit() == [tmp_path / "changed.csv", tmp_path / "new.txt"]
+    assert len(writer) == 0
+    assert (tmp_path / "changed.csv").read_bytes() == serialize_csv(ROWS_FOR_TYPE["dicts"])
+    assert (tmp_path / "new.txt").read_bytes() == b"new"
+
+
+def test_batch_writer_syncs_only_written_files_and_their_directories(tmp_path, monkeypatch):
+    (tmp_path / "same.txt").write_bytes(b"same")
+    synced_file_descriptors = []
+    monkeypatch.setattr(os, "fsync", synced_file_descriptors.append)
+    monkeypatch.delattr(os, "sync", raising=False)  # the whole file system must not be synced
+
+    writer = AtomicBatchWriter()
+    writer.add(tmp_path / "same.txt", b"same")
+    writer.add(tmp_path / "a.txt", b"a")
+    writer.add(tmp_path / "b.txt", b"b")
+    writer.commit()
+
+    # two temporary files and (except on Windows) their directory
+    assert len(synced_file_descriptors) == (3 if os.name == "posix" else 2)
+
+
+def test_batch_writer_touches_nothing_if_writing_fails(tmp_path, monkeypatch):
+    (tmp_path / "a.txt").write_bytes(b"a")
+    original_write_temp_file = atomic_writer._write_temp_file
+
+    def fail_for_second_file(path_to_file, content):
+        if path_to_file.name == "b.txt":
+            raise OSError("disk is full")
+        return original_write_temp_file(path_to_file, content)
+
+    monkeypatch.setattr(atomic_writer, "_write_temp_file", fail_for_second_file)
+
+    writer = AtomicBatchWriter()
+    writer.add(tmp_path / "a.txt", b"changed a")
+    writer.add(tmp_path / "b.txt", b"b")
+
+    with pytest.raises(OSError, match="disk is full"):
+        writer.commit()
+
+    assert [file.name for file in tmp_path.iterdir()] == ["a.txt"]
+    assert (tmp_path / "a.txt").read_bytes() == b"a"
@@ -0,0 +1,114 @@
+import pytest
+
+from langworld_db_data.constants.paths import (
+    FEATURE_PROFILES_DIR,
+    FILE_WITH_DOCULECTS,
+    FILE_WITH_LISTED_VALUES,
+)
+from langworld_db_data.tools.common.change_manifest import EVERYTHING, ChangeManifest, Changes
+from langworld_db_data.validators.asset_validator import AssetValidator
+from langworld_db_data.validators.doculect_inventory_validator import DoculectInventoryValidator
+from langworld_db_data.validators.feature_profile_validator import FeatureProfileValidator
+from langworld_db_data.validators.html_validator import HTMLValidator
+
+
+@pytest.fixture(scope="function")
+def dirs(tmp_path):
+    data_dir = tmp_path / "data"
+    code_dir = tmp_path / "code"
+    for dir_ in (data_dir / "profiles", code_dir):
+        dir_.mkdir(parents=True)
+
+    (data_dir / "profiles" / "a.csv").write_text("a", encoding="utf-8")
+    (data_dir / "profiles" / "b.csv").write_text("b", encoding="utf-8")
+    (data_dir / "inventory.csv").write_text("inventory", encoding="utf-8")
+    (code_dir / "module.py").write_text("print()", encoding="utf-8")
+
+    return data_dir, code_dir
+
+
+@pytest.fixture(scope="function")
+def test_manifest(dirs, tmp_path):
+    data_dir, code_dir = dirs
+    return ChangeManifest(
+        data_dir=data_dir, code_dir=code_dir, path_to_manifest=tmp_path / "manifest.json"
+    )
+
+
+def test_get_changes_returns_everything_without_saved_manifest(test_manifest):
+    assert test_manifest.get_changes() == EVERYTHING
+
+
+def test_get_changes_returns_no_changes_after_save(test_manifest):
+    test_manifest.save()
+    changes = test_manifest.get_changes()
+    assert not changes
+    assert not changes.include(test_manifest.data_dir / "inventory.csv")
+
+
+def test_get_changes_detects_modified_added_and_removed_files(test_manifest):
+    data_dir = test_manifest.data_dir
+    test_manifest.save()
+
+    (data_dir / "profiles" / "a.csv").write_text("changed", encoding="utf-8")
+    (data_dir / "profiles" / "b.csv").unlink()
+    (data_dir / "profiles" / "c.csv").write_text("c", encoding="utf-8")
+
+    changes = test_manifest.get_changes()
+
+    assert changes.modified == {data_dir / "profiles" / "a.csv"}
+    assert changes.removed == {data_dir / "profiles" / "b.csv"}
+    assert changes.added == {data_dir / "profiles" / "c.csv"}
+    assert changes.include_added_or_removed_in(data_dir / "profiles")
+    assert not changes.include_added_or_removed_in(data_dir)
+    assert not changes.include(data_dir / "inventory.csv")
+
+
+def test_get_changes_returns_everything_if_code_has_changed(test_manifest):
+    test_manifest.save()
+    (test_manifest.code_dir / "module.py").write_text("print('changed')", encoding="utf-8")
+    assert test_manifest.get_changes() == EVERYTHING
+
+
+def test_get_changes_returns_everything_for_corrupted_manifest(test_manifest):
+    test_manifest.path_to_manifest.write_text("{", encoding="utf-8")
+    assert test_manifest.get_changes() == EVERYTHING
+
+
+def test_validators_are_affected_by_changes_in_their_inputs():
+    changes = Changes(modified=frozenset({FILE_WITH_LISTED_VALUES.resolve()}))
+
+    assert HTMLValidator.is_affected_by(changes)
+    assert FeatureProfileValidator.is_affected_by(changes)
+    assert not AssetValidator.is_affected_by(changes)
+    assert not DoculectInventoryValidator.is_affected_by(changes)
+
+    assert AssetValidator.is_affected_by(
+        Changes(modified=frozenset({FILE_WITH_DOCULECTS.resolve()}))
+    )
+
+
+def test_doculect_inventory_validator_is_only_affected_by_added_or_removed_profiles():
+    path_to_profile = (FEATURE_PROFILES_DIR / "abaza.csv").resolve()
+
+    assert not DoculectInventoryValidator.is_affected_by(
+        Changes(modified=frozenset({path_to_profile}))
+    )
+    assert DoculectInventoryValidator.is_affected_by(Changes(added=frozenset({path_to_profile})))
+    assert FeatureProfileValidator.is_affected_by(Changes(modified=frozenset({path_to_profile})))
+
+
+def test_get_changes_ignores_journal_of_edits(dirs, tmp_path):
+    data_dir, code_dir = dirs
+    manifest = ChangeManifest(
+        data_dir=data_dir,
+        code_dir=code_dir,
+        path_to_manifest=tmp_path / "manifest.json",
+        journal_dir=data_dir / ".journal",
+    )
+    manifest.save()
+
+    (data_dir / ".journal").mkdir()
+    (data_dir / ".journal" / "journal.jsonl").write_text("{}", encoding="utf-8")
+
+    assert not manifest.get_changes()
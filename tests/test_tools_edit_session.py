@@ -0,0 +1,247 @@
+import os
+import shutil
+from collections import Counter
+
+import pytest
+from tinybear import csv_xls
+
+from langworld_db_data.constants.paths import (
+    FEATURE_PROFILES_DIR,
+    FILE_WITH_CATEGORIES,
+    FILE_WITH_LISTED_VALUES,
+    FILE_WITH_NAMES_OF_FEATURES,
+)
+from langworld_db_data.tools.common import atomic_writer
+from langworld_db_data.tools.common.edit_session import (
+    EditSession,
+    EditSessionError,
+    get_active_session,
+    read_dicts_from_csv,
+    write_csv,
+)
+from langworld_db_data.tools.features import FeatureAdder, FeatureRemover
+from langworld_db_data.tools.listed_values import (
+    ListedValueAdder,
+    ListedValueMover,
+    ListedValueRenamer,
+)
+
+DOCULECTS = ("abaza", "abkhaz", "adyghe")
+
+
+def _make_copy_of_data(dir_):
+    for file in (FILE_WITH_CATEGORIES, FILE_WITH_LISTED_VALUES, FILE_WITH_NAMES_OF_FEATURES):
+        (dir_ / "inventories").mkdir(parents=True, exist_ok=True)
+        shutil.copy(file, dir_ / "inventories" / file.name)
+    (dir_ / "feature_profiles").mkdir()
+    for doculect in DOCULECTS:
+        shutil.copy(FEATURE_PROFILES_DIR / f"{doculect}.csv", dir_ / "feature_profiles")
+    return dir_
+
+
+def _get_kwargs_for_tool(dir_):
+    inventories, profiles = dir_ / "inventories", dir_ / "feature_profiles"
+    return {
+        "file_with_categories": inventories / FILE_WITH_CATEGORIES.name,
+        "input_file_with_features": inventories / FILE_WITH_NAMES_OF_FEATURES.name,
+        "output_file_with_features": inventories / FILE_WITH_NAMES_OF_FEATURES.name,
+        "input_file_with_listed_values": inventories / FILE_WITH_LISTED_VALUES.name,
+        "output_file_with_listed_values": inventories / FILE_WITH_LISTED_VALUES.name,
+        "input_dir_with_feature_profiles": profiles,
+        "output_dir_with_feature_profiles": profiles,
+    }
+
+
+def _make_session(dir_):
+    return EditSession(
+        file_with_features=dir_ / "inventories" / FILE_WITH_NAMES_OF_FEATURES.name,
+        file_with_listed_values=dir_ / "inventories" / FILE_WITH_LISTED_VALUES.name,
+    )
+
+
+def _edit(dir_):
+    kwargs = _get_kwargs_for_tool(dir_)
+
+    ListedValueAdder(**kwargs).add_listed_value(
+        feature_id="A-1", new_value_en="One", new_value_ru="Один", index_to_assign=1
+    )
+    ListedValueRenamer(
+        input_feature_profiles_dir=dir_ / "feature_profiles",
+        output_feature_profiles_dir=dir_ / "feature_profiles",
+        input_inventories_dir=dir_ / "inventories",
+        output_inventories_dir=dir_ / "inventories",
+    ).rename_value_in_profiles_and_inventories(
+        id_of_value_to_rename="A-1-2", new_value_name="Два (только)"
+    )
+    ListedValueMover(**kwargs).move_listed_value(initial_value_id="A-1-2", index_to_assign=4)
+    FeatureRemover(**kwargs).remove_feature(feature_id="A-2")
+    FeatureAdder(**kwargs).add_feature(
+        category_id="A",
+        feature_en="New feature",
+        feature_ru="Новый признак",
+        listed_values_to_add=[{"en": "Yes", "ru": "Да"}, {"en": "No", "ru": "Нет"}],
+        index_to_assign=2,
+    )
+
+
+def _read_all_files(dir_):
+    return {file.relative_to(dir_): file.read_bytes() for file in sorted(dir_.rglob("*.csv"))}
+
+
+def test_session_gives_same_result_as_separate_edits_and_writes_each_file_once(
+    tmp_path, monkeypatch
+):
+    dir_without_session = _make_copy_of_data(tmp_path / "without_session")
+    _edit(dir_without_session)
+
+    dir_with_session = _make_copy_of_data(tmp_path / "with_session")
+    original_read, original_write = csv_xls.read_dicts_from_csv, atomic_writer._write_temp_file
+    number_of_reads: Counter = Counter()
+    number_of_writes: Counter = Counter()
+
+    def read(path_to_file, **kwargs):
+        number_of_reads[path_to_file.name] += 1
+        return original_read(path_to_file, **kwargs)
+
+    def write(path_to_file, content):
+        number_of_writes[path_to_file.name] += 1
+        return original_write(path_to_file, content)
+
+    monkeypatch.setattr(csv_xls, "read_dicts_from_csv", read)
+    monkeypatch.setattr(atomic_writer, "_write_temp_file", write)
+
+    with _make_session(dir_with_session) as session:
+        _edit(dir_with_session)
+        # nothing is written until the session is committed
+        assert not number_of_writes
+        assert len(session.changed_files) == 2 + len(DOCULECTS)
+
+    assert _read_all_files(dir_with_session) == _read_all_files(dir_without_session)
+    assert set(number_of_reads.values()) == {1}
+    assert set(number_of_writes.values()) == {1}
+    assert number_of_writes.keys() == {
+        FILE_WITH_NAMES_OF_FEATURES.name,
+        FILE_WITH_LISTED_VALUES.name,
+        *(f"{doculect}.csv" for doculect in DOCULECTS),
+    }
+    assert get_active_session() is None
+
+
+def test_session_writes_nothing_if_edit_fails(tmp_path):
+    dir_ = _make_copy_of_data(tmp_path)
+    content_before = _read_all_files(dir_)
+
+    with pytest.raises(ValueError, match="something went wrong"):
+        with _make_session(dir_):
+            _edit(dir_)
+            raise ValueError("something went wrong")
+
+    assert _read_all_files(dir_) == content_before
+    assert get_active_session() is None
+
+
+def test_session_writes_nothing_if_changes_are_inconsistent(tmp_path):
+    dir_ = _make_copy_of_data(tmp_path)
+    content_before = _read_all_files(dir_)
+    file = dir_ / "feature_profiles" / "abaza.csv"
+
+    with pytest.raises(EditSessionError) as e:
+        with _make_session(dir_):
+            ListedValueAdder(**_get_kwargs_for_tool(dir_)).add_listed_value(
+                feature_id="A-1", new_value_en="One", new_value_ru="Один"
+            )
+            rows = read_dicts_from_csv(file)
+            rows[0]["value_id"] = "A-1-999"
+            rows[1]["value_id"] = "A-1-1"
+            rows[2]["feature_id"] = "Z-999"
+            write_csv(rows, path_to_file=file, overwrite=True, delimiter=",")
+
+    assert "abaza.csv, row 2: unknown value ID A-1-999" in str(e.value)
+    assert "abaza.csv, row 3: value ID A-1-1 does not belong to feature A-2" in str(e.value)
+    assert "abaza.csv, row 4: unknown feature ID Z-999" in str(e.value)
+    assert _read_all_files(dir_) == content_before
+
+
+@pytest.mark.parametrize("function_to_break", ["_write_temp_file", "replace"])
+def test_session_leaves_files_intact_if_writing_fails(tmp_path, monkeypatch, function_to_break):
+    dir_ = _make_copy_of_data(tmp_path)
+    content_before = _read_all_files(dir_)
+    module = atomic_writer if function_to_break == "_write_temp_file" else os
+    original_function = getattr(module, function_to_break)
+
+    # inventories are written before feature profiles
+    def fail_for_feature_profiles(*args):
+        if "feature_profiles" in str(args[0]):
+            raise OSError("disk is full")
+        return original_function(*args)
+
+    monkeypatch.setattr(module, function_to_break, fail_for_feature_profiles)
+
+    with pytest.raises(OSError, match="disk is full"):
+        with _make_session(dir_):
+            _edit(dir_)
+
+    assert _read_all_files(dir_) == content_before
+    assert not list(dir_.rglob("*.tmp"))
+
+
+def test_sessions_cannot_be_nested(tmp_path):
+    with EditSession():
+        with pytest.raises(EditSessionError, match="cannot be nested"):
+            with EditSession():
+                pass
+
+
+def test_dry_run_writes_nothing_and_reports_changes(tmp_path, capsys):
+    dir_ = _make_copy_of_data(tmp_path)
+    content_before = _read_all_files(dir_)
+
+    with EditSession(
+        file_with_features=dir_ / "inventories" / FILE_WITH_NAMES_OF_FEATURES.name,
+        file_with_listed_values=dir_ / "inventories" / FILE_WITH_LISTED_VALUES.name,
+        dry_run=True,
+    ) as session:
+        ListedValueAdder(**_get_kwargs_for_tool(dir_)).add_listed_value(
+            feature_id="A-1", new_value_en="One", new_value_ru="Один", index_to_assign=1
+        )
+
+    assert _read_all_files(dir_) == content_before
+    # value IDs are incremented in profiles as well
+    assert [change.path.name for change in session.changes] == [
+        FILE_WITH_LISTED_VALUES.name,
+        *(f"{doculect}.csv" for doculect in DOCULECTS),
+    ]
+
+    change = session.changes[0]
+    path_to_listed_values = dir_ / "inventories" / FILE_WITH_LISTED_VALUES.name
+    assert change.old_content == content_before[path_to_listed_values.relative_to(dir_)]
+    # one row is added, IDs of all other values of A-1 are incremented
+    number_of_values_of_a_1 = change.old_content.decode("utf-8").count(",A-1,")
+    assert change.summary == (
+        f"{FILE_WITH_LISTED_VALUES.name}: "
+        f"+{number_of_values_of_a_1 + 1} -{number_of_values_of_a_1} lines"
+    )
+    assert change.summary in capsys.readouterr().out
+
+    diff = session.get_diff(context=0)
+    assert diff.startswith(
+        f"--- a/{FILE_WITH_LISTED_VALUES.name}\n+++ b/{FILE_WITH_LISTED_VALUES.name}\n"
+    )
+    assert "+A-1-1,A-1,One,Один,," in diff
+
+
+def test_get_changes_lists_only_files_with_changed_content(tmp_path):
+    dir_ = _make_copy_of_data(tmp_path)
+    file = dir_ / "feature_profiles" / f"{DOCULECTS[0]}.csv"
+
+    with _make_session(dir_) as session:
+        rows = read_dicts_from_csv(file)
+        write_csv(rows, path_to_file=file, overwrite=True, delimiter=",")
+        assert session.changed_files == [file.resolve()]
+        assert session.get_changes() == []
+
+        rows[0]["comment_en"] = "New comment"
+        write_csv(rows, path_to_file=file, overwrite=True, delimiter=",")
+        assert [change.path for change in session.get_changes()] == [file.resolve()]
+        assert session.get_changes()[0].summary == f"{file.name}: +1 -1 lines"
+        session.rollback()
@@ -0,0 +1,91 @@
+import pytest
+from tinybear.csv_xls import read_dicts_from_csv
+
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
+from langworld_db_data.tools.featureprofiles.feature_profile_reader import FeatureProfileReader
+from langworld_db_data.validators.feature_profile_validator import FeatureProfileValidator
+from tests.paths import DIR_WITH_TEST_FEATURE_PROFILES, DIR_WITH_VALIDATORS_TEST_FILES
+
+
+@pytest.fixture(scope="function")
+def test_corpus():
+    return FeatureProfileCorpus(DIR_WITH_TEST_FEATURE_PROFILES)
+
+
+def test__init(test_corpus):
+    files = sorted(list(DIR_WITH_TEST_FEATURE_PROFILES.glob("*.csv")))
+    assert test_corpus.files == files
+    assert test_corpus.doculect_ids == [f.stem for f in files]
+    assert len(test_corpus) == len(files)
+    assert "corsican" in test_corpus
+    assert "A-1" in test_corpus.feature_ids
+
+    # each value type is only stored once
+    assert len(test_corpus.value_types) == len(set(test_corpus.value_types))
+    assert len(test_corpus.value_type_codes) == len(files) * len(test_corpus.feature_ids)
+
+
+def test_rows_and_profile_match_data_read_from_file(test_corpus):
+    for file in test_corpus.files:
+        assert test_corpus.rows(file.stem) == read_dicts_from_csv(file)
+        assert test_corpus.profile(
+            file.stem
+        ) == FeatureProfileReader.read_feature_profile_as_dict_from_file(file)
+
+
+def test_repeating_values_in_rows_are_interned(test_corpus):
+    corsican_row, catalan_row = (test_corpus.rows(d)[0] for d in ("corsican", "catalan"))
+    for key in ("feature_id", "feature_name_ru", "value_type"):
+        assert corsican_row[key] is catalan_row[key]
+
+
+def test_value_type_and_value_id(test_corpus):
+    assert test_corpus.value_type("corsican", "A-1") == "listed"
+    assert test_corpus.value_id("corsican", "A-1") == "A-1-2"
+    assert test_corpus.value_id("corsican", "A-3") == "A-3-4"
+
+
+def test_value_type_fails_with_unknown_feature(test_corpus):
+    with pytest.raises(KeyError, match="X-99 not found"):
+        test_corpus.value_type("corsican", "X-99")
+
+
+def test_update_profile(test_corpus):
+    profile = test_corpus.profile("corsican")
+    profile["A-1"].value_type = "not_stated"
+    profile["A-1"].value_id = ""
+    profile["A-1"].value_ru = ""
+
+    test_corpus.update_profile("corsican", profile)
+
+    assert test_corpus.value_type("corsican", "A-1") == "not_stated"
+    assert test_corpus.value_id("corsican", "A-1") == ""
+    assert test_corpus.profile("corsican") == profile
+    # other profiles are not affected
+    assert test_corpus.value_type("catalan", "A-1") == "listed"
+
+
+def test_update_profile_fails_with_unknown_doculect(test_corpus):
+    with pytest.raises(KeyError, match="not part of the corpus"):
+        test_corpus.update_profile("klingon", {})
+
+
+def test_contains_file(test_corpus):
+    assert test_corpus.contains_file(DIR_WITH_TEST_FEATURE_PROFILES / "corsican.csv")
+    assert not test_corpus.contains_file(
+        DIR_WITH_TEST_FEATURE_PROFILES / "must_fail" / "corsican_invalid_value_type.csv"
+    )
+
+
+def test_validator_accepts_corpus(test_corpus):
+    validator = FeatureProfileValidator(
+        file_with_features=DIR_WITH_VALIDATORS_TEST_FILES / "features_OK.csv",
+        file_with_listed_values=DIR_WITH_VALIDATORS_TEST_FILES / "features_listed_values_OK.csv",
+        corpus=test_corpus,
+    )
+    assert validator.feature_profiles == test_corpus.files
+    validator.validate_one_file(DIR_WITH_TEST_FEATURE_PROFILES / "corsican.csv")
+
+
+def test_validate_real_data_with_corpus():
+    FeatureProfileValidator(corpus=FeatureProfileCorpus()).validate()
@@ -0,0 +1,129 @@
+import shutil
+
+import pytest
+from tinybear import csv_xls
+
+from langworld_db_data.constants.paths import FEATURE_PROFILES_DIR, FILE_WITH_LISTED_VALUES
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
+from langworld_db_data.tools.featureprofiles.feature_profile_index import FeatureProfileIndex
+from langworld_db_data.tools.featureprofiles.parsed_profile_cache import ParsedProfileCache
+from langworld_db_data.tools.listed_values import ListedValueRenamer
+
+HEADER = "feature_id,feature_name_ru,value_type,value_id,value_ru,comment_ru,comment_en\n"
+
+
+@pytest.fixture(scope="function")
+def dir_with_profiles(tmp_path):
+    for doculect_id, content in {
+        "one": "A-1,,listed,A-1-1,,,\nA-2,,listed,A-2-1&A-2-3,,,\n",
+        "two": "A-1,,listed,A-1-2,,,\nA-2,,custom,,что-то,,\n",
+        "three": "A-1,,listed,A-1-1,,,\nA-2,,not_stated,,,,\n",
+    }.items():
+        (tmp_path / f"{doculect_id}.csv").write_text(HEADER + content, encoding="utf-8")
+    return tmp_path
+
+
+def test_doculects_with_value(dir_with_profiles):
+    index = FeatureProfileIndex(dir_with_profiles)
+
+    assert index.doculects_with_value("A-1-1") == ["one", "three"]
+    assert index.doculects_with_value("A-1-2") == ["two"]
+    # atomic parts of compound values are indexed
+    assert index.doculects_with_value("A-2-3") == ["one"]
+    assert index.doculects_with_value("A-2-1&A-2-3") == []
+    assert index.doculects_with_value("A-2-2") == []
+    assert index.files_with_value("A-1-2") == [dir_with_profiles / "two.csv"]
+
+
+def test_doculects_with_feature(dir_with_profiles):
+    index = FeatureProfileIndex(dir_with_profiles)
+
+    assert index.doculects_with_feature("A-2") == ["one", "three", "two"]
+    assert index.doculects_with_feature("A-2", "listed") == ["one"]
+    assert index.doculects_with_feature("A-2", "custom") == ["two"]
+    assert index.doculects_with_feature("A-3") == []
+    assert index.files_with_feature("A-2", "custom") == [dir_with_profiles / "two.csv"]
+
+
+def test_index_built_from_corpus_or_cache_does_not_parse_profiles(
+    tmp_path, dir_with_profiles, monkeypatch
+):
+    index_from_files = FeatureProfileIndex(dir_with_profiles)
+    corpus = FeatureProfileCorpus(dir_with_profiles)
+    cache = ParsedProfileCache(cache_dir=tmp_path / "cache")
+    FeatureProfileIndex(dir_with_profiles, cache=cache)  # fills the cache
+
+    def fail(*args, **kwargs):
+        raise AssertionError("profiles must not be parsed")
+
+    monkeypatch.setattr(
+        "langworld_db_data.tools.featureprofiles.parsed_profile_cache.read_content_and_stat",
+        fail,
+    )
+
+    for index in (
+        FeatureProfileIndex(corpus=corpus),
+        FeatureProfileIndex(dir_with_profiles, cache=cache),
+    ):
+        assert index.dir_with_feature_profiles == dir_with_profiles
+        for value_id in ("A-1-1", "A-1-2", "A-2-3"):
+            assert index.doculects_with_value(value_id) == index_from_files.doculects_with_value(
+                value_id
+            )
+        assert index.files_with_feature("A-2", "custom") == [dir_with_profiles / "two.csv"]
+
+
+def test_update_and_remove(dir_with_profiles):
+    index = FeatureProfileIndex(dir_with_profiles)
+
+    index.update(
+        doculect_id="two",
+        rows=[{"feature_id": "A-1", "value_type": "listed", "value_id": "A-1-1&A-1-3"}],
+    )
+
+    assert index.doculects_with_value("A-1-1") == ["one", "three", "two"]
+    assert index.doculects_with_value("A-1-2") == []
+    assert index.doculects_with_feature("A-2", "custom") == []
+
+    index.remove("one")
+    index.remove("no such doculect")
+
+    assert index.doculects_with_value("A-1-1") == ["three", "two"]
+    assert index.doculects_with_value("A-2-3") == []
+
+
+def test_shared_index_makes_tool_open_only_affected_profiles(tmp_path, monkeypatch):
+    (tmp_path / "inventories").mkdir()
+    shutil.copy(FILE_WITH_LISTED_VALUES, tmp_path / "inventories")
+    (tmp_path / "feature_profiles").mkdir()
+    for doculect_id in ("abaza", "abkhaz", "adyghe"):
+        shutil.copy(FEATURE_PROFILES_DIR / f"{doculect_id}.csv", tmp_path / "feature_profiles")
+
+    index = FeatureProfileIndex(tmp_path / "feature_profiles")
+
+    files_read = []
+    original_read = csv_xls.read_dicts_from_csv
+
+    def read(path_to_file, **kwargs):
+        files_read.append(path_to_file.name)
+        return original_read(path_to_file, **kwargs)
+
+    monkeypatch.setattr(csv_xls, "read_dicts_from_csv", read)
+
+    renamer = ListedValueRenamer(
+        input_feature_profiles_dir=tmp_path / "feature_profiles",
+        output_feature_profiles_dir=tmp_path / "feature_profiles",
+        input_inventories_dir=tmp_path / "inventories",
+        output_inventories_dir=tmp_path / "inventories",
+        feature_profile_index=index,
+    )
+    # A-1-2 is only found in Adyghe
+    renamer.rename_value_in_profiles_and_inventories(
+        id_of_value_to_rename="A-1-2", new_value_name="Три подъема"
+    )
+
+    assert files_read == [FILE_WITH_LISTED_VALUES.name, "adyghe.csv"]
+    assert index.doculects_with_value("A-1-2") == ["adyghe"]
+    assert "Три подъема" in (tmp_path / "feature_profiles" / "adyghe.csv").read_text(
+        encoding="utf-8"
+    )
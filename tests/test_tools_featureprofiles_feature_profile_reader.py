@@ -60,6 +60,26 @@ def test_read_feature_profile_as_dict_from_file(test_reader):
     assert dict_ == benchmark_dict
 
 
+def test_read_feature_profile_as_dict_from_file_returns_compact_objects(test_reader):
+    dict_ = test_reader.read_feature_profile_as_dict_from_file(
+        DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES / "catalan_short.csv"
+    )
+    other_dict = test_reader.read_feature_profile_as_dict_from_file(
+        DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES / "catalan.csv"
+    )
+
+    assert not hasattr(dict_["A-1"], "__dict__")
+    # repeating strings are stored once
+    assert dict_["A-1"].feature_name_ru is other_dict["A-1"].feature_name_ru
+    assert dict_["A-1"].value_type is other_dict["A-1"].value_type
+
+    # the objects are still mutable
+    dict_["A-1"].value_type = "not_stated"
+    assert dict_["A-1"].value_type == "not_stated"
+    with pytest.raises(AttributeError):
+        dict_["A-1"].foo = "bar"  # type: ignore
+
+
 def test_read_feature_profile_as_dict_from_file_fails_with_bad_file(test_reader):
     with pytest.raises(ValueError, match="does not contain feature ID in row 4"):
         test_reader.read_feature_profile_as_dict_from_file(
@@ -110,3 +130,49 @@ def test_read_value_for_doculect_and_feature_fails_with_wrong_feature_id(test_re
         test_reader.read_value_for_doculect_and_feature(
             "catalan", "X-99", DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES
         )
+
+
+def test_iterate_feature_profile(test_reader):
+    file = DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES / "catalan.csv"
+
+    rows = test_reader.iterate_feature_profile(file)
+
+    assert next(rows) == ("A-1", benchmark_dict["A-1"])
+    assert dict(rows) == {
+        key: value
+        for key, value in test_reader.read_feature_profile_as_dict_from_file(file).items()
+        if key != "A-1"
+    }
+
+
+def test_iterate_feature_profile_fails_at_bad_row(test_reader):
+    rows = test_reader.iterate_feature_profile(
+        DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES / "corsican_bad_no_feature_ID.csv"
+    )
+
+    # rows before the bad one are yielded
+    assert next(rows)[0] == "A-1"
+    with pytest.raises(ValueError, match="does not contain feature ID in row 4"):
+        list(rows)
+
+
+@pytest.mark.parametrize(
+    "file_name, feature_id",
+    [
+        ("catalan_short.csv", "A-2"),
+        # reading stops before the bad row
+        ("corsican_bad_no_feature_ID.csv", "A-1"),
+    ],
+)
+def test_read_value_for_feature_from_file(test_reader, file_name, feature_id):
+    value = test_reader.read_value_for_feature_from_file(
+        DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES / file_name, feature_id
+    )
+    assert value.feature_name_ru == benchmark_dict[feature_id].feature_name_ru
+
+
+def test_read_value_for_feature_from_file_fails_with_wrong_feature_id(test_reader):
+    with pytest.raises(KeyError, match="X-99 not found in file catalan.csv"):
+        test_reader.read_value_for_feature_from_file(
+            DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES / "catalan.csv", "X-99"
+        )
@@ -0,0 +1,152 @@
+import os
+import shutil
+
+import pytest
+from tinybear.csv_xls import read_dicts_from_csv
+
+from langworld_db_data.tools.featureprofiles.feature_profile_corpus import FeatureProfileCorpus
+from langworld_db_data.tools.featureprofiles.feature_profile_reader import FeatureProfileReader
+from langworld_db_data.tools.featureprofiles import parsed_profile_cache
+from langworld_db_data.tools.featureprofiles.parsed_profile_cache import (
+    ParsedProfileCache,
+    read_content_and_stat,
+)
+from tests.paths import DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES, DIR_WITH_TEST_FEATURE_PROFILES
+
+
+@pytest.fixture(scope="function")
+def test_cache(tmp_path):
+    return ParsedProfileCache(cache_dir=tmp_path / "cache")
+
+
+@pytest.fixture(scope="function")
+def profile(tmp_path):
+    path = tmp_path / "catalan.csv"
+    shutil.copy(DIR_WITH_FEATURE_PROFILE_TOOLS_TEST_FILES / "catalan.csv", path)
+    return path
+
+
+def test_get_returns_none_for_file_not_in_cache(test_cache, profile):
+    assert test_cache.get(profile) is None
+
+
+def test_put_and_get(test_cache, profile):
+    rows = read_dicts_from_csv(profile)
+    test_cache.put(profile, rows)
+    assert test_cache.get(profile) == rows
+
+
+def test_put_with_content_does_not_read_file_again(test_cache, profile, monkeypatch):
+    content, stat = read_content_and_stat(profile)
+    rows = read_dicts_from_csv(profile)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("file must not be read again")
+
+    monkeypatch.setattr(parsed_profile_cache, "read_content_and_stat", fail)
+    test_cache.put(profile, rows, content=content, stat=stat)
+    monkeypatch.undo()
+
+    assert test_cache.get(profile) == rows
+
+
+def test_put_throws_exception_for_content_without_stat(test_cache, profile):
+    with pytest.raises(ValueError, match="must be given together"):
+        test_cache.put(profile, read_dicts_from_csv(profile), content=profile.read_bytes())
+
+
+def test_put_does_not_store_entry_that_matches_file_changed_after_reading(test_cache, profile):
+    content, stat = read_content_and_stat(profile)
+    rows = read_dicts_from_csv(profile)
+
+    # the file is changed after it was read, its size stays the same
+    profile.write_bytes(content.replace("Три".encode(), "Два".encode()))
+    os.utime(profile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    test_cache.put(profile, rows, content=content, stat=stat)
+
+    assert test_cache.get(profile) is None
+
+
+def test_read_rows_of_profile_throws_exception_for_malformed_profile_and_caches_nothing(
+    test_cache, profile
+):
+    profile.write_text(
+        profile.read_text(encoding="utf-8") + "A-99,Что-то,listed\n", encoding="utf-8"
+    )
+
+    for _ in range(2):
+        with pytest.raises(IndexError, match="abnormal number of columns"):
+            FeatureProfileReader.read_feature_profile_as_dict_from_file(profile, cache=test_cache)
+
+    assert not list(test_cache.cache_dir.glob("*.pickle"))
+
+
+def test_get_returns_none_after_file_is_changed(test_cache, profile):
+    test_cache.put(profile, read_dicts_from_csv(profile))
+
+    profile.write_text(
+        profile.read_text(encoding="utf-8").replace("Три", "Четыре"), encoding="utf-8"
+    )
+
+    assert test_cache.get(profile) is None
+
+
+def test_get_uses_content_hash_if_only_modification_time_has_changed(test_cache, profile):
+    rows = read_dicts_from_csv(profile)
+    test_cache.put(profile, rows)
+
+    stat = profile.stat()
+    os.utime(profile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert test_cache.get(profile) == rows
+
+
+def test_get_returns_none_for_corrupted_entry(test_cache, profile):
+    test_cache.put(profile, read_dicts_from_csv(profile))
+    for path_to_entry in test_cache.cache_dir.glob("*.pickle"):
+        path_to_entry.write_bytes(b"garbage")
+
+    assert test_cache.get(profile) is None
+
+
+def test_clear(test_cache, profile):
+    test_cache.put(profile, read_dicts_from_csv(profile))
+    test_cache.clear()
+    assert test_cache.get(profile) is None
+
+
+def test_reader_with_cache(test_cache, profile):
+    profile_without_cache = FeatureProfileReader.read_feature_profile_as_dict_from_file(profile)
+
+    for _ in range(2):  # cold and warm run
+        assert (
+            FeatureProfileReader.read_feature_profile_as_dict_from_file(profile, cache=test_cache)
+            == profile_without_cache
+        )
+
+
+def test_corpus_with_cache(test_cache):
+    corpus_without_cache = FeatureProfileCorpus(DIR_WITH_TEST_FEATURE_PROFILES)
+
+    for _ in range(2):  # cold and warm run
+        corpus = FeatureProfileCorpus(DIR_WITH_TEST_FEATURE_PROFILES, cache=test_cache)
+        for doculect_id in corpus_without_cache.doculect_ids:
+            assert corpus.rows(doculect_id) == corpus_without_cache.rows(doculect_id)
+
+    assert len(list(test_cache.cache_dir.glob("*.pickle"))) == len(corpus_without_cache)
+
+
+def test_corpus_reads_each_profile_once_on_cold_run(test_cache, monkeypatch):
+    read_files = []
+
+    def read_content_and_stat_and_remember_file(file):
+        read_files.append(file)
+        return read_content_and_stat(file)
+
+    monkeypatch.setattr(
+        parsed_profile_cache, "read_content_and_stat", read_content_and_stat_and_remember_file
+    )
+    corpus = FeatureProfileCorpus(DIR_WITH_TEST_FEATURE_PROFILES, cache=test_cache)
+
+    assert sorted(read_files) == sorted(corpus.files)
@@ -1,5 +1,6 @@
 import pytest
 
+from langworld_db_data.tools.common.ids import remap_ids_in_inventory_of_features
 from langworld_db_data.tools.features.feature_adder import FeatureAdder, FeatureAdderError
 from tests.helpers import check_existence_of_output_csv_file_and_compare_with_gold_standard
 from tests.paths import (
@@ -230,36 +231,28 @@ def test__add_feature_to_inventory_of_features_at_the_end_of_category_with_given
     )
 
 
-def test__increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
+def test__get_mapping_for_insertion_of_feature(
     test_feature_adder,
 ):
     rows = [
-        {"id": "A-1", "en": "Some feature", "ru": "Некий признак"},
-        {"id": "A-2", "en": "Old feature", "ru": "Старый признак"},
-        {"id": "A-3", "en": "Another feature", "ru": "Другой признак"},
-        {"id": "B-1", "en": "Yet another one", "ru": "И еще один"},
+        {"id": "A-1", "en": "Some feature", "ru": "Некий признак", "not_applicable_if": ""},
+        {"id": "A-2", "en": "Old feature", "ru": "Старый признак", "not_applicable_if": ""},
+        {"id": "A-3", "en": "Another feature", "ru": "Другой признак", "not_applicable_if": ""},
+        {"id": "B-1", "en": "Yet another one", "ru": "И еще один", "not_applicable_if": "A-2-1"},
     ]
-    feature_indices_to_inventory_line_numbers = (
-        {"index": 1, "line number": 0},
-        {"index": 2, "line number": 1},
-        {"index": 3, "line number": 2},
-    )
-    rows = (
-        test_feature_adder._increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
-            rows=rows,
-            feature_indices_to_inventory_line_numbers=feature_indices_to_inventory_line_numbers,
-            index_to_assign=2,
-        )
+    mapping = test_feature_adder._get_mapping_for_insertion_of_feature(
+        feature_ids=[row["id"] for row in rows], id_of_new_feature="A-2"
     )
+    assert mapping.new_feature_id_for_old == {"A-2": "A-3", "A-3": "A-4"}
 
-    gold_standard_rows = tuple(
-        [
-            {"id": "A-1", "en": "Some feature", "ru": "Некий признак"},
-            {"id": "A-3", "en": "Old feature", "ru": "Старый признак"},
-            {"id": "A-4", "en": "Another feature", "ru": "Другой признак"},
-            {"id": "B-1", "en": "Yet another one", "ru": "И еще один"},
-        ]
-    )
+    rows = remap_ids_in_inventory_of_features(rows, mapping)
+
+    gold_standard_rows = [
+        {"id": "A-1", "en": "Some feature", "ru": "Некий признак", "not_applicable_if": ""},
+        {"id": "A-3", "en": "Old feature", "ru": "Старый признак", "not_applicable_if": ""},
+        {"id": "A-4", "en": "Another feature", "ru": "Другой признак", "not_applicable_if": ""},
+        {"id": "B-1", "en": "Yet another one", "ru": "И еще один", "not_applicable_if": "A-3-1"},
+    ]
 
     assert rows == gold_standard_rows
 
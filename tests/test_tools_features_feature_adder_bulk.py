@@ -0,0 +1,200 @@
+from dataclasses import replace
+
+import pytest
+
+from langworld_db_data.tools.features import FeatureAdder, FeatureAdderError, FeatureToAdd
+from tests.helpers import make_tool_with_copy_of_data, read_all_csv_files
+from tests.paths import DIR_WITH_ADDERS_TEST_FILES
+
+DIR_WITH_FEATURE_ADDER_TEST_FILES = DIR_WITH_ADDERS_TEST_FILES / "feature_adder"
+DIR_WITH_FEATURE_ADDER_INVENTORIES = DIR_WITH_FEATURE_ADDER_TEST_FILES / "inventories"
+
+FEATURES_TO_ADD = (
+    FeatureToAdd(
+        category_id="H",
+        en="Some feature",
+        ru="Некий признак",
+        listed_values=({"en": "One thing", "ru": "Одно явление"},),
+        index_to_assign=5,
+    ),
+    FeatureToAdd(
+        category_id="A",
+        en="Last feature",
+        ru="Последний признак",
+        listed_values=(
+            {"en": "First", "ru": "Первое"},
+            {"en": "Second, and more", "ru": "Второе и прочее"},
+        ),
+    ),
+    FeatureToAdd(
+        category_id="A",
+        en="First feature",
+        ru="Первый признак",
+        listed_values=({"en": "Yes", "ru": "Да"}, {"en": "No", "ru": "Нет"}),
+        index_to_assign=1,
+    ),
+    FeatureToAdd(
+        category_id="H",
+        en="Another feature",
+        ru="Другой признак",
+        listed_values=({"en": "Other thing", "ru": "Другое явление"},),
+        index_to_assign=5,
+    ),
+    FeatureToAdd(
+        category_id="C",
+        en="Feature after last in category",
+        ru="Признак после последнего в категории",
+        listed_values=({"en": "Something", "ru": "Что-то"},),
+        index_to_assign=3,
+    ),
+)
+
+YAML_SPEC = """items:
+  - category_id: H
+    en: Some feature
+    ru: Некий признак
+    index_to_assign: 5
+    listed_values:
+      - {en: One thing, ru: Одно явление}
+  - category_id: A
+    en: Last feature
+    ru: Последний признак
+    listed_values:
+      - {en: First, ru: Первое}
+      - {en: "Second, and more", ru: Второе и прочее}
+  - category_id: A
+    en: First feature
+    ru: Первый признак
+    index_to_assign: 1
+    listed_values: [{en: "Yes", ru: Да}, {en: "No", ru: Нет}]
+  - category_id: H
+    en: Another feature
+    ru: Другой признак
+    index_to_assign: 5
+    listed_values: [{en: Other thing, ru: Другое явление}]
+  - category_id: C
+    en: Feature after last in category
+    ru: Признак после последнего в категории
+    index_to_assign: 3
+    listed_values: [{en: Something, ru: Что-то}]
+"""
+
+CSV_SPEC = """category_id,en,ru,index_to_assign,listed_values_en,listed_values_ru
+H,Some feature,Некий признак,5,One thing,Одно явление
+A,Last feature,Последний признак,,"First|Second, and more",Первое|Второе и прочее
+A,First feature,Первый признак,1,Yes|No,Да|Нет
+H,Another feature,Другой признак,5,Other thing,Другое явление
+C,Feature after last in category,Признак после последнего в категории,3,Something,Что-то
+"""
+
+
+def _make_adder(dir_):
+    return make_tool_with_copy_of_data(
+        FeatureAdder,
+        dir_,
+        dir_with_feature_profiles=DIR_WITH_FEATURE_ADDER_TEST_FILES / "feature_profiles",
+        file_with_features=DIR_WITH_FEATURE_ADDER_INVENTORIES / "features.csv",
+        file_with_listed_values=DIR_WITH_FEATURE_ADDER_INVENTORIES / "features_listed_values.csv",
+        file_with_categories=DIR_WITH_FEATURE_ADDER_INVENTORIES / "feature_categories.csv",
+    )
+
+
+@pytest.fixture(scope="function")
+def dir_after_separate_additions(tmp_path):
+    dir_ = tmp_path / "separate"
+    adder = _make_adder(dir_)
+    for feature in FEATURES_TO_ADD:
+        adder.add_feature(
+            category_id=feature.category_id,
+            feature_en=feature.en,
+            feature_ru=feature.ru,
+            listed_values_to_add=list(feature.listed_values),
+            index_to_assign=feature.index_to_assign,
+        )
+    return dir_
+
+
+def test_add_features_gives_same_result_as_separate_additions(
+    tmp_path, dir_after_separate_additions
+):
+    dir_ = tmp_path / "bulk"
+
+    assert _make_adder(dir_).add_features(FEATURES_TO_ADD) == [
+        "H-6",
+        "A-23",
+        "A-1",
+        "H-5",
+        "C-3",
+    ]
+    assert read_all_csv_files(dir_) == read_all_csv_files(dir_after_separate_additions)
+
+
+def test_add_features_normalizes_names_as_add_feature(tmp_path, dir_after_separate_additions):
+    dir_ = tmp_path / "bulk"
+    features_with_extra_space = [
+        replace(
+            feature,
+            category_id=f" {feature.category_id}",
+            en=f"{feature.en}  ",
+            ru=f"  {feature.ru}",
+        )
+        for feature in FEATURES_TO_ADD
+    ]
+    features_with_extra_space[0] = replace(features_with_extra_space[0], en="Some    feature")
+
+    _make_adder(dir_).add_features(features_with_extra_space)
+
+    assert read_all_csv_files(dir_) == read_all_csv_files(dir_after_separate_additions)
+
+
+@pytest.mark.parametrize(
+    "spec_file_name, spec", [("spec.yaml", YAML_SPEC), ("spec.csv", CSV_SPEC)]
+)
+def test_add_features_from_file(tmp_path, dir_after_separate_additions, spec_file_name, spec):
+    (tmp_path / spec_file_name).write_text(spec, encoding="utf-8")
+    dir_ = tmp_path / "bulk"
+
+    _make_adder(dir_).add_features_from_file(tmp_path / spec_file_name)
+
+    assert read_all_csv_files(dir_) == read_all_csv_files(dir_after_separate_additions)
+
+
+@pytest.mark.parametrize(
+    "features, error_message",
+    [
+        ([FeatureToAdd(category_id="A", en="", ru="Что-то", listed_values=())], "can be empty"),
+        (
+            [FeatureToAdd(category_id="A", en="A", ru="Б", listed_values=({"en": "Yes"},))],
+            "must have keys",
+        ),
+        (
+            [
+                FeatureToAdd(
+                    category_id="Z", en="A", ru="Б", listed_values=FEATURES_TO_ADD[0].listed_values
+                )
+            ],
+            "not found",
+        ),
+        ([FEATURES_TO_ADD[0], FEATURES_TO_ADD[0]], "already present"),
+        (
+            [
+                FeatureToAdd(
+                    category_id="C",
+                    en="A",
+                    ru="Б",
+                    listed_values=FEATURES_TO_ADD[0].listed_values,
+                    index_to_assign=4,
+                )
+            ],
+            "Invalid index_to_assign",
+        ),
+    ],
+)
+def test_add_features_throws_exception_and_writes_nothing(tmp_path, features, error_message):
+    adder = _make_adder(tmp_path)
+    content_before = read_all_csv_files(tmp_path)
+
+    with pytest.raises(FeatureAdderError, match=error_message):
+        adder.add_features(features)
+
+    assert read_all_csv_files(tmp_path) == content_before
@@ -1,4 +1,5 @@
 import pytest
+from tinybear.csv_xls import read_dicts_from_csv, write_csv
 
 from langworld_db_data.tools.features.feature_remover import FeatureRemover, FeatureRemoverError
 from tests.helpers import check_existence_of_output_csv_file_and_compare_with_gold_standard
@@ -180,6 +181,36 @@ def test_remove_feature(test_remover):
         )
 
 
+def test__remove_from_inventory_of_features_removes_references_to_values_of_removed_feature(
+    tmp_path,
+):
+    file_with_features = tmp_path / "features.csv"
+    write_csv(
+        [
+            {"id": "A-4", "en": "Fourth", "not_applicable_if": ""},
+            {"id": "A-5", "en": "Fifth", "not_applicable_if": "A-4-1"},
+            {"id": "A-6", "en": "Sixth", "not_applicable_if": "A-5-2"},
+            {"id": "A-7", "en": "Seventh", "not_applicable_if": "A-4-2, A-6-1"},
+        ],
+        path_to_file=file_with_features,
+        overwrite=False,
+        delimiter=",",
+    )
+    remover = FeatureRemover(
+        input_file_with_features=file_with_features,
+        output_file_with_features=tmp_path / "features_output.csv",
+    )
+
+    remover._remove_from_inventory_of_features(feature_id="A-5")
+
+    # reference of former A-6 to removed A-5 must not turn into reference to its own values
+    assert read_dicts_from_csv(remover.output_file_with_features) == [
+        {"id": "A-4", "en": "Fourth", "not_applicable_if": ""},
+        {"id": "A-5", "en": "Sixth", "not_applicable_if": ""},
+        {"id": "A-6", "en": "Seventh", "not_applicable_if": "A-4-2, A-5-1"},
+    ]
+
+
 def test_remove_feature_throws_exception_with_invalid_feature_ID(test_remover):
 
     with pytest.raises(FeatureRemoverError, match="Feature ID <X-1> not found in file"):
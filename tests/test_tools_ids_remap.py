@@ -0,0 +1,151 @@
+import pytest
+
+from langworld_db_data.tools.common.ids import (
+    IDMapping,
+    get_mapping_after_deletion,
+    get_mapping_after_insertion,
+    get_mapping_after_insertions,
+    remap_ids_in_feature_profile,
+    remap_ids_in_inventory_of_features,
+    remap_ids_in_inventory_of_listed_values,
+    remove_references_to_values_in_inventory_of_features,
+)
+
+
+def test_id_mapping_remaps_values_of_remapped_features():
+    mapping = IDMapping(
+        new_feature_id_for_old={"A-2": "A-3", "A-3": "A-4"},
+        new_value_id_for_old={"A-2-1": "A-3-2", "B-1-2": "B-1-1"},
+    )
+
+    assert mapping.remap_feature_id("A-2") == "A-3"
+    assert mapping.remap_feature_id("A-1") == "A-1"
+    assert mapping.remap_value_id("A-2-5") == "A-3-5"
+    assert mapping.remap_value_id("A-2-1") == "A-3-2"  # explicit mapping takes precedence
+    assert mapping.remap_value_id("B-1-3") == "B-1-3"
+    assert mapping.remap_value_id("") == ""
+    assert mapping.remap_compound_value_id("A-3-1&A-3-4") == "A-4-1&A-4-4"
+    assert mapping.remap_list_of_value_ids("B-1-2, A-2-3, C-1-1") == "B-1-1, A-3-3, C-1-1"
+    assert not IDMapping()
+
+
+def test_get_mapping_after_insertion_and_deletion():
+    feature_ids = ["A-1", "A-2", "A-3", "B-1", "B-2"]
+    value_ids = ["A-1-1", "A-1-2", "A-1-3", "A-2-1", "A-2-2"]
+
+    assert get_mapping_after_insertion(feature_ids, inserted_id="A-2") == {
+        "A-2": "A-3",
+        "A-3": "A-4",
+    }
+    assert get_mapping_after_insertion(feature_ids, inserted_id="B-3") == {}
+    assert get_mapping_after_insertion(value_ids, inserted_id="A-1-1") == {
+        "A-1-1": "A-1-2",
+        "A-1-2": "A-1-3",
+        "A-1-3": "A-1-4",
+    }
+    assert get_mapping_after_deletion(feature_ids, deleted_id="B-1") == {"B-2": "B-1"}
+    assert get_mapping_after_deletion(value_ids, deleted_id="A-1-2") == {"A-1-3": "A-1-2"}
+    # IDs that are not IDs of features or values (like that of auxiliary row) are ignored
+    assert get_mapping_after_deletion(["_aux", "A-1-2"], deleted_id="A-1-1") == {"A-1-2": "A-1-1"}
+
+
+def test_get_mapping_after_insertions_gives_same_result_as_separate_insertions():
+    ids = ["A-1", "A-2", "A-3", "B-1"]
+
+    # A-2 is inserted (A-2 → A-3, A-3 → A-4), then A-5 is appended, then A-1 is inserted
+    # (all IDs of category A are incremented once more), then C-1 is added to new category
+    assert get_mapping_after_insertions(ids, [("A", 2), ("A", None), ("A", 1), ("C", None)]) == (
+        {"A-1": "A-2", "A-2": "A-4", "A-3": "A-5"},
+        ["A-3", "A-6", "A-1", "C-1"],
+    )
+    assert get_mapping_after_insertions(ids, []) == ({}, [])
+
+
+def test_get_mapping_after_insertions_throws_exception_for_invalid_index():
+    with pytest.raises(ValueError, match="item 2 .must be between 1 and 3, 4 was given"):
+        get_mapping_after_insertions(["A-1", "A-2"], [("B", None), ("A", 4)])
+
+
+def test_remap_ids_in_inventories():
+    mapping = IDMapping(new_feature_id_for_old={"B-1": "B-2", "B-2": "B-3"})
+    features = [
+        {"id": "A-1", "not_applicable_if": ""},
+        {"id": "B-1", "not_applicable_if": ""},
+        {"id": "B-2", "not_applicable_if": "B-1-2, B-1-3"},
+    ]
+    listed_values = [
+        {"id": "A-1-1", "feature_id": "A-1"},
+        {"id": "B-1-1", "feature_id": "B-1"},
+    ]
+
+    assert remap_ids_in_inventory_of_features(features, mapping) == [
+        {"id": "A-1", "not_applicable_if": ""},
+        {"id": "B-2", "not_applicable_if": ""},
+        {"id": "B-3", "not_applicable_if": "B-2-2, B-2-3"},
+    ]
+    assert remap_ids_in_inventory_of_listed_values(listed_values, mapping) == [
+        {"id": "A-1-1", "feature_id": "A-1"},
+        {"id": "B-2-1", "feature_id": "B-2"},
+    ]
+    # input rows are not modified
+    assert features[2] == {"id": "B-2", "not_applicable_if": "B-1-2, B-1-3"}
+    assert listed_values[1] == {"id": "B-1-1", "feature_id": "B-1"}
+
+
+def test_remap_ids_in_feature_profile_copies_only_changed_rows():
+    rows = [
+        {"feature_id": "A-1", "value_type": "listed", "value_id": "A-1-1"},
+        {"feature_id": "A-2", "value_type": "listed", "value_id": "A-2-1&A-2-3"},
+        {"feature_id": "A-3", "value_type": "custom", "value_id": ""},
+        {"feature_id": "_aux", "value_type": "", "value_id": ""},
+    ]
+
+    remapped_rows = remap_ids_in_feature_profile(
+        rows,
+        IDMapping(
+            new_feature_id_for_old={"A-3": "A-4"},
+            new_value_id_for_old={"A-2-3": "A-2-2"},
+        ),
+    )
+
+    assert remapped_rows == [
+        {"feature_id": "A-1", "value_type": "listed", "value_id": "A-1-1"},
+        {"feature_id": "A-2", "value_type": "listed", "value_id": "A-2-1&A-2-2"},
+        {"feature_id": "A-4", "value_type": "custom", "value_id": ""},
+        {"feature_id": "_aux", "value_type": "", "value_id": ""},
+    ]
+    assert remapped_rows[0] is rows[0]
+    assert remapped_rows[1] is not rows[1]
+    assert remapped_rows[3] is rows[3]
+
+    # if nothing changes, the same rows are returned
+    mapping_for_other_feature = IDMapping(new_feature_id_for_old={"B-1": "B-2"})
+    assert remap_ids_in_feature_profile(rows, mapping_for_other_feature) is rows
+    assert remap_ids_in_feature_profile(rows, IDMapping()) is rows
+
+
+def test_remove_references_to_values_in_inventory_of_features():
+    features = [
+        {"id": "A-5", "not_applicable_if": ""},
+        {"id": "A-6", "not_applicable_if": "A-5-2"},
+        {"id": "A-7", "not_applicable_if": "A-1-1, A-5-1"},
+        {"id": "A-8", "not_applicable_if": "A-7-2"},
+    ]
+
+    assert remove_references_to_values_in_inventory_of_features(
+        features, is_removed_value_id=lambda value_id: value_id.startswith("A-5-")
+    ) == [
+        {"id": "A-5", "not_applicable_if": ""},
+        {"id": "A-6", "not_applicable_if": ""},
+        {"id": "A-7", "not_applicable_if": "A-1-1"},
+        {"id": "A-8", "not_applicable_if": "A-7-2"},
+    ]
+    assert features[1] == {"id": "A-6", "not_applicable_if": "A-5-2"}
+
+    # if nothing changes, the same rows are returned
+    assert (
+        remove_references_to_values_in_inventory_of_features(
+            features, is_removed_value_id=lambda value_id: value_id == "B-1-1"
+        )
+        is features
+    )
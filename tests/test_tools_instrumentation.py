@@ -0,0 +1,140 @@
+import json
+import threading
+
+import pytest
+
+from langworld_db_data.tools.common.instrumentation import Instrumentation
+
+
+@pytest.fixture(scope="function")
+def files(tmp_path):
+    for name in ("a.csv", "b.csv"):
+        (tmp_path / name).write_text(name, encoding="utf-8")
+    return tmp_path
+
+
+def test_stage_counts_files_read_and_written(files, tmp_path):
+    instrumentation = Instrumentation(root_dir=tmp_path)
+
+    with instrumentation.stage("one") as stats:
+        for _ in range(2):  # same file is only counted once
+            (files / "a.csv").read_text(encoding="utf-8")
+        (files / "b.csv").read_bytes()
+        (files / "c.csv").write_text("c", encoding="utf-8")
+
+    assert stats.name == "one"
+    assert stats.seconds > 0
+    assert stats.files_read == 2
+    assert stats.files_written == 1
+    assert stats.peak_memory_bytes is None
+    assert stats.path_to_profile is None
+
+
+def test_files_outside_root_dir_and_outside_stages_are_not_counted(files, tmp_path):
+    instrumentation = Instrumentation(root_dir=tmp_path / "other")
+
+    with instrumentation.stage("one") as stats:
+        (files / "a.csv").read_text(encoding="utf-8")
+
+    assert stats.files_read == 0
+
+    instrumentation = Instrumentation(root_dir=tmp_path)
+    with instrumentation.stage("two") as stats:
+        pass
+    (files / "a.csv").read_text(encoding="utf-8")
+
+    assert stats.files_read == 0
+
+
+def test_files_are_attributed_to_stage_of_thread_that_opened_them(files, tmp_path):
+    instrumentation = Instrumentation(root_dir=tmp_path)
+    may_read = threading.Event()
+
+    def read_in_other_stage() -> None:
+        with instrumentation.stage("other thread"):
+            may_read.wait()
+            (files / "b.csv").read_text(encoding="utf-8")
+
+    with instrumentation.stage("main thread") as stats:
+        thread = threading.Thread(target=read_in_other_stage)
+        thread.start()
+        (files / "a.csv").read_text(encoding="utf-8")
+        may_read.set()
+        thread.join()
+
+    assert stats.files_read == 1
+    assert [s.files_read for s in instrumentation.stages] == [1, 1]
+
+
+def test_stage_with_profile_and_memory_tracing(tmp_path):
+    instrumentation = Instrumentation(
+        stages_to_profile=["profiled"],
+        stages_to_trace_memory=["all"],
+        dir_for_profiles=tmp_path / "profiles",
+        root_dir=tmp_path,
+    )
+
+    with instrumentation.stage("profiled") as stats:
+        _ = [str(i) for i in range(10000)]
+
+    assert stats.peak_memory_bytes > 0
+    assert (tmp_path / "profiles" / "profiled.prof").exists()
+    assert stats.path_to_profile == str(tmp_path / "profiles" / "profiled.prof")
+
+    with instrumentation.stage("not profiled") as stats:
+        pass
+
+    assert stats.path_to_profile is None
+    assert stats.peak_memory_bytes is not None
+
+
+def test_nested_stages_with_profile_and_memory_tracing(tmp_path):
+    instrumentation = Instrumentation(
+        stages_to_profile=["all"],
+        stages_to_trace_memory=["all"],
+        dir_for_profiles=tmp_path / "profiles",
+        root_dir=tmp_path,
+    )
+
+    with instrumentation.stage("outer") as outer_stats:
+        with instrumentation.stage("inner") as inner_stats:
+            strings = [str(i) for i in range(100000)]
+        del strings
+        with instrumentation.stage("inner_2"):
+            pass
+
+    assert (tmp_path / "profiles" / "outer.prof").exists()
+    assert (tmp_path / "profiles" / "inner.prof").exists()
+    # peak of the inner stage is not lost when the next nested stage resets the peak
+    assert outer_stats.peak_memory_bytes >= inner_stats.peak_memory_bytes > 1000000
+
+
+def test_stage_is_recorded_if_code_inside_it_fails(tmp_path):
+    instrumentation = Instrumentation(root_dir=tmp_path)
+
+    with pytest.raises(ValueError):
+        with instrumentation.stage("failing"):
+            raise ValueError
+
+    assert instrumentation.stages[0].name == "failing"
+
+
+def test_write_json(files, tmp_path):
+    instrumentation = Instrumentation(root_dir=tmp_path)
+    with instrumentation.stage("one"):
+        (files / "a.csv").read_text(encoding="utf-8")
+
+    instrumentation.write_json(tmp_path / "timings.json")
+    content = json.loads((tmp_path / "timings.json").read_text(encoding="utf-8"))
+
+    assert content["total_seconds"] > 0
+    assert content["stages"] == [
+        {
+            "name": "one",
+            "seconds": instrumentation.stages[0].seconds,
+            "files_read": 1,
+            "files_written": 0,
+            "peak_memory_bytes": None,
+            "path_to_profile": None,
+        }
+    ]
@@ -0,0 +1,162 @@
+import shutil
+
+import pytest
+
+from langworld_db_data.constants.paths import (
+    FEATURE_PROFILES_DIR,
+    FILE_WITH_CATEGORIES,
+    FILE_WITH_LISTED_VALUES,
+    FILE_WITH_NAMES_OF_FEATURES,
+)
+from langworld_db_data.tools.common import atomic_writer
+from langworld_db_data.tools.common.edit_session import EditSession, FileChange
+from langworld_db_data.tools.common.journal import Journal, JournalError
+from langworld_db_data.tools.listed_values import ListedValueAdder, ListedValueRemover
+
+DOCULECTS = ("abaza", "abkhaz", "adyghe")
+
+
+@pytest.fixture(scope="function")
+def data_dir(tmp_path):
+    dir_ = tmp_path / "data"
+    (dir_ / "inventories").mkdir(parents=True)
+    for file in (FILE_WITH_CATEGORIES, FILE_WITH_LISTED_VALUES, FILE_WITH_NAMES_OF_FEATURES):
+        shutil.copy(file, dir_ / "inventories" / file.name)
+    (dir_ / "feature_profiles").mkdir()
+    for doculect in DOCULECTS:
+        shutil.copy(FEATURE_PROFILES_DIR / f"{doculect}.csv", dir_ / "feature_profiles")
+    return dir_
+
+
+def _get_kwargs_for_tool(dir_):
+    inventories, profiles = dir_ / "inventories", dir_ / "feature_profiles"
+    return {
+        "file_with_categories": inventories / FILE_WITH_CATEGORIES.name,
+        "input_file_with_features": inventories / FILE_WITH_NAMES_OF_FEATURES.name,
+        "output_file_with_features": inventories / FILE_WITH_NAMES_OF_FEATURES.name,
+        "input_file_with_listed_values": inventories / FILE_WITH_LISTED_VALUES.name,
+        "output_file_with_listed_values": inventories / FILE_WITH_LISTED_VALUES.name,
+        "input_dir_with_feature_profiles": profiles,
+        "output_dir_with_feature_profiles": profiles,
+    }
+
+
+def _make_session(dir_, description):
+    return EditSession(
+        file_with_features=dir_ / "inventories" / FILE_WITH_NAMES_OF_FEATURES.name,
+        file_with_listed_values=dir_ / "inventories" / FILE_WITH_LISTED_VALUES.name,
+        journal=Journal(dir_ / ".journal"),
+        description=description,
+    )
+
+
+def _read_all_files(dir_):
+    return {
+        file.relative_to(dir_): file.read_bytes()
+        for file in sorted(dir_.rglob("*.csv"))
+        if ".journal" not in file.parts
+    }
+
+
+def _edit_twice(dir_):
+    """Makes two operations, returns contents of files before and after each of them."""
+    contents = [_read_all_files(dir_)]
+
+    with _make_session(dir_, description="Add A-1-1"):
+        ListedValueAdder(**_get_kwargs_for_tool(dir_)).add_listed_value(
+            feature_id="A-1", new_value_en="One", new_value_ru="Один", index_to_assign=1
+        )
+    contents.append(_read_all_files(dir_))
+
+    with _make_session(dir_, description="Remove A-1-3"):
+        ListedValueRemover(**_get_kwargs_for_tool(dir_)).remove_listed_value(
+            id_of_value_to_remove="A-1-3"
+        )
+    contents.append(_read_all_files(dir_))
+
+    return contents
+
+
+def test_undo_and_replay_operations(data_dir):
+    contents = _edit_twice(data_dir)
+    journal = Journal(data_dir / ".journal")
+
+    assert [(op.id, op.description, op.state) for op in journal.get_operations()] == [
+        (1, "Add A-1-1", "applied"),
+        (2, "Remove A-1-3", "applied"),
+    ]
+    assert contents[0] != contents[1] != contents[2]
+
+    assert [op.id for op in journal.undo()] == [2]
+    assert _read_all_files(data_dir) == contents[1]
+
+    assert [op.id for op in journal.undo()] == [1]
+    assert _read_all_files(data_dir) == contents[0]
+
+    assert [op.id for op in journal.replay(2)] == [1, 2]
+    assert _read_all_files(data_dir) == contents[2]
+
+    assert [op.id for op in journal.undo(2)] == [2, 1]
+    assert _read_all_files(data_dir) == contents[0]
+    assert {op.state for op in journal.get_operations()} == {"undone"}
+
+    with pytest.raises(JournalError, match="only 0 operations are applied"):
+        journal.undo()
+
+
+def test_undo_does_not_overwrite_file_changed_after_operation(data_dir):
+    contents = _edit_twice(data_dir)
+    file = data_dir / "inventories" / FILE_WITH_LISTED_VALUES.name
+    file.write_bytes(file.read_bytes() + b"A-1-999,A-1,X,X,,\r\n")
+
+    with pytest.raises(JournalError, match="has been changed by something else"):
+        Journal(data_dir / ".journal").undo()
+
+    # other files of the operation were not touched either
+    for path, content in contents[2].items():
+        if path != file.relative_to(data_dir):
+            assert (data_dir / path).read_bytes() == content
+
+
+def test_failed_writing_is_recorded_as_aborted(data_dir, monkeypatch):
+    content_before = _read_all_files(data_dir)
+
+    def fail(path_to_file, content):
+        if ".journal" not in path_to_file.parts:
+            raise OSError("disk is full")
+        return original_write_temp_file(path_to_file, content)
+
+    original_write_temp_file = atomic_writer._write_temp_file
+    monkeypatch.setattr(atomic_writer, "_write_temp_file", fail)
+
+    with pytest.raises(OSError, match="disk is full"):
+        with _make_session(data_dir, description="Add A-1-1"):
+            ListedValueAdder(**_get_kwargs_for_tool(data_dir)).add_listed_value(
+                feature_id="A-1", new_value_en="One", new_value_ru="Один"
+            )
+
+    assert _read_all_files(data_dir) == content_before
+    assert [op.state for op in Journal(data_dir / ".journal").get_operations()] == ["aborted"]
+
+
+def test_recover_finishes_interrupted_operation(data_dir):
+    journal = Journal(data_dir / ".journal")
+    files = [data_dir / "feature_profiles" / f"{doculect}.csv" for doculect in DOCULECTS[:2]]
+    changes = [
+        FileChange(path=file, old_content=file.read_bytes(), new_content=b"new content\r\n")
+        for file in files
+    ]
+
+    journal.begin(description="Interrupted", changes=changes)
+    # process is killed after the first file is replaced
+    files[0].write_bytes(b"new content\r\n")
+
+    with pytest.raises(JournalError, match="interrupted operation"):
+        journal.undo()
+
+    assert [op.id for op in journal.recover()] == [1]
+    assert [file.read_bytes() for file in files] == [b"new content\r\n"] * 2
+    assert journal.get_operations()[0].state == "applied"
+
+    journal.undo()
+    assert [file.read_bytes() for file in files] == [change.old_content for change in changes]
@@ -1,5 +1,8 @@
+import shutil
+
 import pytest
 
+from langworld_db_data.tools.common.ids import remap_ids_in_inventory_of_listed_values
 from langworld_db_data.tools.listed_values.listed_value_adder import (
     ListedValueAdder,
     ListedValueAdderError,
@@ -327,9 +330,9 @@ def test__get_indices_and_their_line_numbers_for_given_feature_in_inventory_of_l
     )
 
 
-# _increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign
+# _get_mapping_for_insertion_of_value
 # Normal case
-def test__increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(test_adder):
+def test__get_mapping_for_insertion_of_value(test_adder):
     rows = [
         {"id": "A-1-1", "feature_id": "A-1", "en": "Two", "ru": "Две"},
         {"id": "A-2-1", "feature_id": "A-2", "en": "Close and open", "ru": "Верхний и нижний"},
@@ -341,30 +344,22 @@ def test__increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
             "ru": "Верхний, средний и нижний",
         },
     ]
-    value_indices_to_inventory_line_numbers = (
-        {"index": 1, "line number": 1},
-        {"index": 2, "line number": 2},
-        {"index": 3, "line number": 3},
-    )
-    rows = test_adder._increment_ids_whose_indices_are_equal_or_greater_than_index_to_assign(
-        rows=rows,
-        value_indices_to_inventory_line_numbers=value_indices_to_inventory_line_numbers,
-        index_to_assign=2,
-    )
+    mapping = test_adder._get_mapping_for_insertion_of_value(rows, id_of_new_value="A-2-2")
+    assert mapping.new_value_id_for_old == {"A-2-2": "A-2-3", "A-2-3": "A-2-4"}
 
-    gold_standard_rows = tuple(
-        [
-            {"id": "A-1-1", "feature_id": "A-1", "en": "Two", "ru": "Две"},
-            {"id": "A-2-1", "feature_id": "A-2", "en": "Close and open", "ru": "Верхний и нижний"},
-            {"id": "A-2-3", "feature_id": "A-2", "en": "Close and mid", "ru": "Верхний и средний"},
-            {
-                "id": "A-2-4",
-                "feature_id": "A-2",
-                "en": "Close, mid and open",
-                "ru": "Верхний, средний и нижний",
-            },
-        ]
-    )
+    rows = remap_ids_in_inventory_of_listed_values(rows, mapping)
+
+    gold_standard_rows = [
+        {"id": "A-1-1", "feature_id": "A-1", "en": "Two", "ru": "Две"},
+        {"id": "A-2-1", "feature_id": "A-2", "en": "Close and open", "ru": "Верхний и нижний"},
+        {"id": "A-2-3", "feature_id": "A-2", "en": "Close and mid", "ru": "Верхний и средний"},
+        {
+            "id": "A-2-4",
+            "feature_id": "A-2",
+            "en": "Close, mid and open",
+            "ru": "Верхний, средний и нижний",
+        },
+    ]
 
     assert rows == gold_standard_rows
 
@@ -416,6 +411,24 @@ def test__increment_value_ids_in_feature_profiles(test_adder):
         )
 
 
+def test__increment_value_ids_in_feature_profiles_updates_index(tmp_path):
+    for file in DIR_WITH_INPUT_FILES_FOR_INCREMENT_VALUE_IDS_IN_FEATURE_PROFILES.glob("*.csv"):
+        shutil.copy(file, tmp_path)
+    adder = ListedValueAdder(
+        input_dir_with_feature_profiles=tmp_path, output_dir_with_feature_profiles=tmp_path
+    )
+    assert adder.feature_profile_index.doculects_with_value("A-11-15") == []
+
+    adder._increment_value_ids_in_feature_profiles(
+        new_value_id="A-11-5",
+        input_files=adder.feature_profile_index.files_with_feature("A-11", "listed"),
+        output_dir=tmp_path,
+    )
+
+    assert adder.feature_profile_index.doculects_with_value("A-11-15") == ["catalan_A-11-14"]
+    assert adder.feature_profile_index.doculects_with_value("A-11-1") == ["catalan_A-11-1"]
+
+
 # _mark_value_as_listed_in_feature_profiles
 # Normal case
 def test__mark_value_as_listed_in_feature_profiles(test_adder):
@@ -0,0 +1,143 @@
+import pytest
+
+from langworld_db_data.constants.paths import FILE_WITH_NAMES_OF_FEATURES
+from langworld_db_data.tools.listed_values import (
+    ListedValueAdder,
+    ListedValueAdderError,
+    ListedValueToAdd,
+)
+from tests.helpers import make_tool_with_copy_of_data, read_all_csv_files
+from tests.paths import DIR_WITH_ADDERS_FEATURE_PROFILES, INPUT_FILE_WITH_LISTED_VALUES
+
+VALUES_TO_ADD = (
+    ListedValueToAdd(
+        feature_id="A-11",
+        en="New value, listed with a comma",
+        ru="Есть первые, вторые и третьи",
+        custom_values_to_rename=("третьи, вторые и первые", "Первые, третьи и вторые"),
+    ),
+    ListedValueToAdd(
+        feature_id="A-2",
+        en="Four degrees",
+        ru="Четыре подъема",
+        index_to_assign=3,
+        custom_values_to_rename=("Верхний, средний (закрытые и открытые) и нижний",),
+    ),
+    ListedValueToAdd(feature_id="A-2", en="No degrees", ru="Нет подъемов", index_to_assign=1),
+    ListedValueToAdd(
+        feature_id="A-11",
+        en="Other",
+        ru="Что-то другое",
+        index_to_assign=2,
+        custom_values_to_rename=("Что-то другое custom",),
+        description_formatted_ru="<p>Описание</p>",
+    ),
+)
+
+YAML_SPEC = """items:
+  - feature_id: A-11
+    en: New value, listed with a comma
+    ru: Есть первые, вторые и третьи
+    custom_values_to_rename:
+      - третьи, вторые и первые
+      - Первые, третьи и вторые
+  - feature_id: A-2
+    en: Four degrees
+    ru: Четыре подъема
+    index_to_assign: 3
+    custom_values_to_rename: ["Верхний, средний (закрытые и открытые) и нижний"]
+  - {feature_id: A-2, en: No degrees, ru: Нет подъемов, index_to_assign: 1}
+  - feature_id: A-11
+    en: Other
+    ru: Что-то другое
+    index_to_assign: 2
+    custom_values_to_rename: [Что-то другое custom]
+    description_formatted_ru: <p>Описание</p>
+"""
+
+CSV_SPEC = """feature_id,en,ru,index_to_assign,custom_values_to_rename,description_formatted_ru
+A-11,"New value, listed with a comma","Есть первые, вторые и третьи",,"третьи, вторые и первые|Первые, третьи и вторые",
+A-2,Four degrees,Четыре подъема,3,"Верхний, средний (закрытые и открытые) и нижний",
+A-2,No degrees,Нет подъемов,1,,
+A-11,Other,Что-то другое,2,Что-то другое custom,<p>Описание</p>
+"""  # noqa: E501
+
+
+def _make_adder(dir_):
+    return make_tool_with_copy_of_data(
+        ListedValueAdder,
+        dir_,
+        dir_with_feature_profiles=DIR_WITH_ADDERS_FEATURE_PROFILES,
+        file_with_features=FILE_WITH_NAMES_OF_FEATURES,
+        file_with_listed_values=INPUT_FILE_WITH_LISTED_VALUES,
+    )
+
+
+@pytest.fixture(scope="function")
+def dir_after_separate_additions(tmp_path):
+    dir_ = tmp_path / "separate"
+    adder = _make_adder(dir_)
+    for value in VALUES_TO_ADD:
+        adder.add_listed_value(
+            feature_id=value.feature_id,
+            new_value_en=value.en,
+            new_value_ru=value.ru,
+            custom_values_to_rename=list(value.custom_values_to_rename),
+            index_to_assign=value.index_to_assign,
+            description_formatted_en=value.description_formatted_en,
+            description_formatted_ru=value.description_formatted_ru,
+        )
+    return dir_
+
+
+def test_add_listed_values_gives_same_result_as_separate_additions(
+    tmp_path, dir_after_separate_additions
+):
+    dir_ = tmp_path / "bulk"
+
+    assert _make_adder(dir_).add_listed_values(VALUES_TO_ADD) == [
+        "A-11-16",
+        "A-2-4",
+        "A-2-1",
+        "A-11-2",
+    ]
+    assert read_all_csv_files(dir_) == read_all_csv_files(dir_after_separate_additions)
+
+    # custom values were marked as listed in all profiles where they matched
+    assert "A-11,Инвентарь шумных согласных по ларингальным признакам,listed,A-11-2" in (
+        dir_ / "feature_profiles" / "pashto.csv"
+    ).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize(
+    "spec_file_name, spec", [("spec.yaml", YAML_SPEC), ("spec.csv", CSV_SPEC)]
+)
+def test_add_listed_values_from_file(tmp_path, dir_after_separate_additions, spec_file_name, spec):
+    (tmp_path / spec_file_name).write_text(spec, encoding="utf-8")
+    dir_ = tmp_path / "bulk"
+
+    _make_adder(dir_).add_listed_values_from_file(tmp_path / spec_file_name)
+
+    assert read_all_csv_files(dir_) == read_all_csv_files(dir_after_separate_additions)
+
+
+@pytest.mark.parametrize(
+    "values, error_message",
+    [
+        ([ListedValueToAdd(feature_id="A-2", en="", ru="Что-то")], "can be empty"),
+        ([ListedValueToAdd(feature_id="Z-256", en="A", ru="Б")], "Feature ID Z-256 not found"),
+        ([VALUES_TO_ADD[2], VALUES_TO_ADD[2]], "already has this value"),
+        (
+            [ListedValueToAdd(feature_id="A-2", en="A", ru="Б", index_to_assign=256)],
+            "Invalid index_to_assign",
+        ),
+    ],
+)
+def test_add_listed_values_throws_exception_and_writes_nothing(tmp_path, values, error_message):
+    adder = _make_adder(tmp_path)
+    content_before = read_all_csv_files(tmp_path)
+
+    with pytest.raises(ListedValueAdderError, match=error_message):
+        adder.add_listed_values(values)
+
+    assert read_all_csv_files(tmp_path) == content_before
@@ -35,7 +35,9 @@ def test_increment_value_ids_combined(monkeypatch, tmp_path):
     monkeypatch.setattr(
         "langworld_db_data.tools.listed_values.listed_value_adder.write_csv", fake_write_csv
     )
-    ListedValueAdder._increment_value_ids_in_feature_profiles(
+    ListedValueAdder(
+        input_dir_with_feature_profiles=tmp_path, output_dir_with_feature_profiles=tmp_path
+    )._increment_value_ids_in_feature_profiles(
         new_value_id="A-1-1",
         input_files=[csv_path],
         output_dir=tmp_path,
@@ -75,7 +77,9 @@ def test_increment_value_ids_atomic(monkeypatch, tmp_path):
     monkeypatch.setattr(
         "langworld_db_data.tools.listed_values.listed_value_adder.write_csv", fake_write_csv
     )
-    ListedValueAdder._increment_value_ids_in_feature_profiles(
+    ListedValueAdder(
+        input_dir_with_feature_profiles=tmp_path, output_dir_with_feature_profiles=tmp_path
+    )._increment_value_ids_in_feature_profiles(
         new_value_id="A-1-2",
         input_files=[csv_path],
         output_dir=tmp_path,
@@ -112,7 +116,9 @@ def test_increment_value_ids_noop(monkeypatch, tmp_path):
     monkeypatch.setattr(
         "langworld_db_data.tools.listed_values.listed_value_adder.write_csv", fake_write_csv
     )
-    ListedValueAdder._increment_value_ids_in_feature_profiles(
+    ListedValueAdder(
+        input_dir_with_feature_profiles=tmp_path, output_dir_with_feature_profiles=tmp_path
+    )._increment_value_ids_in_feature_profiles(
         new_value_id="A-1-5",
         input_files=[csv_path],
         output_dir=tmp_path,
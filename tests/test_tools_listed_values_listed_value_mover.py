@@ -61,8 +61,6 @@ def test_mover():
         output_file_with_listed_values=OUTPUT_FILE_WITH_LISTED_VALUES,
         input_dir_with_feature_profiles=DIR_WITH_MOVERS_FEATURE_PROFILES,
         output_dir_with_feature_profiles=OUTPUT_DIR_FOR_LISTED_VALUE_MOVER_FEATURE_PROFILES,
-        listed_value_adder_input_file_with_inventories=OUTPUT_FILE_WITH_LISTED_VALUES,
-        listed_value_adder_input_dir_with_feature_profiles=OUTPUT_DIR_FOR_LISTED_VALUE_MOVER_FEATURE_PROFILES,
     )
 
 
@@ -147,3 +145,53 @@ def test_move_value_in_inventory_of_listed_values_throws_error_with_coinciding_f
             initial_value_id="A-3-2",
             index_to_assign=2,
         )
+
+
+def test_move_listed_value_updates_compound_values_and_leaves_custom_values_intact(tmp_path):
+    header = "feature_id,feature_name_ru,value_type,value_id,value_ru,comment_ru,comment_en\n"
+    (tmp_path / "inventory.csv").write_text(
+        "id,feature_id,en,ru,description_formatted_en,description_formatted_ru\n"
+        "A-1-1,A-1,One,Один,,\nA-1-2,A-1,Two,Два,,\nA-1-3,A-1,Three,Три,,\n"
+        "A-2-1,A-2,Yes,Да,,\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "profiles").mkdir()
+    (tmp_path / "profiles" / "compound.csv").write_text(
+        header + "A-1,,listed,A-1-1&A-1-3,Один&Три,,\nA-2,,listed,A-2-1,Да,,\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "profiles" / "custom.csv").write_text(
+        header + "A-1,,custom,,Три,,\nA-2,,listed,A-2-1,Да,,\n", encoding="utf-8"
+    )
+    mover = ListedValueMover(
+        input_file_with_listed_values=tmp_path / "inventory.csv",
+        output_file_with_listed_values=tmp_path / "inventory.csv",
+        input_dir_with_feature_profiles=tmp_path / "profiles",
+        output_dir_with_feature_profiles=tmp_path / "profiles",
+    )
+    content_of_custom_before = (tmp_path / "profiles" / "custom.csv").read_bytes()
+
+    mover.move_listed_value(initial_value_id="A-1-3", index_to_assign=1)
+
+    assert (tmp_path / "inventory.csv").read_text(encoding="utf-8").splitlines()[1:] == [
+        "A-1-1,A-1,Three,Три,,",
+        "A-1-2,A-1,One,Один,,",
+        "A-1-3,A-1,Two,Два,,",
+        "A-2-1,A-2,Yes,Да,,",
+    ]
+    content_of_compound = (tmp_path / "profiles" / "compound.csv").read_text(encoding="utf-8")
+    assert content_of_compound.splitlines()[1] == "A-1,,listed,A-1-1&A-1-2,Три&Один,,"
+    assert (tmp_path / "profiles" / "custom.csv").read_bytes() == content_of_custom_before
+
+
+@pytest.mark.parametrize(
+    "initial_value_id, index_to_assign, message",
+    [("A-3-9", 1, "Value ID A-3-9 not found"), ("A-3-2", 6, "must be between 1 and 5")],
+)
+def test_move_listed_value_throws_error_with_invalid_arguments(
+    test_mover, initial_value_id, index_to_assign, message
+):
+    with pytest.raises(ListedValueMoverError, match=message):
+        test_mover.move_listed_value(
+            initial_value_id=initial_value_id, index_to_assign=index_to_assign
+        )
@@ -1,4 +1,5 @@
 import pytest
+from tinybear.csv_xls import read_dicts_from_csv
 
 from langworld_db_data.tools.listed_values.listed_value_remover import (
     ListedValueRemover,
@@ -34,8 +35,10 @@ GS_DIR_WITH_REMOVERS_FEATURE_PROFILES = DIR_WITH_REMOVERS_FEATURE_PROFILES / "go
 
 
 @pytest.fixture(scope="function")
-def test_remover():
+def test_remover(tmp_path):
     return ListedValueRemover(
+        # references to values in inventory of features are updated as well
+        output_file_with_features=tmp_path / "features.csv",
         input_file_with_listed_values=INPUT_FILE_WITH_LISTED_VALUES_FOR_REMOVERS,
         output_file_with_listed_values=DIR_WITH_REMOVERS_TEST_FILES
         / "features_listed_values_output_value_remover.csv",
@@ -63,6 +66,13 @@ def test_remove_listed_value(test_remover):
     for file in list(test_remover.output_dir_with_feature_profiles.glob("*.csv")):
         file.unlink()
 
+    not_applicable_if_for_feature_id = {
+        row["id"]: row["not_applicable_if"]
+        for row in read_dicts_from_csv(test_remover.output_file_with_features)
+    }
+    assert not_applicable_if_for_feature_id["A-10"] == "A-9-1"
+    assert not_applicable_if_for_feature_id["B-4"] == "B-1-2, B-1-3"
+
     # The same value is being removed in the dedicated test for the self._remove_from_feature_profiles method
 
 
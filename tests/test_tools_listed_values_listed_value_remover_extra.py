@@ -93,10 +93,12 @@ def test_remover_combined_value(monkeypatch, tmp_path, capsys):
         output_dir_with_feature_profiles=tmp_path,
     )
     remover._remove_from_feature_profiles_and_update_ids_whose_indices_are_greater_than_one_of_removed_value(
-        "F-2-8"
+        "F-2-3"
     )
     out = capsys.readouterr().out
-    assert "Updating atomic valie ids" in out
+    assert "Updating value id in combo" in out
+    with open(tmp_path / "combo.csv") as f:
+        assert list(csv.DictReader(f))[0]["value_id"] == "F-2-3&F-2-7"
 
 
 def test_remover_regular_id_update(monkeypatch, tmp_path, capsys):
@@ -141,7 +143,9 @@ def test_remover_file_not_changed(monkeypatch, tmp_path, capsys):
     """Covers: else branch, file.stem is not changed"""
     input_path = make_csv(
         tmp_path,
-        [{"feature_id": "F-4", "value_type": "custom", "value_id": "", "id": "irrelevant"}],
+        # profiles without listed values of the feature are not even opened,
+        # so the profile must have a value that does not need changing
+        [{"feature_id": "F-4", "value_type": "listed", "value_id": "F-4-2", "id": "irrelevant"}],
         "unchanged.csv",
     )
 
@@ -170,3 +174,54 @@ def test_remover_file_not_changed(monkeypatch, tmp_path, capsys):
     )
     out = capsys.readouterr().out
     assert "unchanged is not changed" in out
+
+
+def test_remover_removes_value_from_compound_value(monkeypatch, tmp_path, capsys):
+    """Covers: removed value is one of atomic values, following value is renumbered"""
+    path = tmp_path / "compound.csv"
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=[*_DEF_KEYS, "value_ru"])
+        writer.writeheader()
+        writer.writerow(
+            {
+                "feature_id": "F-5",
+                "value_type": "listed",
+                "value_id": "F-5-1&F-5-2&F-5-3",
+                "value_ru": "Прошедшее&Настоящее&Будущее",
+                "id": "irrelevant",
+            }
+        )
+
+    def fake_read_csv(path_):
+        with open(path) as f:
+            return list(csv.DictReader(f))
+
+    def fake_write_csv(rows_arg, path_to_file, **kwargs):
+        with open(path_to_file, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=rows_arg[0].keys())
+            writer.writeheader()
+            writer.writerows(rows_arg)
+
+    monkeypatch.setattr(
+        "langworld_db_data.tools.listed_values.listed_value_remover.read_dicts_from_csv",
+        fake_read_csv,
+    )
+    monkeypatch.setattr(
+        "langworld_db_data.tools.listed_values.listed_value_remover.write_csv", fake_write_csv
+    )
+    remover = ListedValueRemover(
+        input_file_with_listed_values=tmp_path / "p.csv",
+        output_file_with_listed_values=tmp_path / "q.csv",
+        input_dir_with_feature_profiles=tmp_path,
+        output_dir_with_feature_profiles=tmp_path,
+    )
+    remover._remove_from_feature_profiles_and_update_ids_whose_indices_are_greater_than_one_of_removed_value(
+        "F-5-2"
+    )
+    out = capsys.readouterr().out
+    assert "Removing value from compound value in compound" in out
+    with open(path) as f:
+        row = list(csv.DictReader(f))[0]
+    assert row["value_type"] == "listed"
+    assert row["value_id"] == "F-5-1&F-5-2"
+    assert row["value_ru"] == "Прошедшее&Будущее"
@@ -142,12 +142,13 @@ def test_rename_value_in_profiles_and_inventories_keeps_values_at_two_digit_indi
         unlink_if_successful=True,
     )
 
-    for file_stem in "catalan", "corsican":
-        check_existence_of_output_csv_file_and_compare_with_gold_standard(
-            output_file=output_feature_profiles_dir / f"{file_stem}.csv",
-            gold_standard_file=feature_profiles_dir / "gold_standard" / f"{file_stem}.csv",
-            unlink_if_successful=True,
-        )
+    check_existence_of_output_csv_file_and_compare_with_gold_standard(
+        output_file=output_feature_profiles_dir / "catalan.csv",
+        gold_standard_file=feature_profiles_dir / "gold_standard" / "catalan.csv",
+        unlink_if_successful=True,
+    )
+    # Corsican only has A-15-11, so it must not even be rewritten
+    assert not (output_feature_profiles_dir / "corsican.csv").exists()
 
 
 def test_set_empty_name_for_value(value_renamer):
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from langworld_db_data.tools.common.instrumentation import Instrumentation
+from langworld_db_data.tools.common.stage_scheduler import (
+    Stage,
+    StageScheduler,
+    StageSchedulerError,
+)
+
+
+def _do_nothing() -> None:
+    pass
+
+
+def test_get_dependencies(tmp_path):
+    scheduler = StageScheduler()
+    for stage in (
+        Stage("read a", _do_nothing, inputs=(tmp_path / "a.csv",)),
+        Stage("read b", _do_nothing, inputs=(tmp_path / "b.csv",)),
+        Stage("write dir", _do_nothing, outputs=(tmp_path,)),
+        Stage("read a again", _do_nothing, inputs=(tmp_path / "a.csv",)),
+        Stage("load", _do_nothing, outputs=("object",)),
+        Stage("use", _do_nothing, inputs=("object",)),
+        Stage("use again", _do_nothing, inputs=("object",)),
+    ):
+        scheduler.add(stage)
+
+    assert scheduler.get_dependencies() == {
+        "read a": [],
+        "read b": [],
+        # write after read of files in the directory
+        "write dir": ["read a", "read b"],
+        # read after write of the directory
+        "read a again": ["write dir"],
+        "load": [],
+        "use": ["load"],
+        # stages that only read the same resource are independent
+        "use again": ["load"],
+    }
+
+
+def test_add_fails_with_repeating_name():
+    scheduler = StageScheduler()
+    scheduler.add(Stage("one", _do_nothing))
+
+    with pytest.raises(StageSchedulerError, match="one was already added"):
+        scheduler.add(Stage("one", _do_nothing))
+
+
+def test_run_runs_independent_stages_concurrently():
+    barrier = threading.Barrier(2, timeout=10)
+    scheduler = StageScheduler(workers=2)
+    # each stage can only pass the barrier if the other one is running at the same time
+    scheduler.add(Stage("one", barrier.wait, outputs=("one",)))
+    scheduler.add(Stage("two", barrier.wait, outputs=("two",)))
+
+    scheduler.run()
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_run_runs_stage_that_writes_before_stages_that_read(workers):
+    events = []
+
+    def write() -> None:
+        time.sleep(0.05)
+        events.append("write")
+
+    scheduler = StageScheduler(workers=workers)
+    scheduler.add(Stage("write", write, outputs=("data",)))
+    scheduler.add(Stage("read 1", lambda: events.append("read"), inputs=("data",)))
+    scheduler.add(Stage("read 2", lambda: events.append("read"), inputs=("data",)))
+
+    scheduler.run()
+
+    assert events == ["write", "read", "read"]
+
+
+def test_run_prints_output_of_stages_in_order_of_stages(capsys):
+    def print_slowly() -> None:
+        time.sleep(0.05)
+        print("first")
+
+    scheduler = StageScheduler(workers=2)
+    scheduler.add(Stage("one", print_slowly))
+    scheduler.add(Stage("two", lambda: print("second")))
+
+    scheduler.run()
+
+    assert capsys.readouterr().out == "first\nsecond\n"
+
+
+def test_run_raises_error_of_earliest_stage_and_does_not_start_dependent_stages():
+    events = []
+
+    def fail(message: str) -> None:
+        raise ValueError(message)
+
+    scheduler = StageScheduler(workers=2)
+    scheduler.add(Stage("one", lambda: fail("one"), outputs=("one",)))
+    scheduler.add(Stage("two", lambda: fail("two"), outputs=("two",)))
+    scheduler.add(Stage("three", lambda: events.append("three"), inputs=("one",)))
+
+    with pytest.raises(ValueError, match="one"):
+        scheduler.run()
+
+    assert not events
+
+
+def test_run_records_stages_in_instrumentation(tmp_path):
+    instrumentation = Instrumentation(root_dir=tmp_path)
+    scheduler = StageScheduler(instrumentation=instrumentation, workers=2)
+    scheduler.add(Stage("one", lambda: (tmp_path / "a.txt").write_text("a")))
+    scheduler.add(Stage("two", _do_nothing))
+
+    scheduler.run()
+
+    stats_for_name = {stats.name: stats for stats in instrumentation.stages}
+    assert stats_for_name.keys() == {"one", "two"}
+    assert stats_for_name["one"].files_written == 1
+    assert stats_for_name["two"].files_written == 0
@@ -76,3 +76,21 @@ def test_validate_passes_with_good_test_data():
 
 def test_validate_passes_with_real_data():
     AssetValidator().validate()
+
+
+def test_validate_collecting_findings_records_all_problems(tmp_path):
+    file_matching_maps_to_doculects = tmp_path / "encyclopedia_map_to_doculect.csv"
+    file_matching_maps_to_doculects.write_text(
+        "encyclopedia_map_id,doculect_id\n99-9,balochi\n5-1,dari\n5-1,dari\n5-1,foo\n",
+        encoding="utf-8",
+    )
+
+    report = AssetValidator(
+        file_with_doculects=FILE_WITH_DOCULECTS,
+        file_with_encyclopedia_maps=FILE_WITH_MAPS,
+        file_matching_maps_to_doculects=file_matching_maps_to_doculects,
+    ).validate_collecting_findings()
+
+    assert [finding.error_class for finding in report.findings] == ["AssetValidatorError"] * 3
+    assert "has a repeating row: ('5-1', 'dari')" in report.findings[0].message
+    assert [finding.row for finding in report.findings[1:]] == [2, 5]
@@ -118,3 +118,16 @@ def test_validate_real_data():
     # Empty arguments mean that default (i.e. real) files/dirs will be used.
     validator = DoculectInventoryValidator()
     validator.validate()
+
+
+def test_validate_collecting_findings():
+    report = DoculectInventoryValidator(
+        dir_with_feature_profiles=DIR_WITH_TEST_FEATURE_PROFILES,
+        file_with_doculects=DIR_WITH_VALIDATORS_TEST_FILES
+        / "doculects_bad_non_matching_family_id.csv",
+        file_with_genealogy_names=FILE_WITH_GENEALOGY_NAMES,
+    ).validate_collecting_findings()
+
+    assert len(report) == 1
+    assert report.findings[0].error_class == "DoculectInventoryValidatorError"
+    assert "genealogy family ID foobar not found" in report.findings[0].message
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from langworld_db_data.validators.feature_profile_validator import (
@@ -118,3 +120,152 @@ def test_validate_fails_with_profiles_that_breach_rules_for_not_applicable_with_
 
 def test_validate_real_data():
     FeatureProfileValidator().validate()
+
+
+def test_validate_real_data_in_parallel():
+    FeatureProfileValidator().validate(workers=2)
+
+
+def _make_validator_for_profiles_breaching_rules_for_not_applicable(**kwargs):
+    return FeatureProfileValidator(
+        dir_with_feature_profiles=DIR_WITH_PROFILES_BREACHING_RULES_FOR_NOT_APPLICABLE,
+        file_with_features=DIR_WITH_VALIDATORS_TEST_FILES / "features_OK.csv",
+        file_with_listed_values=DIR_WITH_VALIDATORS_TEST_FILES / "features_listed_values_OK.csv",
+        **kwargs,
+    )
+
+
+def test_validate_in_parallel_prints_same_messages_in_same_order_as_serial_run(capsys):
+    validator = _make_validator_for_profiles_breaching_rules_for_not_applicable()
+
+    validator.validate()
+    serial_output = capsys.readouterr().out
+
+    validator.validate(workers=2)
+    parallel_output = capsys.readouterr().out
+
+    assert "However, " in serial_output
+    assert parallel_output == serial_output
+
+
+def test_validate_in_parallel_raises_same_error_as_serial_run():
+    validator = _make_validator_for_profiles_breaching_rules_for_not_applicable(
+        must_throw_error_at_not_applicable_rule_breach=True
+    )
+
+    with pytest.raises(FeatureProfileValidatorError) as serial_error:
+        validator.validate()
+
+    with pytest.raises(FeatureProfileValidatorError) as parallel_error:
+        validator.validate(workers=2)
+
+    assert str(parallel_error.value) == str(serial_error.value)
+
+
+@pytest.mark.parametrize(
+    "line_to_replace, replacement, error, expected_error_message",
+    [
+        (
+            "A-2,",
+            "A-1,",
+            FeatureProfileValidatorError,
+            "repeating values in column <feature_id>: A-1",
+        ),
+        (
+            "A-2,Подъемы гласных",
+            "A-2,Количество степеней подъема",
+            FeatureProfileValidatorError,
+            "repeating values in column <feature_name_ru>: Количество степеней подъема",
+        ),
+        ("A-2,", "A-2,extra column,", IndexError, "abnormal number of columns: 3"),
+    ],
+)
+def test__init_fails_with_structurally_bad_files(
+    tmp_path, line_to_replace, replacement, error, expected_error_message
+):
+    lines = (
+        (DIR_WITH_TEST_FEATURE_PROFILES / "corsican.csv").read_text(encoding="utf-8").split("\n")
+    )
+    lines = [
+        line.replace(line_to_replace, replacement, 1) if line.startswith(line_to_replace) else line
+        for line in lines
+    ]
+    (tmp_path / "corsican.csv").write_text("\n".join(lines), encoding="utf-8")
+
+    with pytest.raises(error, match=expected_error_message):
+        FeatureProfileValidator(
+            dir_with_feature_profiles=tmp_path,
+            file_with_features=DIR_WITH_VALIDATORS_TEST_FILES / "features_OK.csv",
+            file_with_listed_values=DIR_WITH_VALIDATORS_TEST_FILES
+            / "features_listed_values_OK.csv",
+        )
+
+
+def test_validate_collecting_findings_reports_all_bad_files(test_validator):
+    validator = FeatureProfileValidator(
+        dir_with_feature_profiles=DIR_WITH_BAD_PROFILES,
+        file_with_features=DIR_WITH_VALIDATORS_TEST_FILES / "features_OK.csv",
+        file_with_listed_values=DIR_WITH_VALIDATORS_TEST_FILES / "features_listed_values_OK.csv",
+    )
+
+    report = validator.validate_collecting_findings()
+
+    # one finding for each bad file, nothing raised
+    assert sorted(finding.file for finding in report.findings) == sorted(
+        str(file) for file in DIR_WITH_BAD_PROFILES.glob("*.csv")
+    )
+    assert validator.report is None
+
+    finding = next(f for f in report.findings if "invalid_value_type" in f.file)
+    assert finding.validator == "FeatureProfileValidator"
+    assert finding.error_class == "FeatureProfileValidatorError"
+    assert finding.row == 4
+    assert finding.feature_id == "A-3"
+    assert "contains invalid value type in row 4" in finding.message
+
+    # same findings in same order when profiles are validated in parallel
+    assert validator.validate_collecting_findings(workers=2) == report
+
+
+def test_validate_collecting_findings_reports_all_breaches_of_rules_for_not_applicable():
+    validator = _make_validator_for_profiles_breaching_rules_for_not_applicable(
+        must_throw_error_at_not_applicable_rule_breach=True
+    )
+
+    report = validator.validate_collecting_findings()
+
+    # the check goes on after the first breach in a file
+    files = list(DIR_WITH_PROFILES_BREACHING_RULES_FOR_NOT_APPLICABLE.glob("*.csv"))
+    assert {finding.file for finding in report.findings} == {str(file) for file in files}
+    assert len(report) > len(files)
+    assert {finding.error_class for finding in report.findings} == {
+        "CustomInsteadOfNotApplicableError",
+        "ExplicitGapInsteadOfNotApplicableError",
+        "ListedInsteadOfNotApplicableError",
+        "NotStatedInsteadOfNotApplicableError",
+    }
+
+
+def test_validation_report_as_json(tmp_path):
+    report = FeatureProfileValidator(
+        dir_with_feature_profiles=DIR_WITH_BAD_PROFILES,
+        file_with_features=DIR_WITH_VALIDATORS_TEST_FILES / "features_OK.csv",
+        file_with_listed_values=DIR_WITH_VALIDATORS_TEST_FILES / "features_listed_values_OK.csv",
+    ).validate_collecting_findings()
+
+    report.write_json(tmp_path / "report.json")
+    content = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+
+    assert content["number_of_findings"] == len(report)
+    assert set(content["findings"][0].keys()) == {
+        "validator",
+        "error_class",
+        "message",
+        "file",
+        "row",
+        "feature_id",
+    }
+
+
+def test_validate_real_data_collecting_findings():
+    assert not FeatureProfileValidator().validate_collecting_findings()
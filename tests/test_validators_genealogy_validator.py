@@ -108,3 +108,18 @@ def test_validate_passes_for_good_files():
 
 def test_validate_passes_for_real_data():
     GenealogyValidator().validate()
+
+
+def test_validate_collecting_findings_records_all_problems():
+    report = GenealogyValidator(
+        file_with_hierarchy=DIR_WITH_VALIDATORS_TEST_FILES
+        / "genealogy_families_hierarchy_bad_malformed_id.yaml",
+        file_with_names=GOOD_FILE_WITH_NAMES,
+    ).validate_collecting_findings()
+
+    assert {finding.error_class for finding in report.findings} == {"GenealogyValidatorError"}
+    messages = [finding.message for finding in report.findings]
+    assert any("FooBar is incorrectly formed" in message for message in messages)
+    assert any(
+        "ID mongol not found in file with genealogy hierarchy" in message for message in messages
+    )
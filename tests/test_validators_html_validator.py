@@ -12,3 +12,24 @@ def test_validate_with_good_files():
         / "features_listed_values_for_html_validator.csv",
     )
     validator.validate()
+
+
+def test_validate_collecting_findings_records_all_invalid_descriptions(tmp_path):
+    file_with_listed_values = tmp_path / "features_listed_values.csv"
+    file_with_listed_values.write_text(
+        "id,feature_id,en,ru,description_formatted_en,description_formatted_ru\n"
+        "A-1-1,A-1,Two,Два,<p>Unclosed,\n"
+        "A-1-2,A-1,Three,Три,,<script>Текст</script>\n",
+        encoding="utf-8",
+    )
+
+    report = HTMLValidator(
+        input_file_with_features=DIR_WITH_VALIDATORS_TEST_FILES
+        / "features_for_html_validator.csv",
+        input_file_with_listed_values=file_with_listed_values,
+    ).validate_collecting_findings()
+
+    assert [(finding.file, finding.row) for finding in report.findings] == [
+        (str(file_with_listed_values), 2),
+        (str(file_with_listed_values), 3),
+    ]